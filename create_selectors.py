@@ -16,6 +16,8 @@ import shutil
 from datetime import datetime
 from typing import Dict, List, Any
 
+from src.utils.selector_diff import CatalogueDiff, diff_catalogues, apply_diff, format_changelog
+
 # 設定
 OUTPUT_DIR = "data/page_analyze"
 BACKUP_DIR = os.path.join(OUTPUT_DIR, "backup")
@@ -24,6 +26,7 @@ BACKUP_DIR = os.path.join(OUTPUT_DIR, "backup")
 SELECTORS_CSV = "selectors_analysis.csv"
 SELECTORS_JSON = "selectors_analysis.json"
 REPORT_MD = "selectors_update_report.md"
+CHANGELOG_MD = "selectors_changelog.md"
 
 def backup_existing_files(output_dir):
     """既存のセレクタファイルをバックアップ"""
@@ -50,6 +53,53 @@ def backup_existing_files(output_dir):
     
     return True
 
+def load_previous_selectors(output_dir) -> List[Dict[str, Any]]:
+    """
+    前回出力したセレクタ情報を読み込む（JSONを優先し、なければCSV）
+    
+    Args:
+        output_dir (str): 出力ディレクトリ
+        
+    Returns:
+        List[Dict[str, Any]]: セレクタ情報のリスト（前回の出力がない場合は空）
+    """
+    json_path = os.path.join(output_dir, SELECTORS_JSON)
+    csv_path = os.path.join(output_dir, SELECTORS_CSV)
+    try:
+        if os.path.exists(json_path):
+            with open(json_path, 'r', encoding='utf-8') as jsonfile:
+                return json.load(jsonfile)
+        if os.path.exists(csv_path):
+            with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+                return list(csv.DictReader(csvfile))
+    except Exception as e:
+        print(f"前回のセレクタ情報を読み込めませんでした（全件を新規として扱います）: {e}")
+    return []
+
+def append_changelog(output_dir, diff: CatalogueDiff):
+    """
+    変更履歴ファイルの先頭に今回の差分を追記
+    
+    Args:
+        output_dir (str): 出力ディレクトリ
+        diff (CatalogueDiff): 今回の差分
+    """
+    changelog_path = os.path.join(output_dir, CHANGELOG_MD)
+    entry = format_changelog(diff, datetime.now().strftime("%Y-%m-%d %H:%M"))
+    
+    previous = ""
+    if os.path.exists(changelog_path):
+        with open(changelog_path, "r", encoding="utf-8") as f:
+            previous = f.read()
+    header = "# セレクタ変更履歴\n\n"
+    if previous.startswith(header):
+        previous = previous[len(header):]
+    
+    with open(changelog_path, "w", encoding="utf-8") as f:
+        f.write(header + entry + ("\n" + previous if previous else ""))
+    
+    print(f"変更履歴を更新しました: {changelog_path}")
+
 def create_page_selectors() -> List[Dict[str, Any]]:
     """
     ページで使用する汎用的なセレクタ情報を作成する
@@ -415,13 +465,14 @@ def save_selectors_to_json(selectors, output_path):
     
     print(f"JSONファイルを保存しました: {output_path}")
 
-def create_update_report(output_dir, selectors):
+def create_update_report(output_dir, selectors, diff: CatalogueDiff = None):
     """
     更新レポートを作成
     
     Args:
         output_dir (str): 出力ディレクトリ
         selectors (List[Dict]): セレクタ情報のリスト
+        diff (CatalogueDiff): 前回からの差分（指定時はレポートに変更内容を記載）
     """
     now = datetime.now().strftime("%Y年%m月%d日 %H:%M")
     
@@ -444,7 +495,12 @@ EBiSの詳細分析ページで利用できる汎用的なセレクタ情報を
 - `{SELECTORS_CSV}`
 - `{SELECTORS_JSON}`
 
-## 主なセレクタ情報
+"""
+    
+    if diff is not None:
+        report_content += format_changelog(diff, "前回からの変更") + "\n"
+    
+    report_content += """## 主なセレクタ情報
 
 """
     
@@ -482,12 +538,23 @@ def main():
     # 出力ディレクトリの作成
     os.makedirs(output_dir, exist_ok=True)
     
-    # 既存ファイルのバックアップ
-    backup_existing_files(output_dir)
-    
     # 汎用的なセレクタ情報を作成
     selectors = create_page_selectors()
     
+    # 前回の出力と比較し、変更がなければファイルを書き換えない
+    previous = load_previous_selectors(output_dir)
+    diff = diff_catalogues(previous, selectors)
+    if previous and not diff.has_changes:
+        print(f"前回からの変更はありません（{diff.unchanged}件）")
+        return 0
+    print(format_changelog(diff))
+    
+    if previous:
+        # 既存ファイルのバックアップ
+        backup_existing_files(output_dir)
+        # 変更のない行は前回の内容と順序を保つ
+        selectors = apply_diff(previous, diff)
+    
     # CSVファイルとJSONファイルに保存
     csv_path = os.path.join(output_dir, SELECTORS_CSV)
     json_path = os.path.join(output_dir, SELECTORS_JSON)
@@ -495,8 +562,9 @@ def main():
     save_selectors_to_csv(selectors, csv_path)
     save_selectors_to_json(selectors, json_path)
     
-    # 更新レポートを作成
-    create_update_report(output_dir, selectors)
+    # 更新レポートと変更履歴を作成
+    create_update_report(output_dir, selectors, diff)
+    append_changelog(output_dir, diff)
     
     print("\n===================================================")
     print("セレクタ情報の作成が完了しました")
@@ -660,23 +660,22 @@ class EbisCSVDownloader:
             # トラフィックタイプの選択
             self._select_traffic_tab(traffic_type)
             
-            # ビューボタンをクリック
-            self.logger.info("ビューボタンをクリックします")
-            if not self.browser.click_element_by_selector(self.selector_group, "view_button", timeout=self.element_timeout):
-                error_msg = "ビューボタンが見つかりませんでした"
-                self.logger.error(error_msg)
-                self.browser.save_screenshot("view_button_not_found")
-                raise CSVDownloadError(error_msg)
-                
-            # 少し待機してドロップダウンメニューが表示されるのを待つ
-            time.sleep(1)
-            
-            # プログラム用全項目ビューをクリック
-            self.logger.info("プログラム用全項目ビューを選択します")
-            if not self.browser.click_element_by_selector(self.selector_group, "program_all_view", timeout=self.element_timeout):
-                error_msg = "プログラム用全項目ビューが見つかりませんでした"
+            # ビューボタン → プログラム用全項目ビューを一連の操作として実行
+            # （ドロップダウン項目は表示されるまで待機してからクリックする）
+            self.logger.info("ビューボタンをクリックし、プログラム用全項目ビューを選択します")
+            sequence = self.browser.run_action_sequence([
+                (self.selector_group, "view_button", "click", "clickable"),
+                (self.selector_group, "program_all_view", "click", "visible"),
+            ], timeout=self.element_timeout)
+            if not sequence["success"]:
+                if sequence["failed_step"] == f"{self.selector_group}.view_button":
+                    error_msg = "ビューボタンが見つかりませんでした"
+                    screenshot_name = "view_button_not_found"
+                else:
+                    error_msg = "プログラム用全項目ビューが見つかりませんでした"
+                    screenshot_name = "program_all_view_not_found"
                 self.logger.error(error_msg)
-                self.browser.save_screenshot("program_all_view_not_found")
+                self.browser.save_screenshot(screenshot_name)
                 raise CSVDownloadError(error_msg)
                 
             # ビューが適用されるまで待機
@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+保存済みHTMLスナップショットのオフラインセレクタ解析
+
+PageAnalyzerTool.save_html_source などで data/page_analyze/html に保存したHTMLを
+lxmlで解析し、ブラウザの起動やEBiSへのログインなしで
+PageAnalyzerTool と同じ形式のセレクタ情報（all_selectors.csv / .json）を出力します。
+
+XPath・CSSパスは PageAnalyzerTool がページに注入するJavaScript
+（getFullXPath / getCssPath）と同じ規則で生成するため、ライブ解析の結果と比較できます。
+レイアウト情報（表示状態・座標）はHTMLだけでは得られないため、
+表示状態は hidden 属性やインラインスタイルから推定し、座標は空になります。
+
+使用例:
+$ python -m src.modules.ebis.offline_page_analyzer --html-dir data/page_analyze/html
+"""
+
+import os
+import sys
+import re
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+# lxmlのインポート（可能であれば）
+try:
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+from src.utils.logging_config import get_logger
+from src.modules.ebis.page_analyzer_tool import (
+    OUTPUT_DIR,
+    INTERACTIVE_ELEMENT_SELECTORS,
+    PageAnalyzerTool,
+)
+
+# ロガーの初期化
+logger = get_logger(__name__)
+
+# INTERACTIVE_ELEMENT_SELECTORS のCSSセレクタに対応するXPath
+CSS_TO_XPATH = {
+    "a": "//a",
+    "button": "//button",
+    "input[type='button']": "//input[@type='button']",
+    "input[type='submit']": "//input[@type='submit']",
+    "[role='button']": "//*[@role='button']",
+    ".btn": "//*[contains(concat(' ', normalize-space(@class), ' '), ' btn ')]",
+    "[onclick]": "//*[@onclick]",
+    "input[type='checkbox']": "//input[@type='checkbox']",
+    "input[type='radio']": "//input[@type='radio']",
+    "input:not([type='hidden'])": "//input[not(@type='hidden')]",
+    "textarea": "//textarea",
+    "select": "//select",
+}
+
+# getCssPath と同じ「重要なクラス」の判定パターン
+SIGNIFICANT_CLASS_PATTERN = re.compile(
+    r"^(nav|menu|btn|button|tab|header|footer|main|content|row|container|active|selected|primary|navbar)"
+)
+
+# getCssPath がセレクタに付加する属性（優先順）
+CSS_PATH_ATTRIBUTES = ["data-rb-event-key", "data-testid", "data-id", "role", "name"]
+
+
+def _children(element) -> list:
+    """コメント等を除いた子要素のリストを返す"""
+    return [child for child in element if isinstance(child.tag, str)]
+
+
+def _css_identifier(value: str) -> str:
+    """CSS.escape と同じ規則でidやクラス名をCSSの識別子としてエスケープする"""
+    escaped = []
+    for i, char in enumerate(value):
+        code = ord(char)
+        if code == 0:
+            escaped.append("\ufffd")
+        elif 0x01 <= code <= 0x1F or code == 0x7F or (
+            char.isdigit() and char.isascii() and (i == 0 or (i == 1 and value[0] == "-"))
+        ):
+            escaped.append(f"\\{code:x} ")
+        elif i == 0 and char == "-" and len(value) == 1:
+            escaped.append("\\-")
+        elif code >= 0x80 or char in "-_" or (char.isascii() and char.isalnum()):
+            escaped.append(char)
+        else:
+            escaped.append(f"\\{char}")
+    return "".join(escaped)
+
+
+def _css_string(value: str) -> str:
+    """getCssPath と同じ規則で属性値を単一引用符で囲んだCSSの文字列にする"""
+    escaped = re.sub(r"[\\']", lambda m: "\\" + m.group(0), value)
+    return "'" + re.sub(r"[\n\r\f]", lambda m: f"\\{ord(m.group(0)):x} ", escaped) + "'"
+
+
+def _has_text(element) -> bool:
+    """要素（子孫を含む）が空白以外のテキストを持つか"""
+    return bool(element.text_content().strip())
+
+
+def _generate_full_xpath(element) -> str:
+    """
+    getFullXPath（FULL_XPATH_JS）と同じ規則でXPathを生成する
+
+    Args:
+        element: lxmlの要素
+
+    Returns:
+        str: XPath
+    """
+    element_id = element.get("id")
+    if element_id:
+        return f'//*[@id="{element_id}"]'
+
+    path = []
+    current = element
+    while current is not None and isinstance(current.tag, str):
+        parent = current.getparent()
+        siblings = _children(parent) if parent is not None else [current]
+        same_tag = [s for s in siblings if s.tag == current.tag]
+        index = same_tag.index(current) + 1
+
+        current_id = current.get("id")
+        if current_id:
+            path.insert(0, f'//*[@id="{current_id}"]')
+            break
+
+        path.insert(0, f"/{current.tag}[{index}]" if len(same_tag) > 1 else f"/{current.tag}")
+
+        # 元の要素が重要な子要素を持つ場合は子要素まで含める
+        if len(path) == 1:
+            for child in _children(current):
+                if _has_text(child) or child.tag in ("div", "span"):
+                    path.append(f"/{child.tag}")
+                    break
+
+        current = parent
+        # bodyに到達したらそれ以上辿らない
+        if current is not None and current.tag in ("body", "html"):
+            break
+
+    if path and not path[0].startswith("//*[@id="):
+        return "//" + "".join(path)
+    return "".join(path)
+
+
+def _generate_css_path(element) -> str:
+    """
+    getCssPath（CSS_PATH_JS）と同じ規則で階層CSSセレクタを生成する
+
+    Args:
+        element: lxmlの要素
+
+    Returns:
+        str: CSSセレクタ
+    """
+    element_id = element.get("id")
+    if element_id:
+        return f"#{_css_identifier(element_id)}"
+
+    important_children = [
+        child for child in _children(element)
+        if _has_text(child) or child.tag in ("div", "span", "img", "i", "em", "strong")
+    ]
+    child_selector = f" > {important_children[0].tag}" if important_children else ""
+
+    path = []
+    current = element
+    depth = 0
+    while current is not None and isinstance(current.tag, str) and depth < 5:
+        selector = current.tag
+
+        current_id = current.get("id")
+        if current_id:
+            path.insert(0, f"#{_css_identifier(current_id)}")
+            if depth == 0 and child_selector:
+                path[0] += child_selector
+            break
+
+        parent = current.getparent()
+        if parent is not None:
+            siblings = _children(parent)
+            if len(siblings) > 1:
+                selector += f":nth-child({siblings.index(current) + 1})"
+
+        classes = (current.get("class") or "").split()
+        if classes:
+            significant = [c for c in classes if SIGNIFICANT_CLASS_PATTERN.match(c)]
+            has_data_attributes = any(name.startswith("data-") for name in current.attrib)
+            if significant:
+                selector += f".{_css_identifier(significant[0])}"
+            elif not has_data_attributes:
+                selector += f".{_css_identifier(classes[0])}"
+
+        for attr in CSS_PATH_ATTRIBUTES:
+            value = current.get(attr)
+            if value and value.strip():
+                selector += f"[{attr}={_css_string(value)}]"
+                break
+
+        if depth == 0 and child_selector:
+            selector += child_selector
+
+        path.insert(0, selector)
+        current = parent
+        depth += 1
+
+        if current is not None and current.get("id"):
+            path.insert(0, f"#{_css_identifier(current.get('id'))}")
+            break
+
+    return " > ".join(path)
+
+
+def _is_displayed(element) -> bool:
+    """hidden属性・インラインスタイルから表示状態を推定する"""
+    if element.tag == "input" and (element.get("type") or "").lower() == "hidden":
+        return False
+    node = element
+    while node is not None:
+        if node.tag in ("template", "head", "noscript") or node.get("hidden") is not None:
+            return False
+        style = (node.get("style") or "").replace(" ", "").lower()
+        if "display:none" in style or "visibility:hidden" in style:
+            return False
+        node = node.getparent()
+    return True
+
+
+def _element_value(element) -> str:
+    """DOMの value プロパティに相当する値を返す"""
+    if element.tag == "textarea":
+        return element.text_content()
+    if element.tag == "select":
+        options = element.findall(".//option")
+        selected = [o for o in options if o.get("selected") is not None] or options[:1]
+        if selected:
+            option = selected[0]
+            value = option.get("value")
+            return value if value is not None else option.text_content().strip()
+        return ""
+    return element.get("value") or ""
+
+
+def extract_element_records(html_text: str) -> List[Dict[str, Any]]:
+    """
+    HTML文字列からインタラクティブ要素の情報を抽出する
+
+    BULK_EXTRACTION_JS と同じキーを持つ辞書を返すため、
+    PageAnalyzerTool._element_info_from_record でそのまま ElementInfo に変換できる。
+
+    Args:
+        html_text: HTMLソース
+
+    Returns:
+        List[Dict[str, Any]]: 要素情報のリスト
+    """
+    document = lxml_html.document_fromstring(html_text)
+    records = []
+    for element_type, selectors in INTERACTIVE_ELEMENT_SELECTORS.items():
+        # 複数のセレクタに一致する要素は1回だけ処理する
+        seen = set()
+        for selector in selectors:
+            for element in document.xpath(CSS_TO_XPATH[selector]):
+                if element in seen:
+                    continue
+                seen.add(element)
+                displayed = _is_displayed(element)
+                records.append({
+                    "element_type": element_type,
+                    "tag": element.tag,
+                    "id": element.get("id") or "",
+                    "name": element.get("name") or "",
+                    "class": element.get("class") or "",
+                    "type": element.get("type") or "",
+                    "role": element.get("role") or "",
+                    "value": _element_value(element),
+                    "placeholder": element.get("placeholder") or "",
+                    "text": " ".join(element.text_content().split()) if displayed else "",
+                    "is_displayed": displayed,
+                    "is_enabled": element.get("disabled") is None,
+                    "location": {},
+                    "xpath": _generate_full_xpath(element),
+                    "css_path": _generate_css_path(element),
+                })
+    return records
+
+
+def analyze_snapshot(html_path: str, output_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    1つのHTMLスナップショットを解析してセレクタ情報を返す（プロセスプールから呼び出し可能）
+
+    Args:
+        html_path: HTMLファイルのパス
+        output_dir: PageAnalyzerTool の出力ディレクトリ
+
+    Returns:
+        List[Dict[str, Any]]: collect_selectors と同じ形式のセレクタ情報（source_file 付き）
+    """
+    with open(html_path, "r", encoding="utf-8", errors="replace") as f:
+        html_text = f.read()
+
+    tool = PageAnalyzerTool(headless=True, output_dir=output_dir)
+    for record in extract_element_records(html_text):
+        info = tool._element_info_from_record(record)
+        if info.attrs.get("is_displayed") and info.attrs.get("is_enabled"):
+            tool._register_element(info, record["element_type"])
+    tool._remove_duplicates()
+
+    selectors = tool.collect_selectors()
+    source_file = os.path.basename(html_path)
+    for selector in selectors:
+        selector["source_file"] = source_file
+    return selectors
+
+
+class OfflinePageAnalyzer:
+    """
+    保存済みHTMLを並列に解析し、セレクタ情報を出力するクラス
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        初期化
+
+        Args:
+            output_dir: 出力ディレクトリ（デフォルトは data/page_analyze）
+            max_workers: 並列実行するプロセス数（Noneの場合はCPU数）
+        """
+        self.logger = get_logger(__name__)
+        self.output_dir = output_dir or OUTPUT_DIR
+        self.max_workers = max_workers
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def find_snapshots(self, html_dir: Optional[str] = None, pattern: str = "*.html") -> List[str]:
+        """
+        解析対象のHTMLファイルを列挙する
+
+        Args:
+            html_dir: HTMLディレクトリ（デフォルトは <output_dir>/html）
+            pattern: ファイル名のパターン
+
+        Returns:
+            List[str]: HTMLファイルのパス（名前順）
+        """
+        html_dir = html_dir or os.path.join(self.output_dir, "html")
+        return sorted(glob.glob(os.path.join(html_dir, pattern)))
+
+    def analyze(self, html_files: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        複数のHTMLファイルを並列に解析する
+
+        Args:
+            html_files: HTMLファイルのパスのリスト
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: ファイルパスごとのセレクタ情報（解析に失敗したファイルは含まない）
+        """
+        if not LXML_AVAILABLE:
+            self.logger.error("lxmlがインストールされていないため、オフライン解析を実行できません")
+            return {}
+
+        results = {}
+        if not html_files:
+            self.logger.warning("解析対象のHTMLファイルがありません")
+            return results
+
+        # 1ファイルのみの場合はプロセスを起動しない
+        if len(html_files) == 1 or self.max_workers == 1:
+            for path in html_files:
+                try:
+                    results[path] = analyze_snapshot(path, self.output_dir)
+                except Exception as e:
+                    self.logger.error(f"HTMLの解析中にエラーが発生しました: {path}: {e}")
+            return results
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(analyze_snapshot, path, self.output_dir): path for path in html_files}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                    self.logger.info(f"HTMLを解析しました: {path} ({len(results[path])}件)")
+                except Exception as e:
+                    self.logger.error(f"HTMLの解析中にエラーが発生しました: {path}: {e}")
+
+        # 出力順を入力順にそろえる
+        return {path: results[path] for path in html_files if path in results}
+
+    def export(self, results: Dict[str, List[Dict[str, Any]]],
+               csv_filename: str = "all_selectors.csv", json_filename: str = "all_selectors.json") -> bool:
+        """
+        解析結果を1つのCSV/JSONにまとめて出力する
+
+        Args:
+            results: analyze() の戻り値
+            csv_filename: CSV出力ファイル名
+            json_filename: JSON出力ファイル名
+
+        Returns:
+            bool: 出力が成功したかどうか
+        """
+        selectors = [selector for file_selectors in results.values() for selector in file_selectors]
+        if not selectors:
+            self.logger.warning("エクスポートするセレクタがありません")
+            return False
+
+        if not os.path.isabs(csv_filename):
+            csv_filename = os.path.join(self.output_dir, csv_filename)
+        if not os.path.isabs(json_filename):
+            json_filename = os.path.join(self.output_dir, json_filename)
+
+        tool = PageAnalyzerTool(headless=True, output_dir=self.output_dir)
+        return tool.export_selectors(selectors, csv_filename, json_filename)
+
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="保存済みHTMLのオフラインセレクタ解析")
+    parser.add_argument('--html-dir', help='HTMLスナップショットのディレクトリ', default=os.path.join(OUTPUT_DIR, "html"))
+    parser.add_argument('--pattern', help='対象ファイルのパターン', default="*.html")
+    parser.add_argument('--output-dir', help='出力ディレクトリ', default=OUTPUT_DIR)
+    parser.add_argument('--csv-output', help='CSV出力ファイル名', default="all_selectors.csv")
+    parser.add_argument('--json-output', help='JSON出力ファイル名', default="all_selectors.json")
+    parser.add_argument('--workers', help='並列実行するプロセス数', type=int, default=None)
+    return parser.parse_args()
+
+
+def main():
+    """メイン処理"""
+    args = parse_args()
+
+    analyzer = OfflinePageAnalyzer(output_dir=args.output_dir, max_workers=args.workers)
+    html_files = analyzer.find_snapshots(args.html_dir, args.pattern)
+    logger.info(f"{len(html_files)} 件のHTMLスナップショットを解析します: {args.html_dir}")
+
+    results = analyzer.analyze(html_files)
+    if not analyzer.export(results, args.csv_output, args.json_output):
+        return 1
+
+    total = sum(len(selectors) for selectors in results.values())
+    print(f"\n{len(results)} 件のHTMLから {total} 件のセレクタを出力しました")
+    print(f"CSV: {os.path.join(args.output_dir, args.csv_output)}")
+    print(f"JSON: {os.path.join(args.output_dir, args.json_output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
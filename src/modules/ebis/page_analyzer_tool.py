@@ -37,6 +37,7 @@ import pandas as pd
 from tabulate import tabulate
 import collections
 import re
+import weakref
 
 # プロジェクト固有のインポート
 from src.utils.logging_config import get_logger
@@ -44,6 +45,8 @@ from src.utils.environment import env
 # 正しいモジュールパスに修正
 from src.modules.selenium.browser import Browser
 from src.modules.selenium.page_analyzer import PageAnalyzer
+from src.utils.html_selector_analyzer.element_dedup import deduplicate_element_infos
+from src.utils.category_rules import DEFAULT_RULES_PATH, get_category_matcher
 from src.modules.ebis.login_page import login
 
 # ロガーの初期化
@@ -52,16 +55,497 @@ logger = get_logger(__name__)
 # 出力ディレクトリのデフォルト値
 OUTPUT_DIR = os.path.join("data", "page_analyze")
 
+# 要素タイプごとのインタラクティブ要素の検索セレクタ
+INTERACTIVE_ELEMENT_SELECTORS = {
+    "clickable": [
+        "a", "button", 
+        "input[type='button']", "input[type='submit']", 
+        "[role='button']", ".btn", "[onclick]",
+        "input[type='checkbox']", "input[type='radio']"
+    ],
+    "input": [
+        "input:not([type='hidden'])",
+        "textarea",
+        "select"
+    ]
+}
+
+# ページ構造の領域ごとの候補セレクタ（優先順）
+# (page_structureのキー, 表示名, [CSSセレクタ, ...])
+PAGE_STRUCTURE_CANDIDATES = [
+    ("top_bar", "トップバー", [
+        "#top-bar", "header", ".navbar", ".header", "[role='banner']", "nav.navbar"
+    ]),
+    ("side_bar", "サイドバー", [
+        "#navbar", ".sidebar", "#sidebar", ".sidenav", ".menu-nav", ".side-menu"
+    ]),
+    ("main_content", "メインコンテンツ", [
+        "main", "#content", ".content", "[role='main']", ".main-content", ".container"
+    ]),
+    ("navigation", "ナビゲーション", [
+        "nav", "[role='navigation']", ".navigation", ".nav-container"
+    ]),
+]
+
+# 領域ごとに候補セレクタを優先順に評価し、最初に一致した要素を1回のスクリプト実行で返すJavaScript
+# arguments[0]: [[キー, [CSSセレクタ, ...]], ...]、戻り値: {キー: {selector, element}}
+PAGE_STRUCTURE_JS = """
+const regions = arguments[0];
+const found = {};
+for (const [key, selectors] of regions) {
+    for (const selector of selectors) {
+        let element = null;
+        try {
+            element = document.querySelector(selector);
+        } catch (e) {
+            // 不正なセレクタは無視して次の候補を評価する
+        }
+        if (element) {
+            found[key] = {selector: selector, element: element};
+            break;
+        }
+    }
+}
+return found;
+"""
+
+# 要素のXPathを生成するJavaScript関数（getFullXPath）
+FULL_XPATH_JS = """
+function getFullXPath(element) {
+    if (!element) return '';
+
+    // IDを持つ要素への最適化されたXPath
+    if (element.id) {
+        return `//*[@id="${element.id}"]`;
+    }
+
+    // 子要素を含めるかどうかを判断
+    const shouldIncludeChildren = (el) => {
+        if (!el || !el.children) return false;
+        // テキストを持つ子要素や特定のタグを優先
+        for (const child of el.children) {
+            if (child.textContent && child.textContent.trim()) return true;
+            if (['div', 'span', 'img'].includes(child.tagName.toLowerCase())) return true;
+        }
+        return false;
+    };
+
+    let path = [];
+    let current = element;
+
+    // 階層を上に辿る
+    while (current && current.nodeType === Node.ELEMENT_NODE) {
+        // current要素のインデックスを計算
+        let index = 0;
+        let sibling = current;
+
+        // 同じ階層の同じタグ名の要素をカウント
+        while (sibling) {
+            if (sibling.nodeName === current.nodeName) {
+                index++;
+            }
+            sibling = sibling.previousElementSibling;
+        }
+
+        // ノード名とインデックスを使用
+        const tagName = current.nodeName.toLowerCase();
+        let pathSegment = '';
+
+        // IDがある場合はIDを優先
+        if (current.id) {
+            pathSegment = `//*[@id="${current.id}"]`;
+            path.unshift(pathSegment);
+            break; // IDがあれば探索終了
+        } else {
+            // 同階層に同じタグが複数ある場合はインデックスを付加
+            let siblings = Array.from(current.parentNode?.children || [])
+                .filter(s => s.nodeName === current.nodeName);
+
+            if (siblings.length > 1) {
+                pathSegment = `/${tagName}[${index}]`;
+            } else {
+                pathSegment = `/${tagName}`;
+            }
+        }
+
+        path.unshift(pathSegment);
+
+        // 最も浅い要素（元の要素）かつ子要素を持つ場合
+        if (path.length === 1 && shouldIncludeChildren(current)) {
+            // 特に重要な子要素（テキストを持つ、またはdiv/span）があれば追加
+            for (const child of current.children) {
+                if (child.textContent && child.textContent.trim() || 
+                    ['div', 'span'].includes(child.tagName.toLowerCase())) {
+                    path.push(`/${child.tagName.toLowerCase()}`);
+                    break;
+                }
+            }
+        }
+
+        current = current.parentNode;
+
+        // bodyに到達したらそれ以上辿らない（XPathを短くするため）
+        if (current && (current.nodeName === 'BODY' || current.nodeName === 'HTML')) {
+            break;
+        }
+    }
+
+    // "//"ではじめて絶対パスにする
+    if (path.length > 0 && !path[0].startsWith('//*[@id=')) {
+        return '//' + path.join('');
+    }
+
+    return path.join('');
+}
+"""
+
+# 要素の階層CSSセレクタを生成するJavaScript関数（getCssPath）
+CSS_PATH_JS = """
+function getCssPath(element) {
+    if (!element) return null;
+
+    // 直接のIDセレクタをチェック
+    if (element.id) return `#${CSS.escape(element.id)}`;
+
+    // 重要な子要素をチェック
+    const hasImportantChild = (el) => {
+        if (!el || !el.children.length === 0) return false;
+        // 子要素の配列を返す
+        const importantChildren = [];
+        for (const child of el.children) {
+            // テキストを持つ子要素や特定のタグを優先
+            if (child.textContent && child.textContent.trim()) {
+                importantChildren.push(child);
+            } else if (['div', 'span', 'img', 'i', 'em', 'strong'].includes(child.tagName.toLowerCase())) {
+                importantChildren.push(child);
+            }
+        }
+        return importantChildren.length > 0 ? importantChildren : false;
+    };
+
+    // 親要素を含むセレクタを構築
+    const buildPath = (element, includeChild = false) => {
+        if (!element) return '';
+
+        let path = [];
+        let current = element;
+        let childSelector = '';
+
+        // 重要な子要素を持つ場合、その子要素をセレクタに含める
+        if (includeChild) {
+            const importantChildren = hasImportantChild(element);
+            if (importantChildren && importantChildren.length > 0) {
+                // 最初の重要な子要素を使用
+                const firstChild = importantChildren[0];
+                childSelector = ` > ${firstChild.tagName.toLowerCase()}`;
+            }
+        }
+
+        // 5階層の深さを上限に親要素をたどる
+        let depth = 0;
+        const maxDepth = 5;
+
+        while (current && current.nodeType === 1 && depth < maxDepth) {
+            // ベースセレクタの作成
+            let selector = current.tagName.toLowerCase();
+
+            // IDがあればそれを利用して階層探索を終了
+            if (current.id) {
+                path.unshift(`#${CSS.escape(current.id)}`);
+                if (depth === 0 && childSelector) path[0] += childSelector;
+                break;
+            }
+
+            // 兄弟要素の中での位置を特定（nth-child）
+            // より安定したnth-childを使用する
+            if (current.parentNode) {
+                const children = Array.from(current.parentNode.children);
+                const index = children.indexOf(current) + 1;
+
+                if (children.length > 1) {
+                    selector += `:nth-child(${index})`;
+                }
+            }
+
+            // クラスと属性を追加
+            if (current.className && typeof current.className === 'string') {
+                const classes = current.className.trim().split(/\\s+/).filter(Boolean);
+
+                if (classes.length > 0) {
+                    // 重要なクラスとReact特有のクラスを優先
+                    const significantClasses = classes.filter(c => 
+                        /^(nav|menu|btn|button|tab|header|footer|main|content|row|container|active|selected|primary|navbar)/.test(c)
+                    );
+
+                    // data属性を持つ場合は最小限のクラスを使用
+                    const hasDataAttributes = Object.entries(current.attributes).some(([_, attr]) => 
+                        attr.name && attr.name.startsWith('data-')
+                    );
+
+                    if (significantClasses.length > 0) {
+                        // 重要なクラスを最大1つだけ追加（セレクタをシンプルに保つ）
+                        selector += `.${CSS.escape(significantClasses[0])}`;
+                    } else if (!hasDataAttributes && classes.length > 0) {
+                        // データ属性がなく、クラスがある場合は最初のクラスを使用
+                        selector += `.${CSS.escape(classes[0])}`;
+                    }
+                }
+            }
+
+            // data-rb-event-keyなど重要な属性を追加
+            let attributeAdded = false;
+            for (const attr of ['data-rb-event-key', 'data-testid', 'data-id', 'role', 'name']) {
+                const value = current.getAttribute(attr);
+                if (value && value.trim()) {
+                    // 引用符・バックスラッシュ・改行をエスケープして属性値の文字列にする
+                    const escapedValue = value.replace(/[\\\\']/g, '\\\\$&')
+                        .replace(/[\\n\\r\\f]/g, c => '\\\\' + c.charCodeAt(0).toString(16) + ' ');
+                    selector += `[${attr}='${escapedValue}']`;
+                    attributeAdded = true;
+                    break;
+                }
+            }
+
+            // 最初の要素（元の要素）にchildSelectorを追加
+            if (depth === 0 && childSelector) {
+                selector += childSelector;
+            }
+
+            path.unshift(selector);
+            current = current.parentNode;
+            depth++;
+
+            // 親要素にIDがあれば、それをパスの先頭に追加して終了
+            if (current && current.id) {
+                path.unshift(`#${CSS.escape(current.id)}`);
+                break;
+            }
+        }
+
+        return path.join(' > ');
+    };
+
+    // まず子要素を含めたセレクタを試す
+    let selector = buildPath(element, true);
+
+    // 特別なケース：テキストを含む要素やリンク要素の処理
+    const hasText = element.textContent && element.textContent.trim();
+    const isLinkOrButton = ['a', 'button'].includes(element.tagName.toLowerCase());
+
+    if ((isLinkOrButton || hasText) && element.children.length > 0) {
+        // 子要素を含めたより具体的なセレクタを生成
+        return buildPath(element, true);
+    }
+
+    return selector;
+}
+"""
+
+# インタラクティブ要素の情報を1回のスクリプト実行で一括抽出するJavaScript
+# arguments[0]: {要素タイプ: [CSSセレクタ, ...]}、戻り値: 要素情報のJSON配列（文字列）
+BULK_EXTRACTION_JS = FULL_XPATH_JS + CSS_PATH_JS + """
+const selectorsMap = arguments[0];
+const records = [];
+const scrollX = window.pageXOffset || 0;
+const scrollY = window.pageYOffset || 0;
+
+const isDisplayed = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity || '1') > 0;
+};
+
+for (const [elementType, selectors] of Object.entries(selectorsMap)) {
+    // 複数のセレクタに一致する要素は1回だけ処理する
+    const elements = new Set();
+    for (const selector of selectors) {
+        try {
+            document.querySelectorAll(selector).forEach((el) => elements.add(el));
+        } catch (e) {
+            // 不正なセレクタは無視する
+        }
+    }
+    for (const el of elements) {
+        try {
+            const rect = el.getBoundingClientRect();
+            const displayed = isDisplayed(el);
+            records.push({
+                element_type: elementType,
+                tag: el.tagName.toLowerCase(),
+                id: el.getAttribute('id') || '',
+                name: el.getAttribute('name') || '',
+                class: el.getAttribute('class') || '',
+                type: el.getAttribute('type') || '',
+                role: el.getAttribute('role') || '',
+                value: (typeof el.value === 'string' ? el.value : el.getAttribute('value')) || '',
+                placeholder: el.getAttribute('placeholder') || '',
+                text: displayed ? (el.innerText || '').trim() : '',
+                is_displayed: displayed,
+                is_enabled: !el.disabled,
+                location: {
+                    x: Math.round(rect.left + scrollX),
+                    y: Math.round(rect.top + scrollY),
+                    width: Math.round(rect.width),
+                    height: Math.round(rect.height)
+                },
+                xpath: getFullXPath(el) || '',
+                css_path: getCssPath(el) || ''
+            });
+        } catch (e) {
+            // 個別要素の失敗は全体を止めない
+        }
+    }
+}
+return JSON.stringify(records);
+"""
+
 class ElementInfo:
     """
     ページ上の要素情報を保持するクラス
+    
+    属性は __slots__ の型付きフィールドで保持し、WebElement は保持しません
+    （弱参照のみ）。element にアクセスした時点で弱参照が切れていれば、
+    ドライバーからXPathで要素を再取得します。WebElement を含まないため pickle できます。
     """
-    def __init__(self, element=None, tag=None, text=None, attrs=None, category=None):
-        self.element = element
+    __slots__ = (
+        "tag", "text", "category",
+        "id", "name", "class_name", "type", "role", "value", "placeholder",
+        "is_displayed", "is_enabled", "xpath", "full_xpath", "css_path", "location",
+        "extra", "handle_id", "_element_ref", "_driver_ref",
+    )
+    
+    # attrs のキーと型付きフィールドの対応
+    ATTR_FIELDS = {
+        "id": "id",
+        "name": "name",
+        "class": "class_name",
+        "type": "type",
+        "role": "role",
+        "value": "value",
+        "placeholder": "placeholder",
+        "is_displayed": "is_displayed",
+        "is_enabled": "is_enabled",
+        "xpath": "xpath",
+        "full_xpath": "full_xpath",
+        "css_path": "css_path",
+        "location": "location",
+    }
+    
+    # 列形式で出力する列（attrs のキー名）
+    COLUMNS = ("tag", "text", "category") + tuple(ATTR_FIELDS)
+    
+    def __init__(self, element=None, tag=None, text=None, attrs=None, category=None, driver=None):
         self.tag = tag or (element.tag_name if element else "")
         self.text = text or (element.text if element else "")
-        self.attrs = attrs or {}
         self.category = category or "その他"  # カテゴリー情報を追加
+        self.attrs = attrs or {}
+        self._set_element(element, driver)
+        
+    def _set_element(self, element, driver=None):
+        """
+        WebElement を弱参照で保持し、再取得用にドライバーも弱参照で保持する
+        
+        一括抽出のように WebElement がない場合は、driver を指定するとXPathで再取得できる
+        """
+        self.handle_id = getattr(element, "id", None) if element is not None else None
+        self._element_ref = None
+        self._driver_ref = None
+        if element is None:
+            if driver is not None:
+                try:
+                    self._driver_ref = weakref.ref(driver)
+                except TypeError:
+                    pass
+            return
+        try:
+            self._element_ref = weakref.ref(element)
+            self._driver_ref = weakref.ref(element.parent)
+        except (TypeError, AttributeError):
+            pass
+    
+    @property
+    def attrs(self):
+        """属性の辞書（互換性のため、型付きフィールドから毎回生成する）"""
+        attrs = {key: getattr(self, field) for key, field in self.ATTR_FIELDS.items()}
+        if self.extra:
+            attrs.update(self.extra)
+        return attrs
+    
+    @attrs.setter
+    def attrs(self, attrs):
+        self.id = attrs.get("id", "")
+        self.name = attrs.get("name", "")
+        self.class_name = attrs.get("class", "")
+        self.type = attrs.get("type", "")
+        self.role = attrs.get("role", "")
+        self.value = attrs.get("value", "")
+        self.placeholder = attrs.get("placeholder", "")
+        self.is_displayed = attrs.get("is_displayed", False)
+        self.is_enabled = attrs.get("is_enabled", False)
+        self.xpath = attrs.get("xpath", "")
+        self.full_xpath = attrs.get("full_xpath", "")
+        self.css_path = attrs.get("css_path", "")
+        self.location = attrs.get("location", {})
+        # 対応するフィールドがない属性（data-* など）のみ辞書で保持する
+        extra = {key: value for key, value in attrs.items() if key not in self.ATTR_FIELDS}
+        self.extra = extra or None
+    
+    def get_element(self, resolve=True):
+        """
+        要素の WebElement を取得する
+        
+        Args:
+            resolve: 弱参照が切れている場合にXPathで再取得するかどうか
+            
+        Returns:
+            WebElement or None: 要素。取得できない場合はNone
+        """
+        element = self._element_ref() if self._element_ref else None
+        if element is not None or not resolve:
+            return element
+        driver = self._driver_ref() if self._driver_ref else None
+        xpath = self.full_xpath or self.xpath
+        if driver is None or not xpath:
+            return None
+        try:
+            element = driver.find_element(By.XPATH, xpath)
+        except Exception:
+            return None
+        self._set_element(element)
+        return element
+    
+    @property
+    def element(self):
+        """要素の WebElement（必要に応じてXPathで再取得する）"""
+        return self.get_element()
+    
+    def __getstate__(self):
+        """pickle 用の状態（弱参照は含めない）"""
+        return {slot: getattr(self, slot) for slot in self.__slots__ if not slot.endswith("_ref")}
+    
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._element_ref = None
+        self._driver_ref = None
+    
+    @classmethod
+    def to_columns(cls, elements):
+        """
+        要素のリストを列形式（列名ごとの値のリスト）に変換する
+        
+        Args:
+            elements: ElementInfo のリスト
+            
+        Returns:
+            dict: 列名をキー、値のリストを値とする辞書
+        """
+        columns = {column: [] for column in cls.COLUMNS}
+        fields = [(column, cls.ATTR_FIELDS.get(column, column)) for column in cls.COLUMNS]
+        for element in elements:
+            for column, field in fields:
+                columns[column].append(getattr(element, field))
+        return columns
         
     def __str__(self):
         return f"{self.tag}: {self.text[:30]}{'...' if len(self.text) > 30 else ''}"
@@ -71,28 +555,21 @@ class ElementInfo:
         return {
             "タグ": self.tag,
             "テキスト": self.text[:50] + ('...' if len(self.text) > 50 else ''),
-            "表示状態": self.attrs.get("is_displayed", False),
-            "有効状態": self.attrs.get("is_enabled", False),
-            "ID": self.attrs.get("id", ""),
-            "クラス": self.attrs.get("class", ""),
+            "表示状態": self.is_displayed,
+            "有効状態": self.is_enabled,
+            "ID": self.id,
+            "クラス": self.class_name,
             "カテゴリー": self.category
         }
 
-    @property
-    def is_displayed(self):
-        return self.attrs.get("is_displayed", False)
-        
-    @property
-    def is_enabled(self):
-        return self.attrs.get("is_enabled", False)
-
     def get_selectors(self):
         """要素のセレクタ情報を取得"""
         selectors = {}
         reliable_selectors = []
+        attrs = self.attrs
         
         # ID属性があればIDセレクタを追加
-        element_id = self.attrs.get("id", "")
+        element_id = attrs.get("id", "")
         if element_id and element_id.strip():
             selectors["id"] = element_id
             selectors["css"] = f"#{element_id}"
@@ -103,7 +580,7 @@ class ElementInfo:
             
         # CSSセレクタの生成
         # 1. クラス属性に基づく簡易CSSセレクタを保持
-        element_class = self.attrs.get("class", "")
+        element_class = attrs.get("class", "")
         if element_class and element_class.strip():
             selectors["class"] = element_class
             # クラス名に基づく簡易CSSセレクタ (後方互換性のため残す)
@@ -117,7 +594,7 @@ class ElementInfo:
                 selectors["css_simple"] = "div"  # デフォルト
         
         # 2. 詳細なCSSセレクタを設定
-        css_path = self.attrs.get("css_path", "")
+        css_path = attrs.get("css_path", "")
         if css_path:
             # css_pathがあれば階層構造を含む詳細なCSSセレクタとして使用
             selectors["css"] = css_path
@@ -126,7 +603,7 @@ class ElementInfo:
             
             # データ属性を使用したセレクタ
             data_attr_selector = None
-            for attr, value in self.attrs.items():
+            for attr, value in attrs.items():
                 if attr.startswith("data-") and value and value.strip():
                     value = value.replace("'", "\\'")  # シングルクォートをエスケープ
                     data_attr_selector = f"{self.tag}[{attr}='{value}']"
@@ -154,7 +631,7 @@ class ElementInfo:
                 selectors["css"] = selectors.get("css_simple", self.tag or "div")
         
         # 3. XPathセレクタの生成
-        xpath = self.attrs.get("xpath", "")
+        xpath = attrs.get("xpath", "")
         if xpath:
             selectors["xpath"] = xpath
         else:
@@ -172,7 +649,7 @@ class ElementInfo:
                 selectors["xpath"] = "//div"  # デフォルト
         
         # 4. 完全なXPathセレクタを追加（要素の完全なパス）
-        full_xpath = self.attrs.get("full_xpath", "")
+        full_xpath = attrs.get("full_xpath", "")
         if full_xpath:
             selectors["full_xpath"] = full_xpath
         else:
@@ -293,6 +770,9 @@ class PageAnalyzerTool:
         # 特殊アイテムのXPathマッピング（汎用実装では空の辞書）
         self.special_item_xpath_map = {}
         
+        # カテゴリー判定ルールのファイル
+        self.category_rules_path = env.get_config_value("TOOLS", "category_rules_path", DEFAULT_RULES_PATH)
+        
         # カテゴリー別の要素リスト
         self.categorized_elements = {
             "トップバー": [],
@@ -331,6 +811,16 @@ class PageAnalyzerTool:
             self._handle_error("ブラウザセットアップ中にエラーが発生しました", e, True)
             return False
             
+    def reset_results(self):
+        """収集済みの要素情報をクリアする（同じブラウザで複数ページを解析する場合に使用）"""
+        self.elements = {
+            "clickable": [],
+            "input": []
+        }
+        self.clickable_elements = []
+        self.input_elements = []
+        self.categorized_elements = collections.defaultdict(list)
+            
     def navigate_and_login(self, url=None):
         """ログインしてページに移動"""
         try:
@@ -437,93 +927,7 @@ class PageAnalyzerTool:
         """
         try:
             # スクリプトを使ってフルXPathを取得
-            full_xpath = self.browser.driver.execute_script("""
-            function getFullXPath(element) {
-                if (!element) return '';
-                
-                // IDを持つ要素への最適化されたXPath
-                if (element.id) {
-                    return `//*[@id="${element.id}"]`;
-                }
-                
-                // 子要素を含めるかどうかを判断
-                const shouldIncludeChildren = (el) => {
-                    if (!el || !el.children) return false;
-                    // テキストを持つ子要素や特定のタグを優先
-                    for (const child of el.children) {
-                        if (child.textContent && child.textContent.trim()) return true;
-                        if (['div', 'span', 'img'].includes(child.tagName.toLowerCase())) return true;
-                    }
-                    return false;
-                };
-                
-                let path = [];
-                let current = element;
-                
-                // 階層を上に辿る
-                while (current && current.nodeType === Node.ELEMENT_NODE) {
-                    // current要素のインデックスを計算
-                    let index = 0;
-                    let sibling = current;
-                    
-                    // 同じ階層の同じタグ名の要素をカウント
-                    while (sibling) {
-                        if (sibling.nodeName === current.nodeName) {
-                            index++;
-                        }
-                        sibling = sibling.previousElementSibling;
-                    }
-                    
-                    // ノード名とインデックスを使用
-                    const tagName = current.nodeName.toLowerCase();
-                    let pathSegment = '';
-                    
-                    // IDがある場合はIDを優先
-                    if (current.id) {
-                        pathSegment = `//*[@id="${current.id}"]`;
-                        path.unshift(pathSegment);
-                        break; // IDがあれば探索終了
-                    } else {
-                        // 同階層に同じタグが複数ある場合はインデックスを付加
-                        let siblings = Array.from(current.parentNode?.children || [])
-                            .filter(s => s.nodeName === current.nodeName);
-                        
-                        if (siblings.length > 1) {
-                            pathSegment = `/${tagName}[${index}]`;
-                        } else {
-                            pathSegment = `/${tagName}`;
-                        }
-                    }
-                    
-                    path.unshift(pathSegment);
-                    
-                    // 最も浅い要素（元の要素）かつ子要素を持つ場合
-                    if (path.length === 1 && shouldIncludeChildren(current)) {
-                        // 特に重要な子要素（テキストを持つ、またはdiv/span）があれば追加
-                        for (const child of current.children) {
-                            if (child.textContent && child.textContent.trim() || 
-                                ['div', 'span'].includes(child.tagName.toLowerCase())) {
-                                path.push(`/${child.tagName.toLowerCase()}`);
-                                break;
-                            }
-                        }
-                    }
-                    
-                    current = current.parentNode;
-                    
-                    // bodyに到達したらそれ以上辿らない（XPathを短くするため）
-                    if (current && (current.nodeName === 'BODY' || current.nodeName === 'HTML')) {
-                        break;
-                    }
-                }
-                
-                // "//"ではじめて絶対パスにする
-                if (path.length > 0 && !path[0].startsWith('//*[@id=')) {
-                    return '//' + path.join('');
-                }
-                
-                return path.join('');
-            }
+            full_xpath = self.browser.driver.execute_script(FULL_XPATH_JS + """
             
             return getFullXPath(arguments[0]);
             """, element)
@@ -626,188 +1030,80 @@ class PageAnalyzerTool:
         """ページ全体の構造を解析（汎用的な実装）"""
         try:
             self.logger.info("ページ構造を解析しています...")
+            start_time = time.time()
             
-            # トップバーの検出
-            top_bar_candidates = [
-                "#top-bar", 
-                "header", 
-                ".navbar", 
-                ".header",
-                "[role='banner']",
-                "nav.navbar"
-            ]
-            
-            for selector in top_bar_candidates:
-                try:
-                    elements = self.browser.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        self.page_structure["top_bar"] = elements[0]
-                        self.logger.info(f"トップバー検出: {selector}")
-                        break
-                except Exception as e:
-                    self.logger.debug(f"トップバー検索エラー: {e}")
-            
-            # サイドバーの検出
-            sidebar_candidates = [
-                "#navbar", 
-                ".sidebar", 
-                "#sidebar", 
-                ".sidenav",
-                ".menu-nav",
-                ".side-menu"
-            ]
+            # 暗黙的な待機を無効化し、存在しない領域の候補ごとに待たされないようにする
+            self.browser.driver.implicitly_wait(0)
+            try:
+                found = self._detect_page_regions()
+            finally:
+                self.browser.driver.implicitly_wait(self.browser.timeout)
             
-            for selector in sidebar_candidates:
-                try:
-                    elements = self.browser.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        self.page_structure["side_bar"] = elements[0]
-                        self.logger.info(f"サイドバー検出: {selector}")
-                        break
-                except Exception as e:
-                    self.logger.debug(f"サイドバー検索エラー: {e}")
-            
-            # メインコンテンツの検出
-            content_candidates = [
-                "main", 
-                "#content", 
-                ".content", 
-                "[role='main']",
-                ".main-content",
-                ".container"
-            ]
+            for key, label, _ in PAGE_STRUCTURE_CANDIDATES:
+                if key in found:
+                    selector, element = found[key]
+                    self.page_structure[key] = element
+                    self.logger.info(f"{label}検出: {selector}")
             
-            for selector in content_candidates:
-                try:
-                    elements = self.browser.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        self.page_structure["main_content"] = elements[0]
-                        self.logger.info(f"メインコンテンツ検出: {selector}")
-                    break
-                except Exception as e:
-                    self.logger.debug(f"メインコンテンツ検索エラー: {e}")
-            
-            # ナビゲーションの検出
-            nav_candidates = [
-                "nav", 
-                "[role='navigation']", 
-                ".navigation",
-                ".nav-container"
-            ]
+            self.logger.info(f"ページ構造解析が完了しました ({time.time() - start_time:.2f}秒)")
             
-            for selector in nav_candidates:
+        except Exception as e:
+            self.logger.error(f"ページ構造解析中にエラーが発生: {e}")
+    
+    def _detect_page_regions(self):
+        """
+        ページの各領域を候補セレクタの優先順に検出する
+        
+        1回のスクリプト実行でまとめて検出し、失敗した場合はセレクタごとの検索に切り替える。
+        
+        Returns:
+            dict: {page_structureのキー: (一致したセレクタ, WebElement)}
+        """
+        regions = [[key, selectors] for key, _, selectors in PAGE_STRUCTURE_CANDIDATES]
+        try:
+            result = self.browser.driver.execute_script(PAGE_STRUCTURE_JS, regions) or {}
+            return {key: (match["selector"], match["element"]) for key, match in result.items()}
+        except Exception as e:
+            self.logger.warning(f"ページ構造の一括検出に失敗しました。セレクタごとの検索に切り替えます: {e}")
+        
+        found = {}
+        for key, label, selectors in PAGE_STRUCTURE_CANDIDATES:
+            for selector in selectors:
                 try:
                     elements = self.browser.driver.find_elements(By.CSS_SELECTOR, selector)
                     if elements:
-                        self.page_structure["navigation"] = elements[0]
-                        self.logger.info(f"ナビゲーション検出: {selector}")
+                        found[key] = (selector, elements[0])
                         break
                 except Exception as e:
-                    self.logger.debug(f"ナビゲーション検索エラー: {e}")
-            
-            self.logger.info("ページ構造解析が完了しました")
-            
-        except Exception as e:
-            self.logger.error(f"ページ構造解析中にエラーが発生: {e}")
+                    self.logger.debug(f"{label}検索エラー: {e}")
+        return found
     
     def _determine_element_category(self, element, tag_name, attrs, text):
-        """要素のカテゴリーを判定"""
+        """要素のカテゴリーを判定（WebDriverには問い合わせず、収集済みの属性のみを使用する）"""
         try:
             # 特定の既知要素との照合（詳細分析、データエクスポートなど）
             full_xpath = attrs.get("full_xpath", "")
             if full_xpath in self.special_item_xpath_map:
                 return self.special_item_xpath_map[full_xpath]["category"]
             
-            # コンテナタイプに基づく判定
-            container_type = attrs.get("container_type", "unknown")
-            if container_type == "top_bar":
-                return "トップバー"
-            elif container_type == "side_bar":
-                return "サイドバー"
-            elif container_type == "navigation":
-                return "ナビゲーションバー"
-            
-            # クラス名とID名からカテゴリーを推定
-            class_name = attrs.get("class", "").lower()
-            id_name = attrs.get("id", "").lower()
-            
-            # メニュー項目の判定
-            if "menu-item" in class_name or "menu-nav" in class_name or "menu-item" in id_name:
-                # 親要素の情報からサブメニューかどうかを判断
-                parent_info = attrs.get("parent", {})
-                parent_class = parent_info.get("className", "").lower()
-                if "submenu" in parent_class or "sub-menu" in parent_class or "dropdown" in parent_class:
-                    return "サブメニュー"
-                return "サイドバー"
-            
-            # ナビゲーションバー関連
-            if ("nav" in class_name or "nav" in id_name or 
-                "header" in class_name or "header" in id_name or
-                "menu" in class_name or "menu" in id_name):
-                if "top" in class_name or "header" in class_name or "main-nav" in class_name:
-                    return "トップバー"
-                elif "sub" in class_name or "sub" in id_name:
-                    return "サブメニュー"
-                elif "side" in class_name or "side" in id_name:
-                    return "サイドバー"
-                else:
-                    return "ナビゲーションバー"
-            
-            # サイドバー関連
-            if ("sidebar" in class_name or "sidebar" in id_name or
-                "side-bar" in class_name or "side-bar" in id_name or
-                "sidenav" in class_name or "sidenav" in id_name):
-                return "サイドバー"
-            
-            # テーブル関連
-            if (tag_name == "table" or "table" in class_name or "table" in id_name or
-                tag_name == "tr" or tag_name == "td" or tag_name == "th"):
-                return "テーブル"
-                
-            # フォーム関連
-            if (tag_name == "form" or "form" in class_name or "form" in id_name or
-                tag_name == "input" or tag_name == "select" or tag_name == "textarea"):
-                return "フォーム"
-            
-            # ボタン関連
-            if (tag_name == "button" or "btn" in class_name or "button" in class_name or
-                "submit" in class_name or "btn" in id_name):
-                return "ボタン"
-                
-            # リンク関連
-            if tag_name == "a":
-                # 親要素の情報からカテゴリーを判断
-                parent_info = attrs.get("parent", {})
-                parent_class = parent_info.get("className", "").lower()
-                
-                if "menu" in parent_class:
-                    return "サイドバー"
-                elif "navbar" in parent_class or "nav" in parent_class or "header" in parent_class:
-                    return "トップバー"
-                else:
-                    return "リンク"
-                
-            # コンテンツ本体関連
-            if ("content" in class_name or "content" in id_name or
-                "main" in class_name or "main" in id_name or
-                "body" in class_name or "body" in id_name):
-                return "コンテンツ本体"
-            
-            # 要素の位置からカテゴリー推定
-            location = attrs.get("location", {})
-            if location:
-                x = location.get("x", 0)
-                y = location.get("y", 0)
-                
-                # 画面上部のものはトップバーの可能性
-                if y < 100:
-                    return "トップバー"
-                # 画面左側のものはサイドバーの可能性
-                elif x < 200:
-                    return "サイドバー"
-            
-            # デフォルトカテゴリー
-            return "その他"
+            # ルールテーブル（config/category_rules.yaml）で判定する
+            matcher = get_category_matcher("page_analyzer", self.category_rules_path, self.logger)
+            if matcher is None:
+                return "その他"
+            parent_info = attrs.get("parent") or {}
+            return matcher.categorize({
+                "tag": tag_name,
+                "text": text,
+                "id": attrs.get("id", ""),
+                "class": attrs.get("class", ""),
+                "name": attrs.get("name", ""),
+                "type": attrs.get("type", ""),
+                "role": attrs.get("role", ""),
+                "href": attrs.get("href", ""),
+                "parent_class": parent_info.get("className", ""),
+                "container_type": attrs.get("container_type", "unknown"),
+                "location": attrs.get("location"),
+            })
             
         except Exception as e:
             self.logger.debug(f"カテゴリー判定中にエラーが発生しました: {e}")
@@ -1087,6 +1383,59 @@ class PageAnalyzerTool:
             self.logger.error(f"JSONエクスポート中にエラーが発生しました: {e}")
             return None
     
+    def elements_to_dataframe(self, element_type="all"):
+        """
+        収集した要素を列形式のDataFrameに変換する
+        
+        Args:
+            element_type: "clickable"、"input"、または "all"
+            
+        Returns:
+            pd.DataFrame: 1行1要素のDataFrame（element_type 列付き）
+        """
+        types = ["clickable", "input"] if element_type == "all" else [element_type]
+        frames = []
+        for elem_type in types:
+            frame = pd.DataFrame(ElementInfo.to_columns(self.elements.get(elem_type, [])))
+            frame.insert(0, "element_type", elem_type)
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+    
+    def export_elements_columnar(self, filename=None):
+        """
+        収集した要素を列形式のファイルに出力する（大きなページ向け）
+        
+        拡張子が .parquet の場合はParquet（pyarrowが必要）、それ以外はpickleで出力する。
+        
+        Args:
+            filename: 出力ファイル名（省略時は elements_<タイムスタンプ>.pkl）
+            
+        Returns:
+            str or None: 出力したファイルのパス。失敗した場合はNone
+        """
+        if not filename:
+            filename = f"elements_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pkl"
+        if not os.path.isabs(filename):
+            filename = os.path.join(self.output_dir, filename)
+        
+        try:
+            frame = self.elements_to_dataframe()
+            if filename.endswith(".parquet"):
+                # locationは辞書のためParquetでは列に展開する
+                location = pd.json_normalize(frame.pop("location").tolist()).add_prefix("location_")
+                frame = pd.concat([frame, location], axis=1)
+                frame.to_parquet(filename, index=False)
+            else:
+                frame.to_pickle(filename)
+            self.logger.info(f"要素情報を列形式で出力しました: {filename} ({len(frame)}件)")
+            return filename
+        except ImportError as e:
+            self.logger.error(f"Parquet出力に必要なライブラリがインストールされていません: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"要素情報の列形式出力中にエラーが発生しました: {e}")
+            return None
+    
     def save_html_source(self, filename=None, html_dir=None):
         """
         現在のページのHTMLソースを保存する
@@ -1187,24 +1536,24 @@ class PageAnalyzerTool:
         
         try:
             # 検索セレクタの定義
-            selectors_map = {
-                "clickable": [
-                    "a", "button", 
-                    "input[type='button']", "input[type='submit']", 
-                    "[role='button']", ".btn", "[onclick]",
-                    "input[type='checkbox']", "input[type='radio']"
-                ],
-                "input": [
-                    "input:not([type='hidden'])",
-                    "textarea",
-                    "select"
-                ]
-            }
+            selectors_map = INTERACTIVE_ELEMENT_SELECTORS
             
             # 処理対象のエレメントタイプを決定
             element_types = ["clickable", "input"] if element_type == "all" else [element_type]
             
-            # 各タイプに対して要素収集
+            # 1回のスクリプト実行で全要素の情報を一括取得する
+            records = self._extract_elements_bulk(
+                {t: selectors_map[t] for t in element_types if t in selectors_map}
+            )
+            if records is not None:
+                for record in records:
+                    info = self._element_info_from_record(record)
+                    if info.attrs.get("is_displayed") and info.attrs.get("is_enabled"):
+                        self._register_element(info, record["element_type"])
+                        collected_elements.append(info)
+                element_types = []  # 個別取得は不要
+            
+            # 一括取得に失敗した場合は要素ごとに収集する
             for elem_type in element_types:
                 if elem_type not in selectors_map:
                     continue
@@ -1218,22 +1567,7 @@ class PageAnalyzerTool:
                                 info = self._collect_element_info(element, elem_type)
                                 if info and info.attrs.get("is_displayed") and info.attrs.get("is_enabled"):
                                     collected_elements.append(info)
-                                    
-                                    # 要素タイプに応じたリストに追加
-                                    self.elements[elem_type].append(info)
-                                    
-                                    # カテゴリー決定と分類
-                                    if elem_type == "clickable":
-                                        category = self._determine_element_category(
-                                            element, 
-                                            info.tag, 
-                                            info.attrs, 
-                                            info.text
-                                        )
-                                    else:
-                                        category = "フォーム"
-                                        
-                                    self.categorized_elements[category].append(info)
+                                    self._register_element(info, elem_type)
                                     
                             except Exception as e:
                                 self.logger.debug(f"要素処理中にエラー: {e}")
@@ -1255,6 +1589,91 @@ class PageAnalyzerTool:
             self.logger.error(f"要素収集中にエラーが発生しました: {e}")
             return []
             
+    def _extract_elements_bulk(self, selectors_map):
+        """
+        インタラクティブ要素の情報を1回のスクリプト実行で一括取得する
+        
+        Args:
+            selectors_map: {要素タイプ: [CSSセレクタ, ...]} の辞書
+            
+        Returns:
+            list or None: 要素情報の辞書のリスト。スクリプト実行に失敗した場合はNone
+        """
+        try:
+            start_time = time.time()
+            result = self.browser.driver.execute_script(BULK_EXTRACTION_JS, selectors_map)
+            records = json.loads(result) if isinstance(result, str) else result
+            self.logger.debug(f"要素情報を一括取得しました: {len(records)}件 ({time.time() - start_time:.2f}秒)")
+            return records
+        except Exception as e:
+            self.logger.warning(f"要素情報の一括取得に失敗しました。要素ごとの取得に切り替えます: {e}")
+            return None
+    
+    def _element_info_from_record(self, record):
+        """
+        一括取得した要素情報からElementInfoを生成する（WebDriverへの追加問い合わせなし）
+        
+        Args:
+            record: _extract_elements_bulk が返す要素情報の辞書
+            
+        Returns:
+            ElementInfo: 要素情報
+        """
+        tag_name = record.get("tag", "")
+        attrs = {
+            "id": record.get("id", ""),
+            "name": record.get("name", ""),
+            "class": record.get("class", ""),
+            "is_displayed": record.get("is_displayed", False),
+            "is_enabled": record.get("is_enabled", False),
+            "xpath": record.get("xpath", ""),
+            # full_xpathは要素ごとの取得時と同じくxpathと同一の値を用いる
+            "full_xpath": record.get("xpath", ""),
+            "css_path": record.get("css_path", ""),
+            "location": record.get("location", {})
+        }
+        
+        if record.get("element_type") == "input":
+            attrs.update({
+                "type": record.get("type") or tag_name,
+                "value": record.get("value", ""),
+                "placeholder": record.get("placeholder", "")
+            })
+            text = record.get("value") or record.get("placeholder") or ""
+            category = "フォーム"
+        else:
+            attrs.update({
+                "type": record.get("type", ""),
+                "role": record.get("role", "")
+            })
+            text = record.get("text") or record.get("value") or ""
+            category = "未分類"  # カテゴリは後で_determine_element_categoryで決定
+        
+        # WebElement は保持せず、必要になった時点でXPathから再取得する（オフライン解析ではブラウザがない）
+        driver = self.browser.driver if self.browser else None
+        return ElementInfo(element=None, tag=tag_name, text=text, attrs=attrs, category=category,
+                           driver=driver)
+    
+    def _register_element(self, info, elem_type):
+        """
+        収集した要素を要素タイプ別・カテゴリー別のリストに登録する
+        
+        Args:
+            info: ElementInfo
+            elem_type: 要素タイプ（"clickable"または"input"）
+        """
+        # 要素タイプに応じたリストに追加
+        self.elements[elem_type].append(info)
+        
+        # カテゴリー決定と分類
+        if elem_type == "clickable":
+            category = self._determine_element_category(info.get_element(resolve=False), info.tag, info.attrs, info.text)
+        else:
+            category = "フォーム"
+        
+        info.category = category
+        self.categorized_elements[category].append(info)
+
     def _collect_element_info(self, element, element_type):
         """
         要素の詳細情報を収集する
@@ -1380,48 +1799,14 @@ class PageAnalyzerTool:
 
     def _remove_duplicates(self):
         """重複する要素を削除"""
-        # 各要素リストから重複を排除
+        # 各要素リストから重複を排除（ID、XPath、タグ＋テキスト＋位置の複合キー）
         for key in self.elements:
-            unique_elements = []
-            seen_ids = set()
-            seen_xpaths = set()
-            
-            for element in self.elements[key]:
-                # 要素のIDまたはXPathを取得
-                element_id = None
-                element_xpath = None
-                
-                # IDによる重複チェック
-                if hasattr(element.element, "id"):
-                    element_id = element.element.id
-                elif element.attrs.get("id"):
-                    element_id = element.attrs.get("id")
-                
-                # XPathによる重複チェック
-                element_xpath = element.attrs.get("xpath")
-                
-                # ID、XPath、テキスト＋タグの組み合わせで重複チェック
-                is_duplicate = False
-                if element_id and element_id in seen_ids:
-                    is_duplicate = True
-                elif element_xpath and element_xpath in seen_xpaths:
-                    is_duplicate = True
-                else:
-                    # IDとXPath以外の場合は、テキストとタグの組み合わせで重複チェック
-                    for existing in unique_elements:
-                        if (existing.tag == element.tag and
-                            existing.text == element.text and
-                            existing.attrs.get("location") == element.attrs.get("location")):
-                            is_duplicate = True
-                            break
-                
-                # 重複でなければリストに追加
-                if not is_duplicate:
-                    if element_id:
-                        seen_ids.add(element_id)
-                    if element_xpath:
-                        seen_xpaths.add(element_xpath)
-                    unique_elements.append(element)
+            unique_elements, stats = deduplicate_element_infos(self.elements[key])
+            if stats.duplicates:
+                self.logger.debug(
+                    f"重複要素を除外しました ({key}): {stats.duplicates}件 "
+                    f"(入力 {stats.total}件 → {stats.unique}件, 内訳 {stats.matched_by})"
+                )
             
             # 重複排除後のリストで更新
             self.elements[key] = unique_elements
@@ -1721,143 +2106,7 @@ class PageAnalyzerTool:
                 
             # データ属性を確認 - 適切な子要素も含めたセレクタを生成するため、JavaScript関数を常に優先して使用
             if use_js:
-                css_path_script = """
-                function getCssPath(element) {
-                    if (!element) return null;
-                    
-                    // 直接のIDセレクタをチェック
-                    if (element.id) return `#${element.id}`;
-                    
-                    // 重要な子要素をチェック
-                    const hasImportantChild = (el) => {
-                        if (!el || !el.children.length === 0) return false;
-                        // 子要素の配列を返す
-                        const importantChildren = [];
-                        for (const child of el.children) {
-                            // テキストを持つ子要素や特定のタグを優先
-                            if (child.textContent && child.textContent.trim()) {
-                                importantChildren.push(child);
-                            } else if (['div', 'span', 'img', 'i', 'em', 'strong'].includes(child.tagName.toLowerCase())) {
-                                importantChildren.push(child);
-                            }
-                        }
-                        return importantChildren.length > 0 ? importantChildren : false;
-                    };
-                    
-                    // 親要素を含むセレクタを構築
-                    const buildPath = (element, includeChild = false) => {
-                        if (!element) return '';
-                        
-                        let path = [];
-                        let current = element;
-                        let childSelector = '';
-                        
-                        // 重要な子要素を持つ場合、その子要素をセレクタに含める
-                        if (includeChild) {
-                            const importantChildren = hasImportantChild(element);
-                            if (importantChildren && importantChildren.length > 0) {
-                                // 最初の重要な子要素を使用
-                                const firstChild = importantChildren[0];
-                                childSelector = ` > ${firstChild.tagName.toLowerCase()}`;
-                            }
-                        }
-                        
-                        // 5階層の深さを上限に親要素をたどる
-                        let depth = 0;
-                        const maxDepth = 5;
-                        
-                        while (current && current.nodeType === 1 && depth < maxDepth) {
-                            // ベースセレクタの作成
-                            let selector = current.tagName.toLowerCase();
-                            
-                            // IDがあればそれを利用して階層探索を終了
-                            if (current.id) {
-                                path.unshift(`#${current.id}`);
-                                if (depth === 0 && childSelector) path[0] += childSelector;
-                                break;
-                            }
-                            
-                            // 兄弟要素の中での位置を特定（nth-child）
-                            // より安定したnth-childを使用する
-                            if (current.parentNode) {
-                                const children = Array.from(current.parentNode.children);
-                                const index = children.indexOf(current) + 1;
-                                
-                                if (children.length > 1) {
-                                    selector += `:nth-child(${index})`;
-                                }
-                            }
-                            
-                            // クラスと属性を追加
-                            if (current.className && typeof current.className === 'string') {
-                                const classes = current.className.trim().split(/\\s+/).filter(Boolean);
-                                
-                                if (classes.length > 0) {
-                                    // 重要なクラスとReact特有のクラスを優先
-                                    const significantClasses = classes.filter(c => 
-                                        /^(nav|menu|btn|button|tab|header|footer|main|content|row|container|active|selected|primary|navbar)/.test(c)
-                                    );
-                                    
-                                    // data属性を持つ場合は最小限のクラスを使用
-                                    const hasDataAttributes = Object.entries(current.attributes).some(([_, attr]) => 
-                                        attr.name && attr.name.startsWith('data-')
-                                    );
-                                    
-                                    if (significantClasses.length > 0) {
-                                        // 重要なクラスを最大1つだけ追加（セレクタをシンプルに保つ）
-                                        selector += `.${significantClasses[0]}`;
-                                    } else if (!hasDataAttributes && classes.length > 0) {
-                                        // データ属性がなく、クラスがある場合は最初のクラスを使用
-                                        selector += `.${classes[0]}`;
-                                    }
-                                }
-                            }
-                            
-                            // data-rb-event-keyなど重要な属性を追加
-                            let attributeAdded = false;
-                            for (const attr of ['data-rb-event-key', 'data-testid', 'data-id', 'role', 'name']) {
-                                const value = current.getAttribute(attr);
-                                if (value && value.trim()) {
-                                    const escapedValue = value.replace(/'/g, "\\'");
-                                    selector += `[${attr}='${escapedValue}']`;
-                                    attributeAdded = true;
-                                    break;
-                                }
-                            }
-                            
-                            // 最初の要素（元の要素）にchildSelectorを追加
-                            if (depth === 0 && childSelector) {
-                                selector += childSelector;
-                            }
-                            
-                            path.unshift(selector);
-                            current = current.parentNode;
-                            depth++;
-                            
-                            // 親要素にIDがあれば、それをパスの先頭に追加して終了
-                            if (current && current.id) {
-                                path.unshift(`#${current.id}`);
-                                break;
-                            }
-                        }
-                        
-                        return path.join(' > ');
-                    };
-                    
-                    // まず子要素を含めたセレクタを試す
-                    let selector = buildPath(element, true);
-                    
-                    // 特別なケース：テキストを含む要素やリンク要素の処理
-                    const hasText = element.textContent && element.textContent.trim();
-                    const isLinkOrButton = ['a', 'button'].includes(element.tagName.toLowerCase());
-                    
-                    if ((isLinkOrButton || hasText) && element.children.length > 0) {
-                        // 子要素を含めたより具体的なセレクタを生成
-                        return buildPath(element, true);
-                    }
-                    
-                    return selector;
-                }
+                css_path_script = CSS_PATH_JS + """
                 
                 try {
                     return getCssPath(arguments[0]);
@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+複数ページの並列セレクタ解析（クロールモード）
+
+EBiSに1回だけログインし、そのセッションのCookieを複数のブラウザで共有して
+複数ページを並列に解析します。各ページの結果は1つのセレクタカタログにまとめ、
+同じ要素は重複排除したうえで、どのページに出現したか（pages列）を記録します。
+
+使用例:
+$ python -m src.modules.ebis.page_crawler --headless
+$ python -m src.modules.ebis.page_crawler --urls https://bishamon.ebis.ne.jp/dashboard,https://bishamon.ebis.ne.jp/cv-attribute
+"""
+
+import os
+import sys
+import queue
+import argparse
+import threading
+from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional
+
+from src.utils.logging_config import get_logger
+from src.utils.environment import env
+from src.modules.ebis.login_page import login
+from src.modules.ebis.page_analyzer_tool import OUTPUT_DIR, PageAnalyzerTool
+
+# ロガーの初期化
+logger = get_logger(__name__)
+
+# Selenium のCookie辞書と CDP Network.setCookies のキーの対応
+CDP_COOKIE_KEYS = {
+    "name": "name",
+    "value": "value",
+    "domain": "domain",
+    "path": "path",
+    "secure": "secure",
+    "httpOnly": "httpOnly",
+    "sameSite": "sameSite",
+    "expiry": "expires",
+}
+
+
+def page_slug(url: str) -> str:
+    """
+    URLからページを識別する短い名前を生成する
+
+    Args:
+        url: ページのURL
+
+    Returns:
+        str: パスをアンダースコアでつないだ名前（例: details_analysis）
+    """
+    path = urlparse(url).path.strip("/")
+    slug = path.replace("/", "_").replace("-", "_")
+    return "".join(c for c in slug if c.isalnum() or c == "_") or "top"
+
+
+def merge_page_selectors(page_results: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    ページごとのセレクタ情報を1つのカタログにまとめる
+
+    要素タイプ・完全XPath（なければCSS）・テキストが同じセレクタは同一要素とみなし、
+    最初に出現したページの情報を残して出現ページを pages 列に追記する。
+
+    Args:
+        page_results: URLごとのセレクタ情報（collect_selectors() の戻り値）
+
+    Returns:
+        List[Dict[str, Any]]: 重複排除したセレクタ情報
+            - name: <ページ名>_<元の名前>
+            - source_url: 最初に出現したページのURL
+            - pages: 出現したページのURL（"|" 区切り）
+            - page_count: 出現したページ数
+    """
+    catalogue: Dict[tuple, Dict[str, Any]] = {}
+    for url, selectors in page_results.items():
+        slug = page_slug(url)
+        for selector in selectors:
+            locator = selector.get("full_xpath") or selector.get("css") or selector.get("xpath", "")
+            key = (selector.get("element_type", ""), locator, (selector.get("text_value") or "").strip())
+            entry = catalogue.get(key)
+            if entry is None:
+                entry = dict(selector)
+                entry["name"] = f"{slug}_{selector.get('name', '')}"
+                entry["source_url"] = url
+                entry["_pages"] = [url]
+                catalogue[key] = entry
+            elif url not in entry["_pages"]:
+                entry["_pages"].append(url)
+
+    merged = []
+    for entry in catalogue.values():
+        pages = entry.pop("_pages")
+        entry["pages"] = "|".join(pages)
+        entry["page_count"] = len(pages)
+        merged.append(entry)
+    return merged
+
+
+class PageCrawler:
+    """
+    ログインセッションを共有した複数のブラウザでページを並列に解析するクラス
+    """
+
+    def __init__(self, urls: List[str], headless: bool = False, output_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+        """
+        初期化
+
+        Args:
+            urls: 解析するページのURLリスト
+            headless: ヘッドレスモードで実行するかどうか
+            output_dir: 出力ディレクトリ（デフォルトは data/page_analyze）
+            max_workers: 同時に起動するブラウザ数（Noneの場合は設定ファイルの値）
+        """
+        self.logger = get_logger(__name__)
+        self.urls = list(dict.fromkeys(urls))
+        self.headless = headless
+        self.output_dir = output_dir or OUTPUT_DIR
+        if max_workers is None:
+            max_workers = int(env.get_config_value("PAGE_CRAWLER", "max_workers", 2))
+        self.max_workers = max(1, min(max_workers, len(self.urls) or 1))
+        self.tools: List[PageAnalyzerTool] = []
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _create_tool(self) -> Optional[PageAnalyzerTool]:
+        """ブラウザを起動した PageAnalyzerTool を作成する"""
+        tool = PageAnalyzerTool(headless=self.headless, output_dir=self.output_dir)
+        if not tool.setup():
+            tool.close()
+            return None
+        self.tools.append(tool)
+        return tool
+
+    def _share_session(self, tool: PageAnalyzerTool, cookies: List[Dict[str, Any]]) -> bool:
+        """
+        ログイン済みセッションのCookieを別のブラウザに設定する
+
+        CDP の Network.setCookies はドメインをまたいで一括設定できるため優先して使用し、
+        失敗した場合はトップページに移動してから add_cookie で設定する。
+
+        Args:
+            tool: Cookieを設定するツール
+            cookies: ログイン済みブラウザの get_cookies() の戻り値
+
+        Returns:
+            bool: 設定に成功した場合はTrue
+        """
+        driver = tool.browser.driver
+        try:
+            cdp_cookies = [
+                {CDP_COOKIE_KEYS[k]: v for k, v in cookie.items() if k in CDP_COOKIE_KEYS}
+                for cookie in cookies
+            ]
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cdp_cookies})
+            return True
+        except Exception as e:
+            self.logger.debug(f"CDPによるCookie設定に失敗したため add_cookie を使用します: {e}")
+
+        try:
+            top_url = env.get_config_value("EBIS", "top_url")
+            tool.browser.navigate_to(top_url)
+            current_host = urlparse(driver.current_url).hostname or ""
+            added = 0
+            for cookie in cookies:
+                domain = (cookie.get("domain") or "").lstrip(".")
+                if domain and not current_host.endswith(domain):
+                    continue
+                try:
+                    driver.add_cookie(cookie)
+                    added += 1
+                except Exception:
+                    continue
+            return added > 0
+        except Exception as e:
+            self.logger.error(f"セッションの共有中にエラーが発生しました: {e}")
+            return False
+
+    def _is_login_page(self, tool: PageAnalyzerTool) -> bool:
+        """現在のページがログインページかどうか"""
+        login_host = urlparse(env.get_config_value("LOGIN", "url")).hostname
+        return urlparse(tool.browser.driver.current_url).hostname == login_host
+
+    def _analyze_url(self, tool: PageAnalyzerTool, url: str, save_html: bool) -> List[Dict[str, Any]]:
+        """
+        1ページを解析してセレクタ情報を返す
+
+        Args:
+            tool: 解析に使用するツール
+            url: ページのURL
+            save_html: HTMLソースを保存するかどうか
+
+        Returns:
+            List[Dict[str, Any]]: セレクタ情報
+        """
+        tool.reset_results()
+        if not tool.browser.navigate_to(url):
+            raise RuntimeError("ページへの移動に失敗しました")
+
+        # セッションが共有できていない場合はこのブラウザでログインし直す
+        if self._is_login_page(tool):
+            self.logger.warning(f"ログインページにリダイレクトされたため再ログインします: {url}")
+            if not login(tool.browser) or not tool.browser.navigate_to(url):
+                raise RuntimeError("再ログインに失敗しました")
+
+        result = tool.analyze_page(save_html=save_html)
+        if not result or not result.get("success"):
+            raise RuntimeError("ページ解析に失敗しました")
+        return tool.collect_selectors()
+
+    def _worker(self, tool: PageAnalyzerTool, url_queue: "queue.Queue[str]", save_html: bool) -> None:
+        """キューからURLを取り出して解析するワーカー"""
+        while True:
+            try:
+                url = url_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                selectors = self._analyze_url(tool, url, save_html)
+                with self._lock:
+                    self.results[url] = selectors
+                self.logger.info(f"ページを解析しました: {url} ({len(selectors)}件)")
+            except Exception as e:
+                with self._lock:
+                    self.errors[url] = str(e)
+                self.logger.error(f"ページの解析中にエラーが発生しました: {url}: {e}")
+                tool.browser.save_screenshot(f"crawl_error_{page_slug(url)}")
+
+    def crawl(self, save_html: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        ログインして全ページを並列に解析する
+
+        Args:
+            save_html: 各ページのHTMLソースを保存するかどうか
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: URLごとのセレクタ情報（入力順、失敗したページは含まない）
+        """
+        self.results = {}
+        self.errors = {}
+        if not self.urls:
+            self.logger.warning("解析対象のURLがありません")
+            return self.results
+
+        primary = self._create_tool()
+        if not primary:
+            self.logger.error("ブラウザのセットアップに失敗しました")
+            return self.results
+        if not primary.navigate_and_login():
+            self.logger.error("ログインに失敗しました")
+            return self.results
+
+        cookies = primary.browser.driver.get_cookies()
+        workers = [primary]
+        for _ in range(self.max_workers - 1):
+            tool = self._create_tool()
+            if not tool:
+                self.logger.warning("追加のブラウザを起動できなかったため、起動済みのブラウザで続行します")
+                break
+            if not self._share_session(tool, cookies):
+                self.logger.warning("セッションを共有できなかったブラウザは各ページで再ログインします")
+            workers.append(tool)
+
+        self.logger.info(f"{len(self.urls)} ページを {len(workers)} 個のブラウザで解析します")
+        url_queue: "queue.Queue[str]" = queue.Queue()
+        for url in self.urls:
+            url_queue.put(url)
+
+        threads = [
+            threading.Thread(target=self._worker, args=(tool, url_queue, save_html), name=f"page-crawler-{i}")
+            for i, tool in enumerate(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 出力順を入力順にそろえる
+        self.results = {url: self.results[url] for url in self.urls if url in self.results}
+        return self.results
+
+    def export(self, csv_filename: str = "crawl_selectors.csv",
+               json_filename: str = "crawl_selectors.json") -> bool:
+        """
+        解析結果をまとめたセレクタカタログを出力する
+
+        Args:
+            csv_filename: CSV出力ファイル名
+            json_filename: JSON出力ファイル名
+
+        Returns:
+            bool: 出力が成功したかどうか
+        """
+        catalogue = merge_page_selectors(self.results)
+        if not catalogue:
+            self.logger.warning("エクスポートするセレクタがありません")
+            return False
+
+        if not os.path.isabs(csv_filename):
+            csv_filename = os.path.join(self.output_dir, csv_filename)
+        if not os.path.isabs(json_filename):
+            json_filename = os.path.join(self.output_dir, json_filename)
+
+        tool = self.tools[0] if self.tools else PageAnalyzerTool(headless=True, output_dir=self.output_dir)
+        return tool.export_selectors(catalogue, csv_filename, json_filename)
+
+    def close(self) -> None:
+        """起動したすべてのブラウザを終了する"""
+        for tool in self.tools:
+            tool.close()
+        self.tools = []
+
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="複数ページの並列セレクタ解析")
+    parser.add_argument('--urls', help='解析するURL（カンマ区切り、省略時は設定ファイルの PAGE_CRAWLER.urls）', type=str, default=None)
+    parser.add_argument('--headless', help='ヘッドレスモードで実行', action='store_true')
+    parser.add_argument('--workers', help='同時に起動するブラウザ数', type=int, default=None)
+    parser.add_argument('--output-dir', help='出力ディレクトリ', default=OUTPUT_DIR)
+    parser.add_argument('--csv-output', help='CSV出力ファイル名', default="crawl_selectors.csv")
+    parser.add_argument('--json-output', help='JSON出力ファイル名', default="crawl_selectors.json")
+    parser.add_argument('--no-save-html', help='HTMLソースを保存しない', dest='save_html', action='store_false')
+    return parser.parse_args()
+
+
+def main():
+    """メイン処理"""
+    args = parse_args()
+
+    urls_value = args.urls or env.get_config_value("PAGE_CRAWLER", "urls", "")
+    urls = [url.strip() for url in urls_value.split(",") if url.strip()]
+    if not urls:
+        logger.error("解析するURLが指定されていません")
+        return 1
+
+    crawler = PageCrawler(urls, headless=args.headless, output_dir=args.output_dir, max_workers=args.workers)
+    try:
+        results = crawler.crawl(save_html=args.save_html)
+        if not crawler.export(args.csv_output, args.json_output):
+            return 1
+
+        print(f"\n{len(results)}/{len(urls)} ページを解析しました")
+        for url, error in crawler.errors.items():
+            print(f"失敗: {url} ({error})")
+        print(f"CSV: {os.path.join(args.output_dir, args.csv_output)}")
+        print(f"JSON: {os.path.join(args.output_dir, args.json_output)}")
+        return 0 if not crawler.errors else 1
+    finally:
+        crawler.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
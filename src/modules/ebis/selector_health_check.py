@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+セレクタのヘルスチェック
+
+config/selectors.csv に定義された全セレクタを対象ページ上で解決し、
+found / missing / ambiguous / invisible / error の状態と検出までの時間を報告します。
+ページごとに1回のページ内スクリプトでまとめて解決するため、
+夜間のダウンロード処理の前に短時間でセレクタの破損を検出できます。
+
+グループごとの対象ページは settings.ini の [SELECTOR_HEALTH] で指定します
+（キーがグループ名、値がURL。未指定のグループは default_url）。
+
+使用例:
+$ python -m src.modules.ebis.selector_health_check --headless
+"""
+
+import os
+import sys
+import csv
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from tabulate import tabulate
+
+from src.utils.logging_config import get_logger
+from src.utils.environment import env
+from src.modules.selenium.browser import Browser
+from src.modules.ebis.login_page import login
+
+# ロガーの初期化
+logger = get_logger(__name__)
+
+# レポートの出力先
+OUTPUT_DIR = os.path.join("data", "selector_health")
+
+# ログイン前に確認するセレクタグループ
+PRE_LOGIN_GROUPS = ("login",)
+
+# レポートの列
+REPORT_FIELDS = [
+    "group", "name", "selector_type", "selector_value", "page_url",
+    "status", "count", "visible", "latency_ms", "error",
+]
+
+
+def group_page_url(group: str) -> str:
+    """
+    セレクタグループの確認対象ページのURLを取得する
+
+    Args:
+        group: セレクタグループ名
+
+    Returns:
+        str: ページのURL
+    """
+    if group in PRE_LOGIN_GROUPS:
+        default = env.get_config_value("LOGIN", "url")
+    else:
+        default = env.get_config_value(
+            "SELECTOR_HEALTH", "default_url", env.get_config_value("LOGIN", "success_url")
+        )
+    return env.get_config_value("SELECTOR_HEALTH", group, default)
+
+
+def plan_pages(keys: List[Tuple[str, str]]) -> List[Tuple[str, bool, List[Tuple[str, str]]]]:
+    """
+    セレクタをページごとにまとめる
+
+    Args:
+        keys: (グループ, 名前) のリスト
+
+    Returns:
+        List[Tuple[str, bool, List[Tuple[str, str]]]]: (URL, ログイン前か, セレクタ) のリスト。
+            ログイン前に確認するページが先頭に並ぶ
+    """
+    pages: Dict[Tuple[str, bool], List[Tuple[str, str]]] = {}
+    for group, name in keys:
+        pre_login = group in PRE_LOGIN_GROUPS
+        pages.setdefault((group_page_url(group), pre_login), []).append((group, name))
+    ordered = sorted(pages.items(), key=lambda item: not item[0][1])
+    return [(url, pre_login, page_keys) for (url, pre_login), page_keys in ordered]
+
+
+class SelectorHealthChecker:
+    """
+    selectors.csv のセレクタを一括で検証するクラス
+    """
+
+    def __init__(self, browser: Browser, timeout: Optional[float] = None):
+        """
+        初期化
+
+        Args:
+            browser: セットアップ済みのブラウザ
+            timeout: ページごとに要素の出現を待つ最大秒数（Noneの場合は設定ファイルの値）
+        """
+        self.logger = get_logger(__name__)
+        self.browser = browser
+        if timeout is None:
+            timeout = float(env.get_config_value("SELECTOR_HEALTH", "timeout", 5))
+        self.timeout = timeout
+
+    def run(self, groups: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        ヘルスチェックを実行する
+
+        Args:
+            groups: 対象のセレクタグループ（Noneの場合はすべて）
+
+        Returns:
+            List[Dict[str, Any]]: セレクタごとの結果（REPORT_FIELDS の列を持つ辞書）
+        """
+        if not self.browser.selectors:
+            self.browser._load_selectors()
+        keys = [
+            (group, name)
+            for group, names in self.browser.selectors.items()
+            if groups is None or group in groups
+            for name in names
+        ]
+        self.logger.info(f"{len(keys)} 件のセレクタを検証します")
+
+        report = []
+        logged_in = False
+        login_failed = False
+        for url, pre_login, page_keys in plan_pages(keys):
+            if not pre_login and not logged_in:
+                # ログインの失敗は1回だけ試行し、残りのログイン後のページは再試行せずに失敗とする
+                if not login_failed and login(self.browser):
+                    logged_in = True
+                else:
+                    if not login_failed:
+                        self.logger.error("ログインに失敗したため、ログイン後のページを検証できません")
+                        login_failed = True
+                    report.extend(self._rows(url, page_keys, {}, "ログインに失敗しました"))
+                    continue
+
+            if not self.browser.navigate_to(url):
+                report.extend(self._rows(url, page_keys, {}, "ページへの移動に失敗しました"))
+                continue
+            self.browser.wait_for_page_load()
+
+            results = self.browser.probe_selectors(page_keys, timeout=self.timeout)
+            rows = self._rows(url, page_keys, results)
+            report.extend(rows)
+            broken = sum(1 for row in rows if row["status"] != "found")
+            self.logger.info(f"ページを検証しました: {url} ({len(rows)}件中 {broken}件に問題あり)")
+        return report
+
+    def _rows(self, url: str, keys: List[Tuple[str, str]], results: Dict[Tuple[str, str], Dict[str, Any]],
+              error: Optional[str] = None) -> List[Dict[str, Any]]:
+        """ページの検証結果をレポート行に変換する"""
+        rows = []
+        for group, name in keys:
+            selector = self.browser.selectors.get(group, {}).get(name, {})
+            result = results.get((group, name), {})
+            latency = result.get("latency_ms")
+            rows.append({
+                "group": group,
+                "name": name,
+                "selector_type": selector.get("selector_type", ""),
+                "selector_value": selector.get("selector_value", ""),
+                "page_url": url,
+                "status": result.get("status", "error"),
+                "count": result.get("count", 0),
+                "visible": result.get("visible", 0),
+                "latency_ms": round(latency, 1) if latency is not None else "",
+                "error": result.get("error") or error or "",
+            })
+        return rows
+
+    @staticmethod
+    def summarize(report: List[Dict[str, Any]]) -> Dict[str, int]:
+        """状態ごとの件数を集計する"""
+        summary = {"found": 0, "missing": 0, "ambiguous": 0, "invisible": 0, "error": 0}
+        for row in report:
+            summary[row["status"]] = summary.get(row["status"], 0) + 1
+        return summary
+
+    def export(self, report: List[Dict[str, Any]], filename: Optional[str] = None,
+               output_dir: Optional[str] = None) -> Optional[str]:
+        """
+        レポートをCSVファイルに出力する
+
+        Args:
+            report: run() の戻り値
+            filename: 出力ファイル名（省略時はタイムスタンプ付き）
+            output_dir: 出力ディレクトリ
+
+        Returns:
+            str or None: 出力したファイルのパス。失敗した場合はNone
+        """
+        output_dir = output_dir or OUTPUT_DIR
+        filename = filename or f"selector_health_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        path = filename if os.path.isabs(filename) else os.path.join(output_dir, filename)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, quoting=csv.QUOTE_ALL)
+                writer.writeheader()
+                writer.writerows(report)
+            self.logger.info(f"ヘルスチェックの結果を出力しました: {path}")
+            return path
+        except Exception as e:
+            self.logger.error(f"ヘルスチェック結果の出力中にエラーが発生しました: {e}")
+            return None
+
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="selectors.csv のセレクタのヘルスチェック")
+    parser.add_argument('--headless', help='ヘッドレスモードで実行', action='store_true')
+    parser.add_argument('--groups', help='対象のセレクタグループ（カンマ区切り）', type=str, default=None)
+    parser.add_argument('--timeout', help='ページごとに要素の出現を待つ最大秒数', type=float, default=None)
+    parser.add_argument('--output-dir', help='出力ディレクトリ', default=OUTPUT_DIR)
+    parser.add_argument('--output', help='CSV出力ファイル名', default=None)
+    return parser.parse_args()
+
+
+def main():
+    """メイン処理"""
+    args = parse_args()
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()] if args.groups else None
+
+    browser = Browser(headless=args.headless, logger=logger)
+    try:
+        if not browser.setup():
+            logger.error("ブラウザのセットアップに失敗しました")
+            return 1
+
+        checker = SelectorHealthChecker(browser, timeout=args.timeout)
+        report = checker.run(groups)
+        checker.export(report, args.output, args.output_dir)
+
+        problems = [row for row in report if row["status"] != "found"]
+        if problems:
+            print("\n===== 問題のあるセレクタ =====")
+            print(tabulate(
+                [[r["group"], r["name"], r["status"], r["count"], r["visible"], r["page_url"]] for r in problems],
+                headers=["グループ", "名前", "状態", "一致数", "表示数", "ページ"],
+                tablefmt="grid",
+            ))
+        summary = SelectorHealthChecker.summarize(report)
+        print("\n" + ", ".join(f"{status}: {count}" for status, count in summary.items()))
+        return 1 if problems else 0
+    finally:
+        browser.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,7 +19,9 @@ from datetime import datetime
 from typing import Dict, Any, Optional, Union, List, Tuple, Callable
 import urllib.parse
 import re
-import glob
+import base64
+import hashlib
+import zlib
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -37,6 +39,9 @@ from selenium.common.exceptions import (
 )
 from webdriver_manager.chrome import ChromeDriverManager
 
+from src.modules.selenium.screenshot_writer import ScreenshotWriter
+from src.modules.selenium.download_scanner import DownloadDirectoryScanner
+
 # BeautifulSoupのインポート（可能であれば）
 try:
     from bs4 import BeautifulSoup
@@ -51,6 +56,161 @@ try:
 except ImportError:
     ENV_UTILS_AVAILABLE = False
 
+# CDPでブロックするリソースタイプと拡張子の対応表
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "mp3", "ogg", "wav"],
+    "stylesheet": ["css"],
+}
+
+# ページ内スクリプトで要素を解決できるセレクタタイプ
+SCRIPT_SAFE_SELECTOR_TYPES = ("id", "css", "xpath", "name", "class", "tag")
+
+# セレクタ（{type, value}）に一致する要素を取得するページ内関数
+SELECTOR_FIND_JS = """
+    function links(value, partial) {
+        return Array.prototype.filter.call(document.getElementsByTagName('a'), function (a) {
+            var text = (a.innerText || '').trim();
+            return partial ? text.indexOf(value) !== -1 : text === value;
+        });
+    }
+    function findAll(s) {
+        switch (s.type) {
+            case 'id': return document.querySelectorAll('[id="' + CSS.escape(s.value) + '"]');
+            case 'css': return document.querySelectorAll(s.value);
+            case 'name': return document.getElementsByName(s.value);
+            case 'class': return document.getElementsByClassName(s.value);
+            case 'tag': return document.getElementsByTagName(s.value);
+            case 'link_text': return links(s.value, false);
+            case 'partial_link_text': return links(s.value, true);
+            case 'xpath':
+                var snapshot = document.evaluate(s.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                var nodes = [];
+                for (var k = 0; k < snapshot.snapshotLength; k++) nodes.push(snapshot.snapshotItem(k));
+                return nodes;
+        }
+        throw new Error('unsupported selector type: ' + s.type);
+    }
+    function isVisible(el) {
+        if (!el.getClientRects || el.getClientRects().length === 0) return false;
+        var style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    }
+"""
+
+# セレクタをまとめて解決し、一致数・表示数・検出までの時間を返すスクリプト
+# arguments: [{type, value}, ...], タイムアウト（ミリ秒）, コールバック
+SELECTOR_PROBE_JS = SELECTOR_FIND_JS + """
+    var specs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+    var start = performance.now();
+    var latency = specs.map(function () { return null; });
+    var errors = specs.map(function () { return null; });
+    function finish() {
+        done(specs.map(function (s, i) {
+            if (errors[i]) return {count: 0, visible: 0, latency_ms: null, error: errors[i]};
+            var nodes = findAll(s), visible = 0;
+            for (var k = 0; k < nodes.length; k++) if (isVisible(nodes[k])) visible++;
+            return {count: nodes.length, visible: visible, latency_ms: latency[i], error: null};
+        }));
+    }
+    (function poll() {
+        var pending = false;
+        for (var i = 0; i < specs.length; i++) {
+            if (latency[i] !== null || errors[i]) continue;
+            try {
+                if (findAll(specs[i]).length > 0) latency[i] = performance.now() - start;
+                else pending = true;
+            } catch (e) { errors[i] = String(e); }
+        }
+        if (!pending || performance.now() - start > timeoutMs) finish();
+        else setTimeout(poll, 100);
+    })();
+"""
+
+# 優先順位付きの候補セレクタを同時に探索し、最上位で一致した候補の要素を返すスクリプト
+# arguments: [{type, value}, ...], 表示を必須とするか, タイムアウト（ミリ秒）, コールバック
+SELECTOR_RESOLVE_JS = SELECTOR_FIND_JS + """
+    var specs = arguments[0], visibleOnly = arguments[1], timeoutMs = arguments[2];
+    var done = arguments[arguments.length - 1];
+    var start = performance.now();
+    var invalid = specs.map(function () { return false; });
+    (function poll() {
+        for (var i = 0; i < specs.length; i++) {
+            if (invalid[i]) continue;
+            var nodes;
+            try { nodes = findAll(specs[i]); } catch (e) { invalid[i] = true; continue; }
+            for (var k = 0; k < nodes.length; k++) {
+                if (!visibleOnly || isVisible(nodes[k])) {
+                    done({index: i, element: nodes[k], elapsed_ms: performance.now() - start});
+                    return;
+                }
+            }
+        }
+        if (performance.now() - start > timeoutMs) done({index: -1, element: null, elapsed_ms: performance.now() - start});
+        else setTimeout(poll, 100);
+    })();
+"""
+
+
+# 候補セレクタで要素を解決しながら複数のクリックを順に実行するスクリプト
+# arguments: [{candidates: [{type, value}, ...], wait}, ...], 各ステップのタイムアウト（ミリ秒）,
+#            進捗を保存する sessionStorage のキー, コールバック
+ACTION_SEQUENCE_JS = SELECTOR_FIND_JS + """
+    var steps = arguments[0], timeoutMs = arguments[1], progressKey = arguments[2];
+    var done = arguments[arguments.length - 1];
+    var state = {last_completed: -1, timings: [], winners: [], error: null};
+    function save() {
+        try { sessionStorage.setItem(progressKey, JSON.stringify(state)); } catch (e) {}
+    }
+    function finish(error) {
+        state.error = error;
+        try { sessionStorage.removeItem(progressKey); } catch (e) {}
+        done(state);
+    }
+    function ready(el, wait) {
+        if (wait === 'present') return true;
+        if (!isVisible(el)) return false;
+        if (wait === 'visible') return true;
+        return !el.disabled && window.getComputedStyle(el).pointerEvents !== 'none';
+    }
+    function resolve(step) {
+        for (var c = 0; c < step.candidates.length; c++) {
+            var nodes;
+            try { nodes = findAll(step.candidates[c]); } catch (e) { continue; }
+            for (var k = 0; k < nodes.length; k++) {
+                if (ready(nodes[k], step.wait)) return {element: nodes[k], index: c};
+            }
+        }
+        return null;
+    }
+    function run(i) {
+        if (i >= steps.length) { finish(null); return; }
+        var start = performance.now();
+        (function poll() {
+            var found = resolve(steps[i]);
+            if (found) {
+                try {
+                    found.element.scrollIntoView({block: 'center'});
+                    found.element.click();
+                } catch (e) { finish(String(e)); return; }
+                state.last_completed = i;
+                state.timings.push(performance.now() - start);
+                state.winners.push(found.index);
+                // クリックでページが遷移しても完了したステップを確認できるよう保存する
+                save();
+                setTimeout(function () { run(i + 1); }, 0);
+            } else if (performance.now() - start > timeoutMs) {
+                finish('timeout');
+            } else {
+                setTimeout(poll, 50);
+            }
+        })();
+    }
+    save();
+    run(0);
+"""
+
 
 class Browser:
     """
@@ -112,6 +272,9 @@ class Browser:
         
         # スクリーンショット設定を読み込む
         self._load_screenshot_settings()
+        
+        # CDP（Chrome DevTools Protocol）設定を読み込む
+        self._load_cdp_settings()
             
         # 通知機能
         self.notifier = notifier
@@ -119,8 +282,20 @@ class Browser:
         # ドライバーと状態の初期化
         self.driver = None
         self.selectors = {}
-        self.current_page_source = None
-        self.last_page_source = None
+        self._download_scanners = {}
+        # ページソースは圧縮して保持する（page_source_capture 有効時のみ取得）
+        self._current_page_source_z = None
+        self._last_page_source_z = None
+        self.current_page_hash = None
+        self.last_page_hash = None
+        self.page_source_capture = self._get_config_value("BROWSER", "page_source_capture", "false").lower() == "true"
+        self.page_source_hash = self._get_config_value("BROWSER", "page_source_hash", "true").lower() == "true"
+        # 候補セレクタのうち実際に一致したものを記録するキャッシュ
+        self.selector_cache_enabled = self._get_config_value("BROWSER", "selector_cache", "true").lower() == "true"
+        self.selector_cache_path = self._resolve_path(
+            self._get_config_value("BROWSER", "selector_cache_path", "data/selector_cache.json")
+        )
+        self._selector_cache = None
         
         # ログ出力
         self.logger.debug(f"Browserクラスを初期化しました (headless: {self.headless})")
@@ -219,10 +394,147 @@ class Browser:
         self.screenshot_quality = int(self._get_config_value("BROWSER", "screenshot_quality", "100"))
         self.screenshot_on_error = self._get_config_value("BROWSER", "screenshot_on_error", "true").lower() == "true"
         
+        # 非同期書き込みと保持ポリシーの設定
+        self.async_screenshot = self._get_config_value("BROWSER", "async_screenshot", "true").lower() == "true"
+        self.screenshot_queue_size = int(self._get_config_value("BROWSER", "screenshot_queue_size", "32"))
+        self.screenshot_max_files = int(self._get_config_value("BROWSER", "screenshot_max_files", "200"))
+        self.screenshot_max_total_mb = int(self._get_config_value("BROWSER", "screenshot_max_total_mb", "200"))
+        self.screenshot_writer = None
+        
         # パスが相対パスの場合、絶対パスに変換
         if not os.path.isabs(self.screenshot_dir):
             self.screenshot_dir = os.path.join(self.project_root, self.screenshot_dir)
             
+    def _load_cdp_settings(self):
+        """CDP（Chrome DevTools Protocol）関連の設定を読み込む"""
+        self.cdp_mode = str(self._get_config_value("BROWSER", "cdp_mode", "false")).lower() == "true"
+        self.block_resource_types = [
+            t.strip() for t in str(self._get_config_value("BROWSER", "block_resource_types", "")).split(",") if t.strip()
+        ]
+        self.block_url_patterns = [
+            p.strip() for p in str(self._get_config_value("BROWSER", "block_url_patterns", "")).split(",") if p.strip()
+        ]
+        self.network_idle_ms = int(self._get_config_value("BROWSER", "network_idle_ms", "500"))
+        self.network_idle_max_inflight = int(self._get_config_value("BROWSER", "network_idle_max_inflight", "0"))
+    
+    def _build_blocked_url_patterns(self) -> List[str]:
+        """
+        ブロック対象のURLパターンを組み立てる
+        
+        Network.setBlockedURLs はURLパターンのみを受け付けるため、
+        リソースタイプは拡張子パターンに変換して追加する
+        
+        Returns:
+            List[str]: ブロックするURLパターンのリスト
+        """
+        patterns = list(self.block_url_patterns)
+        for resource_type in self.block_resource_types:
+            extensions = RESOURCE_TYPE_EXTENSIONS.get(resource_type.lower())
+            if not extensions:
+                self.logger.warning(f"未対応のリソースタイプのため無視します: {resource_type}")
+                continue
+            for ext in extensions:
+                patterns.append(f"*.{ext}")
+                patterns.append(f"*.{ext}?*")
+        # 順序を保ったまま重複を除去
+        return list(dict.fromkeys(patterns))
+    
+    def _setup_cdp(self):
+        """
+        CDPのNetworkドメインを有効化し、リソースブロックを設定する
+        
+        Returns:
+            bool: 成功した場合はTrue、それ以外はFalse
+        """
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            patterns = self._build_blocked_url_patterns()
+            if patterns:
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+                self.logger.info(f"CDPでリソースをブロックします: {len(patterns)} パターン")
+                self.logger.debug(f"ブロックパターン: {patterns}")
+            return True
+        except Exception as e:
+            self.logger.warning(f"CDPの設定に失敗しました。通常モードで続行します: {str(e)}")
+            self.cdp_mode = False
+            return False
+    
+    def _read_network_events(self) -> List[Dict[str, Any]]:
+        """
+        パフォーマンスログから Network.* イベントを取り出す
+        
+        Returns:
+            List[Dict[str, Any]]: CDPイベント（method, params）のリスト
+        """
+        events = []
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError, TypeError):
+                continue
+            if message.get("method", "").startswith("Network."):
+                events.append(message)
+        return events
+    
+    def wait_for_network_idle(self, idle_ms: Optional[int] = None, timeout: Optional[int] = None,
+                              max_inflight: Optional[int] = None) -> bool:
+        """
+        ネットワークが指定時間アイドル状態になるまで待機する
+        
+        CDPの Network.requestWillBeSent / loadingFinished / loadingFailed イベントから
+        実行中のリクエスト数を追跡し、max_inflight 以下の状態が idle_ms 続いた時点で終了する。
+        
+        Args:
+            idle_ms: アイドルとみなす継続時間（ミリ秒）。省略時は設定値
+            timeout: タイムアウト秒数。省略時は page_load_timeout
+            max_inflight: アイドルとみなす実行中リクエスト数の上限。省略時は設定値
+            
+        Returns:
+            bool: アイドル状態に到達した場合はTrue、タイムアウトした場合はFalse
+        """
+        if not self.driver:
+            self.logger.error("WebDriverが初期化されていません")
+            return False
+        if not self.cdp_mode:
+            self.logger.debug("CDPモードが無効のため、ネットワークアイドル待機をスキップします")
+            return True
+        
+        idle_ms = self.network_idle_ms if idle_ms is None else idle_ms
+        max_inflight = self.network_idle_max_inflight if max_inflight is None else max_inflight
+        if timeout is None:
+            timeout = int(self._get_config_value("BROWSER", "page_load_timeout", "30"))
+        
+        inflight = set()
+        start = time.time()
+        idle_since = time.time()
+        
+        try:
+            while time.time() - start < timeout:
+                for event in self._read_network_events():
+                    method = event.get("method")
+                    params = event.get("params", {})
+                    request_id = params.get("requestId")
+                    if method == "Network.requestWillBeSent":
+                        # data: URL はイベントが完結しないことがあるため追跡しない
+                        if not params.get("request", {}).get("url", "").startswith("data:"):
+                            inflight.add(request_id)
+                    elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                        inflight.discard(request_id)
+                
+                now = time.time()
+                if len(inflight) > max_inflight:
+                    idle_since = now
+                elif (now - idle_since) * 1000 >= idle_ms:
+                    self.logger.debug(f"ネットワークアイドルに到達しました ({now - start:.2f}秒)")
+                    return True
+                time.sleep(0.05)
+            
+            self.logger.warning(f"ネットワークアイドル待機がタイムアウトしました (実行中: {len(inflight)} 件)")
+            return False
+        except Exception as e:
+            self.logger.warning(f"ネットワークアイドル待機中にエラーが発生しました: {str(e)}")
+            return False
+    
     def _setup_fallback_selectors(self):
         """フォールバックセレクタを設定する"""
         # セレクタがまだ設定されていない場合に初期化
@@ -242,10 +554,14 @@ class Browser:
         CSVファイルからセレクタを読み込む
         
         CSVフォーマット:
-        group,name,selector_type,selector_value,description
+        group,name,selector_type,selector_value,description[,fallbacks]
         login,username,id,username,ユーザー名入力欄
         login,password,id,password,パスワード入力欄
         ...
+        
+        fallbacks 列（任意）には、代替セレクタを優先順に並べたJSON配列を指定する
+        （例: [{"type": "css", "value": "#user"}, {"type": "xpath", "value": "//input[@name='user']"}]）。
+        ページ解析ツールが出力する reliable_selectors と同じ形式。
         """
         # セレクタパスが指定されていない場合はデフォルトパスを使用
         if not self.selectors_path:
@@ -274,6 +590,7 @@ class Browser:
                     selector_type = row['selector_type']
                     selector_value = row['selector_value']
                     description = row.get('description', '')
+                    fallbacks = self._parse_selector_fallbacks(row.get('fallbacks'), group, name)
                         
                     # グループが存在しなければ作成
                     if group not in self.selectors:
@@ -283,7 +600,8 @@ class Browser:
                     self.selectors[group][name] = {
                         'selector_type': selector_type,
                         'selector_value': selector_value,
-                        'description': description
+                        'description': description,
+                        'fallbacks': fallbacks
                     }
             
             self.logger.info(f"セレクタをロードしました: {len(self.selectors)} グループ")
@@ -296,6 +614,31 @@ class Browser:
             self.logger.error(f"セレクタの読み込み中にエラーが発生しました: {str(e)}")
             self._setup_fallback_selectors()
     
+    def _parse_selector_fallbacks(self, value: Optional[str], group: str, name: str) -> List[Dict[str, str]]:
+        """
+        fallbacks 列の値を候補セレクタのリストに変換する
+        
+        Args:
+            value: fallbacks 列の値（JSON配列）
+            group: セレクタグループ（ログ出力用）
+            name: セレクタ名（ログ出力用）
+            
+        Returns:
+            List[Dict[str, str]]: selector_type と selector_value を持つ辞書のリスト
+        """
+        if not value or not value.strip():
+            return []
+        try:
+            candidates = json.loads(value)
+            return [
+                {'selector_type': c['type'], 'selector_value': c['value']}
+                for c in candidates
+                if c.get('type') and c.get('value')
+            ]
+        except (ValueError, TypeError, AttributeError, KeyError) as e:
+            self.logger.warning(f"代替セレクタの形式が不正なため無視します: {group}.{name} ({str(e)})")
+            return []
+    
     def setup(self):
         """
         ブラウザドライバーを初期化する
@@ -324,6 +667,10 @@ class Browser:
             # 言語設定
             chrome_options.add_argument("--lang=ja")
             
+            # CDPモード: Networkイベントをパフォーマンスログで取得する
+            if self.cdp_mode:
+                chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            
             # 追加のオプション（設定ファイルから読み込み）
             additional_options = self._get_config_value("BROWSER", "additional_options", "")
             if additional_options:
@@ -354,6 +701,10 @@ class Browser:
             # タイムアウトを設定
             self.driver.implicitly_wait(self.timeout)
             
+            # CDPモードの設定
+            if self.cdp_mode:
+                self._setup_cdp()
+            
             # セレクタを読み込む
             self._load_selectors()
             
@@ -396,9 +747,9 @@ class Browser:
             if not self.wait_for_page_load():
                 self.logger.warning("ページの読み込みが完了しなかった可能性があります")
             
-            # 現在のページソースを保存
-            self.last_page_source = self.current_page_source
-            self.current_page_source = self.driver.page_source
+            # 差分検出・デバッグ用にページソースを保存（有効な場合のみ）
+            if self.page_source_capture:
+                self.capture_page_source()
             
             # 自動スクリーンショットが有効な場合
             if self.auto_screenshot:
@@ -490,7 +841,9 @@ class Browser:
             custom_dir: カスタムディレクトリ（Noneの場合はデフォルトを使用）
             
         Returns:
-            str or None: 保存されたファイルのパス、または失敗した場合はNone
+            str or None: 保存先のファイルパス、または失敗した場合はNone。
+                非同期保存（async_screenshot）の場合は書き込みキューに追加した時点で返すため、
+                ファイルがまだ存在しないことがある。完了を待つには wait_for_screenshot() を使用する
         """
         if not self.driver:
             self.logger.error("ドライバーが初期化されていません")
@@ -537,6 +890,22 @@ class Browser:
             # 完全なファイルパスを作成
             filepath = os.path.join(save_dir, f"{base_filename}{format_ext}")
             
+            # CDPでバイト列を取得し、バックグラウンドで書き込む
+            if self.async_screenshot:
+                data = self._capture_screenshot_bytes(format_ext)
+                if data is not None:
+                    if self.screenshot_writer is None:
+                        self.screenshot_writer = ScreenshotWriter(
+                            logger=self.logger,
+                            max_queue_size=self.screenshot_queue_size,
+                            max_files=self.screenshot_max_files,
+                            max_total_bytes=self.screenshot_max_total_mb * 1024 * 1024
+                        )
+                    if self.screenshot_writer.enqueue(filepath, data):
+                        self.logger.info(f"スクリーンショットを保存キューに追加しました: {filepath}")
+                        return filepath
+                    return None
+            
             # スクリーンショットを保存
             self.driver.save_screenshot(filepath)
             
@@ -547,6 +916,47 @@ class Browser:
             self.logger.error(f"スクリーンショットの保存中にエラーが発生しました: {str(e)}")
             return None
     
+    def wait_for_screenshot(self, filepath, timeout=10):
+        """
+        save_screenshot() が返したファイルの書き込み完了を待機する
+        
+        Args:
+            filepath: save_screenshot() の戻り値
+            timeout: 最大待機秒数
+            
+        Returns:
+            bool: ファイルが書き込まれた場合はTrue、書き込みに失敗した・時間内に完了しなかった場合はFalse
+        """
+        if not filepath:
+            return False
+        if self.screenshot_writer is None:
+            return os.path.exists(filepath)
+        return self.screenshot_writer.wait_for(filepath, timeout)
+    
+    def _capture_screenshot_bytes(self, format_ext):
+        """
+        CDPの Page.captureScreenshot で画像のバイト列を取得する
+        
+        Args:
+            format_ext: 保存する拡張子（.jpg/.jpeg の場合はJPEG、それ以外はPNG）
+            
+        Returns:
+            bytes or None: 画像のバイト列、CDPが利用できない場合はNone
+        """
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return None
+        
+        params = {"format": "png"}
+        if format_ext in (".jpg", ".jpeg"):
+            params = {"format": "jpeg", "quality": max(0, min(100, self.screenshot_quality))}
+        
+        try:
+            result = self.driver.execute_cdp_cmd("Page.captureScreenshot", params)
+            return base64.b64decode(result["data"])
+        except Exception as e:
+            self.logger.debug(f"CDPによるスクリーンショット取得に失敗しました。同期保存に切り替えます: {str(e)}")
+            return None
+    
     def _notify_error(self, error_message, exception=None, context=None):
         """
         エラーを通知する
@@ -568,6 +978,10 @@ class Browser:
             if self.driver and self.screenshot_on_error:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshot_path = self.save_screenshot(f"error_notification_{timestamp}")
+                # 非同期保存の場合は書き込みを待ち、保存できなかったファイルは通知に含めない
+                if screenshot_path and not self.wait_for_screenshot(screenshot_path):
+                    self.logger.warning(f"通知用のスクリーンショットを保存できませんでした: {screenshot_path}")
+                    screenshot_path = None
                 
             # 例外の詳細を取得
             exception_details = str(exception) if exception else "不明"
@@ -608,6 +1022,11 @@ class Browser:
             if error_message and self.notifier:
                 self._notify_error(error_message, exception, context)
                 
+            # 未書き込みのスクリーンショットを保存してから終了する
+            if self.screenshot_writer:
+                self.screenshot_writer.close()
+                self.screenshot_writer = None
+                
             # ドライバーが初期化されている場合は終了
             if self.driver:
                 self.logger.info("ブラウザを終了します")
@@ -657,12 +1076,20 @@ class Browser:
                             return None
                         
                         selector_info = self.selectors[group][name]
-                        by = self._get_by_type(selector_info['selector_type'])
-                        value = selector_info['selector_value']
                         
                         # ログ出力で要素の説明を追加
                         description = selector_info.get('description', '')
                         self.logger.debug(f"要素を待機します: {group}.{name} ({description})")
+                        
+                        # 代替セレクタまたは学習済みのセレクタがある場合はまとめて探索する
+                        candidates = self._selector_candidates(group, name)
+                        if len(candidates) > 1:
+                            return self._wait_for_selector_candidates(
+                                group, name, candidates, condition, wait_timeout, visible
+                            )
+                        
+                        by = self._get_by_type(selector_info['selector_type'])
+                        value = selector_info['selector_value']
                     # (By.XX, value)形式の場合
                     else:
                         by, value = by_or_tuple
@@ -697,6 +1124,180 @@ class Browser:
             self._notify_error(error_message, e)
             return None
             
+    def _selector_candidates(self, group: str, name: str) -> List[Dict[str, str]]:
+        """
+        セレクタの候補を優先順に返す
+        
+        キャッシュに記録された前回一致した候補、CSVのセレクタ、fallbacks 列の候補の順に並べる。
+        
+        Args:
+            group: セレクタグループ
+            name: セレクタ名
+            
+        Returns:
+            List[Dict[str, str]]: selector_type と selector_value を持つ辞書のリスト（重複なし）
+        """
+        selector_info = self.selectors[group][name]
+        ordered = []
+        cached = self._get_cached_selector(group, name)
+        if cached:
+            ordered.append(cached)
+        ordered.append(selector_info)
+        ordered.extend(selector_info.get('fallbacks') or [])
+        
+        candidates = []
+        seen = set()
+        for candidate in ordered:
+            key = (candidate['selector_type'].lower(), candidate['selector_value'])
+            if key in seen:
+                continue
+            seen.add(key)
+            candidates.append({'selector_type': key[0], 'selector_value': key[1]})
+        return candidates
+    
+    def _wait_for_selector_candidates(self, group: str, name: str, candidates: List[Dict[str, str]],
+                                      condition, timeout: float, visible: bool):
+        """
+        候補セレクタを1回のページ内スクリプトで同時に探索して要素を待機する
+        
+        Args:
+            group: セレクタグループ
+            name: セレクタ名
+            candidates: _selector_candidates() の戻り値
+            condition: 待機条件（指定時は一致した候補に対して追加で待機する）
+            timeout: タイムアウト時間（秒）
+            visible: 要素が表示されるのを待つかどうか
+            
+        Returns:
+            WebElement: 見つかった要素。見つからない場合はNone
+        """
+        specs = [{"type": c['selector_type'], "value": c['selector_value']} for c in candidates]
+        start = time.time()
+        try:
+            result = self._execute_async_script_with_timeout(
+                SELECTOR_RESOLVE_JS, timeout + 5, specs, visible, timeout * 1000
+            )
+        except Exception as e:
+            self._notify_error(f"候補セレクタの探索中にエラーが発生しました: {group}.{name}", e)
+            return None
+        
+        index = result.get("index", -1) if result else -1
+        if index < 0:
+            self.logger.warning(
+                f"要素の待機中にタイムアウトが発生しました: {group}.{name} "
+                f"(候補 {len(candidates)} 件), 待機時間: {timeout}秒"
+            )
+            if self.screenshot_on_error:
+                self.save_screenshot(f"timeout_{group}_{name}", append_timestamp=True)
+            return None
+        
+        winner = candidates[index]
+        self.logger.debug(
+            f"要素が見つかりました: {group}.{name} 候補{index + 1} "
+            f"{winner['selector_type']}={winner['selector_value']} ({result.get('elapsed_ms', 0):.0f}ms)"
+        )
+        self._remember_selector(group, name, winner)
+        
+        element = result.get("element")
+        if condition is not None:
+            by = self._get_by_type(winner['selector_type'])
+            remaining = max(timeout - (time.time() - start), 1)
+            try:
+                element = WebDriverWait(self.driver, remaining).until(condition((by, winner['selector_value'])))
+            except TimeoutException:
+                self.logger.warning(f"要素が待機条件を満たしませんでした: {group}.{name}, 待機時間: {timeout}秒")
+                return None
+        return element
+    
+    def _load_selector_cache(self) -> Dict[str, Dict[str, Any]]:
+        """
+        学習済みセレクタのキャッシュを読み込む（初回のみファイルから読み込む）
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: "group.name" ごとのキャッシュエントリ
+        """
+        if self._selector_cache is not None:
+            return self._selector_cache
+        self._selector_cache = {}
+        if self.selector_cache_enabled and os.path.exists(self.selector_cache_path):
+            try:
+                with open(self.selector_cache_path, 'r', encoding='utf-8') as f:
+                    self._selector_cache = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"セレクタキャッシュの読み込みに失敗しました: {self.selector_cache_path} ({str(e)})")
+        return self._selector_cache
+    
+    @staticmethod
+    def _selector_signature(selector_info: Dict[str, Any]) -> str:
+        """CSVのセレクタ定義を識別する文字列（定義変更時にキャッシュを無効化するため）"""
+        return f"{selector_info['selector_type'].lower()}={selector_info['selector_value']}"
+    
+    def _get_cached_selector(self, group: str, name: str) -> Optional[Dict[str, str]]:
+        """
+        キャッシュに記録された候補を取得する
+        
+        CSVのセレクタ定義がキャッシュ作成時から変更されている場合は使用しない。
+        
+        Args:
+            group: セレクタグループ
+            name: セレクタ名
+            
+        Returns:
+            Dict[str, str] or None: selector_type と selector_value を持つ辞書
+        """
+        if not self.selector_cache_enabled:
+            return None
+        entry = self._load_selector_cache().get(f"{group}.{name}")
+        if not entry or entry.get("primary") != self._selector_signature(self.selectors[group][name]):
+            return None
+        return {'selector_type': entry['selector_type'], 'selector_value': entry['selector_value']}
+    
+    def _remember_selector(self, group: str, name: str, winner: Dict[str, str]) -> None:
+        """
+        一致した候補をキャッシュに記録する（変更があった場合のみファイルに保存する）
+        
+        Args:
+            group: セレクタグループ
+            name: セレクタ名
+            winner: 一致した候補
+        """
+        if not self.selector_cache_enabled:
+            return
+        cache = self._load_selector_cache()
+        key = f"{group}.{name}"
+        primary = self._selector_signature(self.selectors[group][name])
+        entry = cache.get(key)
+        if (entry and entry.get("primary") == primary
+                and entry.get("selector_type") == winner['selector_type']
+                and entry.get("selector_value") == winner['selector_value']):
+            return
+        
+        if self._selector_signature(winner) == primary:
+            # CSVのセレクタで一致した場合は記録を削除する
+            if key not in cache:
+                return
+            del cache[key]
+        else:
+            cache[key] = {
+                "selector_type": winner['selector_type'],
+                "selector_value": winner['selector_value'],
+                "primary": primary,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self.logger.info(
+                f"代替セレクタで要素が見つかったためキャッシュに記録しました: {key} -> "
+                f"{winner['selector_type']}={winner['selector_value']}"
+            )
+        
+        try:
+            os.makedirs(os.path.dirname(self.selector_cache_path), exist_ok=True)
+            tmp_path = f"{self.selector_cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.selector_cache_path)
+        except Exception as e:
+            self.logger.warning(f"セレクタキャッシュの保存に失敗しました: {self.selector_cache_path} ({str(e)})")
+    
     def analyze_page_content(self, element_filter=None, check_visibility=True):
         """
         現在のページを解析し、重要な要素やステータスを取得する
@@ -1160,11 +1761,15 @@ class Browser:
                 lambda driver: driver.execute_script("return document.readyState") == "complete"
             )
             
-            # JavaScriptによる非同期処理の完了を確認（オプション）
-            try:
-                self.driver.execute_script("return (typeof jQuery === 'undefined' || jQuery.active === 0)")
-            except:
-                pass  # jQueryが未定義の場合は無視
+            # CDPモードではネットワークアイドルで実際の完了を判定する
+            if self.cdp_mode:
+                self.wait_for_network_idle(timeout=timeout)
+            else:
+                # JavaScriptによる非同期処理の完了を確認（オプション）
+                try:
+                    self.driver.execute_script("return (typeof jQuery === 'undefined' || jQuery.active === 0)")
+                except:
+                    pass  # jQueryが未定義の場合は無視
             
             self.logger.info("ページ読み込みが完了しました")
             return True
@@ -1274,6 +1879,88 @@ class Browser:
             self._notify_error(error_message, e)
             return ""
 
+    @property
+    def current_page_source(self):
+        """
+        直近に取得したページソース
+        
+        取得済みでない場合は現在のページからオンデマンドで取得する
+        """
+        if self._current_page_source_z is None:
+            if not self.driver:
+                return None
+            return self.get_page_source()
+        return zlib.decompress(self._current_page_source_z).decode("utf-8")
+    
+    @current_page_source.setter
+    def current_page_source(self, value):
+        self._current_page_source_z = zlib.compress(value.encode("utf-8")) if value is not None else None
+        self.current_page_hash = self._hash_page_source(value) if value is not None else None
+    
+    @property
+    def last_page_source(self):
+        """1つ前に取得したページソース（未取得の場合はNone）"""
+        if self._last_page_source_z is None:
+            return None
+        return zlib.decompress(self._last_page_source_z).decode("utf-8")
+    
+    @last_page_source.setter
+    def last_page_source(self, value):
+        self._last_page_source_z = zlib.compress(value.encode("utf-8")) if value is not None else None
+        self.last_page_hash = self._hash_page_source(value) if value is not None else None
+    
+    def _hash_page_source(self, source):
+        """
+        ページソースのハッシュ値を計算する
+        
+        Args:
+            source: ページソース
+            
+        Returns:
+            str or None: SHA-256のハッシュ値（page_source_hash が無効の場合はNone）
+        """
+        if not self.page_source_hash:
+            return None
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+    
+    def capture_page_source(self):
+        """
+        現在のページソースを圧縮して保存し、直前のソースを last_page_source に移す
+        
+        Returns:
+            bool: 取得に成功した場合はTrue
+        """
+        if not self.driver:
+            self.logger.error("WebDriverが初期化されていません")
+            return False
+        
+        try:
+            source = self.driver.page_source
+        except Exception as e:
+            self.logger.warning(f"ページソースの取得に失敗しました: {str(e)}")
+            return False
+        
+        self._last_page_source_z = self._current_page_source_z
+        self.last_page_hash = self.current_page_hash
+        self.current_page_source = source
+        self.logger.debug(
+            f"ページソースを保存しました: {len(source)} 文字 -> {len(self._current_page_source_z)} bytes"
+        )
+        return True
+    
+    def has_page_source_changed(self):
+        """
+        直前に取得したページソースから変化があったかを判定する
+        
+        Returns:
+            bool or None: 変化があればTrue、なければFalse、比較できない場合はNone
+        """
+        if self._current_page_source_z is None or self._last_page_source_z is None:
+            return None
+        if self.current_page_hash and self.last_page_hash:
+            return self.current_page_hash != self.last_page_hash
+        return self._current_page_source_z != self._last_page_source_z
+
     def get_current_url(self):
         """
         現在のURLを取得する
@@ -1611,6 +2298,326 @@ class Browser:
             
             return False
             
+    def _normalize_action_step(self, step) -> Dict[str, Any]:
+        """
+        アクションステップを辞書形式に正規化する
+        
+        Args:
+            step: (group, name, action, wait[, value]) のタプル、または同じキーを持つ辞書
+            
+        Returns:
+            Dict[str, Any]: group, name, action, wait, value を持つ辞書
+        """
+        if isinstance(step, dict):
+            normalized = dict(step)
+        else:
+            keys = ["group", "name", "action", "wait", "value"]
+            normalized = dict(zip(keys, step))
+        normalized.setdefault("action", "click")
+        normalized["action"] = (normalized.get("action") or "click").lower()
+        normalized["wait"] = (normalized.get("wait") or "visible").lower()
+        normalized.setdefault("value", None)
+        return normalized
+    
+    def _is_script_safe_step(self, step: Dict[str, Any]) -> bool:
+        """
+        ステップをページ内スクリプトで安全に実行できるか判定する
+        
+        全ての候補セレクタ（学習キャッシュ・CSV・fallbacks 列）がDOM APIで解決でき、
+        アクションがクリックの場合のみ安全とみなす。
+        テキスト入力はフレームワークのイベント処理に依存するため個別実行とする。
+        
+        Args:
+            step: 正規化済みのステップ
+            
+        Returns:
+            bool: スクリプトで実行可能な場合はTrue
+        """
+        if not self.selectors.get(step["group"], {}).get(step["name"]):
+            return False
+        candidates = self._selector_candidates(step["group"], step["name"])
+        return (
+            all(c["selector_type"] in SCRIPT_SAFE_SELECTOR_TYPES for c in candidates)
+            and step["action"] in ("click", "js_click")
+            and step["wait"] in ("present", "visible", "clickable")
+        )
+    
+    def _run_steps_in_page(self, steps: List[Dict[str, Any]], timeout: int) -> Dict[str, Any]:
+        """
+        複数のクリックステップを1回の非同期スクリプトで実行する
+        
+        各ステップは候補セレクタを優先順に探索し、一致した候補を学習キャッシュに記録する。
+        進捗はクリックのたびに sessionStorage に保存するため、クリックによるページ遷移や
+        スクリプトのタイムアウトで結果を受け取れなかった場合も完了したステップを確認できる。
+        
+        Args:
+            steps: スクリプトで実行可能な正規化済みステップのリスト
+            timeout: 各ステップの待機タイムアウト（秒）
+            
+        Returns:
+            Dict[str, Any]: last_completed（最後に成功したステップの位置。なしは-1、確認できない場合はNone）、
+                            timings（各ステップのミリ秒）、error を含む辞書
+        """
+        payload = []
+        candidates_list = []
+        for step in steps:
+            candidates = self._selector_candidates(step["group"], step["name"])
+            candidates_list.append(candidates)
+            payload.append({
+                "candidates": [{"type": c["selector_type"], "value": c["selector_value"]} for c in candidates],
+                "wait": step["wait"],
+            })
+        
+        progress_key = f"action_sequence_{int(time.time() * 1000)}_{id(payload)}"
+        try:
+            # ステップ数に応じてスクリプトのタイムアウトを延長する
+            result = self._execute_async_script_with_timeout(
+                ACTION_SEQUENCE_JS, timeout * len(steps) + 5, payload, timeout * 1000, progress_key
+            )
+        except Exception as e:
+            result = self._read_sequence_progress(progress_key)
+            if result is None:
+                return {"last_completed": None, "timings": [], "error": str(e)}
+            result["error"] = str(e)
+        
+        result = dict(result or {})
+        for i, winner in enumerate(result.get("winners") or []):
+            if 0 <= winner < len(candidates_list[i]):
+                self._remember_selector(steps[i]["group"], steps[i]["name"], candidates_list[i][winner])
+        last_completed = result.get("last_completed")
+        result["last_completed"] = -1 if last_completed is None else int(last_completed)
+        return result
+    
+    def _read_sequence_progress(self, progress_key: str) -> Optional[Dict[str, Any]]:
+        """
+        sessionStorage に保存されたアクションシーケンスの進捗を読み出して削除する
+        
+        Args:
+            progress_key: 進捗のキー
+            
+        Returns:
+            Dict[str, Any] or None: 進捗。読み出せない場合はNone
+        """
+        try:
+            value = self.driver.execute_script(
+                "var key = arguments[0], value = sessionStorage.getItem(key);"
+                "sessionStorage.removeItem(key); return value;",
+                progress_key,
+            )
+            return json.loads(value) if value else None
+        except Exception as e:
+            self.logger.warning(f"アクションシーケンスの進捗を取得できませんでした: {str(e)}")
+            return None
+    
+    def _execute_async_script_with_timeout(self, script: str, script_timeout: float, *args) -> Any:
+        """
+        スクリプトのタイムアウトを一時的に変更して非同期スクリプトを実行する
+        
+        Args:
+            script: 実行するスクリプト
+            script_timeout: スクリプトのタイムアウト（秒）
+            *args: スクリプトに渡す引数
+            
+        Returns:
+            Any: スクリプトの戻り値
+        """
+        original_script_timeout = None
+        try:
+            original_script_timeout = self.driver.timeouts.script
+        except Exception:
+            pass
+        try:
+            self.driver.set_script_timeout(script_timeout)
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            if original_script_timeout is not None:
+                self.driver.set_script_timeout(original_script_timeout)
+    
+    def _run_step_individually(self, step: Dict[str, Any], timeout: int) -> bool:
+        """
+        1ステップを既存の要素操作メソッドで実行する
+        
+        Args:
+            step: 正規化済みのステップ
+            timeout: 待機タイムアウト（秒）
+            
+        Returns:
+            bool: 成功した場合はTrue
+        """
+        action = step["action"]
+        if action in ("click", "js_click"):
+            return self.click_element_by_selector(
+                step["group"], step["name"], use_js=(action == "js_click"), timeout=timeout
+            )
+        if action == "input":
+            return self.input_text_by_selector(step["group"], step["name"], step["value"] or "", timeout=timeout)
+        self.logger.error(f"未対応のアクションです: {action}")
+        return False
+    
+    def run_action_sequence(self, steps: List[Union[Tuple, Dict[str, Any]]], timeout: Optional[int] = None,
+                            use_script: bool = True) -> Dict[str, Any]:
+        """
+        複数ステップのUI操作を宣言的に実行する
+        
+        先頭から連続する「スクリプトで安全に実行できるステップ」は1回の非同期スクリプトで
+        まとめて実行し、それ以外のステップや失敗したステップ以降は1ステップずつ実行する。
+        スクリプトで完了したステップは再実行せず、失敗したステップから個別実行を再開する。
+        
+        Args:
+            steps: (group, name, action, wait[, value]) のリスト
+                action: click / js_click / input
+                wait: present / visible / clickable（操作前に満たすべき要素の状態）
+            timeout: 各ステップの待機タイムアウト（秒）。省略時はインスタンスのタイムアウト
+            use_script: ページ内スクリプトによる一括実行を試みるかどうか
+            
+        Returns:
+            Dict[str, Any]: success, completed, failed_step（"group.name"）, timings（各ステップの秒数）を含む辞書
+        """
+        result = {"success": False, "completed": 0, "failed_step": None, "timings": []}
+        if not self.driver:
+            self.logger.error("ドライバーが初期化されていません")
+            return result
+        
+        if not self.selectors:
+            self._load_selectors()
+        
+        timeout = timeout if timeout is not None else self.timeout
+        normalized = [self._normalize_action_step(step) for step in steps]
+        sequence_start = time.time()
+        index = 0
+        
+        while index < len(normalized):
+            # 連続するスクリプト実行可能なステップをまとめる
+            batch = []
+            if use_script:
+                for step in normalized[index:]:
+                    if not self._is_script_safe_step(step):
+                        break
+                    batch.append(step)
+            
+            step_timeout = timeout
+            if len(batch) > 1:
+                batch_start = time.time()
+                batch_result = self._run_steps_in_page(batch, timeout)
+                last_completed = batch_result.get("last_completed")
+                if last_completed is None:
+                    # 実行済みのステップを再実行しないよう、進捗を確認できない場合は中断する
+                    result["failed_step"] = f"{batch[0]['group']}.{batch[0]['name']}"
+                    self.logger.error(
+                        f"スクリプトでの実行結果を確認できないため中断します: "
+                        f"{result['failed_step']} 以降 ({batch_result.get('error')})"
+                    )
+                    break
+                completed = last_completed + 1
+                batch_timings = [elapsed_ms / 1000 for elapsed_ms in (batch_result.get("timings") or [])[:completed]]
+                for step, elapsed in zip(batch, batch_timings):
+                    result["timings"].append(elapsed)
+                    self.logger.info(f"ステップ完了（スクリプト）: {step['group']}.{step['name']} ({elapsed:.3f}秒)")
+                index += completed
+                if completed == len(batch):
+                    continue
+                # 中断したステップの待機に使った時間を差し引き、残りの時間で個別実行する
+                spent = time.time() - batch_start - sum(batch_timings)
+                step_timeout = max(1, int(timeout - spent))
+                self.logger.warning(
+                    f"スクリプトでの実行が中断されたため個別実行に切り替えます: "
+                    f"{normalized[index]['group']}.{normalized[index]['name']} ({batch_result.get('error')})"
+                )
+            
+            # 個別実行（スクリプト非対応ステップ、またはスクリプトで失敗したステップ）
+            step = normalized[index]
+            step_start = time.time()
+            if not self._run_step_individually(step, step_timeout):
+                result["failed_step"] = f"{step['group']}.{step['name']}"
+                self.logger.error(f"ステップの実行に失敗しました: {result['failed_step']}")
+                break
+            elapsed = time.time() - step_start
+            result["timings"].append(elapsed)
+            self.logger.info(f"ステップ完了（個別）: {step['group']}.{step['name']} ({elapsed:.3f}秒)")
+            index += 1
+        
+        result["completed"] = index
+        result["success"] = index == len(normalized)
+        self.logger.info(
+            f"アクションシーケンスを実行しました: {index}/{len(normalized)} ステップ ({time.time() - sequence_start:.3f}秒)"
+        )
+        
+        if self.auto_screenshot and result["success"]:
+            self.save_screenshot(f"sequence_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        
+        return result
+            
+    def probe_selectors(self, keys: Optional[List[Tuple[str, str]]] = None,
+                        timeout: Optional[float] = None) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        複数のセレクタを1回のページ内スクリプトでまとめて解決する
+        
+        各セレクタの一致数と表示数を調べ、状態を次のいずれかに分類する。
+        - found: 1件に一致し表示されている
+        - missing: 一致する要素がない
+        - ambiguous: 複数の要素に一致する
+        - invisible: 1件に一致するが表示されていない
+        - error: セレクタが不正、または未定義
+        
+        Args:
+            keys: (グループ, 名前) のリスト（Noneの場合は読み込み済みの全セレクタ）
+            timeout: 要素の出現を待つ最大秒数（Noneの場合はデフォルト値）
+            
+        Returns:
+            Dict[Tuple[str, str], Dict[str, Any]]: (グループ, 名前) ごとの結果
+                - status, count, visible, latency_ms（検出までのミリ秒）, error
+        """
+        if not self.selectors:
+            self._load_selectors()
+        if keys is None:
+            keys = [(group, name) for group, names in self.selectors.items() for name in names]
+        timeout = self.timeout if timeout is None else timeout
+        
+        results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        probe_keys = []
+        specs = []
+        for group, name in keys:
+            selector = self.selectors.get(group, {}).get(name)
+            if not selector:
+                results[(group, name)] = {
+                    "status": "error", "count": 0, "visible": 0, "latency_ms": None,
+                    "error": "セレクタが定義されていません",
+                }
+                continue
+            probe_keys.append((group, name))
+            specs.append({
+                "type": selector["selector_type"].lower(),
+                "value": selector["selector_value"],
+            })
+        
+        if specs:
+            if not self.driver:
+                self.logger.error("ドライバーが初期化されていません")
+                return results
+            try:
+                probed = self._execute_async_script_with_timeout(
+                    SELECTOR_PROBE_JS, timeout + 5, specs, timeout * 1000
+                )
+            except Exception as e:
+                self.logger.error(f"セレクタの一括解決中にエラーが発生しました: {str(e)}")
+                probed = [{"count": 0, "visible": 0, "latency_ms": None, "error": str(e)}] * len(specs)
+            
+            for key, item in zip(probe_keys, probed):
+                if item.get("error"):
+                    status = "error"
+                elif item["count"] == 0:
+                    status = "missing"
+                elif item["count"] > 1:
+                    status = "ambiguous"
+                elif item["visible"] == 0:
+                    status = "invisible"
+                else:
+                    status = "found"
+                results[key] = dict(item, status=status)
+        
+        # 入力順にそろえる
+        return {key: results[key] for key in keys if key in results}
+    
     def input_text_by_selector(self, group: str, name: str, text: str, wait_time: Optional[int] = None, clear_first: bool = True, timeout: Optional[int] = None) -> bool:
         """
         セレクタグループと名前を使用して要素を検索し、テキストを入力する
@@ -1688,6 +2695,22 @@ class Browser:
         # ... existing code ...
         pass 
 
+    def _get_download_scanner(self, download_dir, file_types=None):
+        """
+        ディレクトリと拡張子の組み合わせごとにスキャナーを取得する（呼び出し間でインデックスを保持）
+        
+        Args:
+            download_dir: ダウンロードディレクトリ
+            file_types: 検索するファイル拡張子のリスト
+            
+        Returns:
+            DownloadDirectoryScanner: スキャナー
+        """
+        key = (download_dir, tuple(sorted(file_types)) if file_types else ())
+        if key not in self._download_scanners:
+            self._download_scanners[key] = DownloadDirectoryScanner(download_dir, logger=self.logger)
+        return self._download_scanners[key]
+
     def get_latest_download(self, download_dir=None, wait_time=0, file_types=None):
         """
         指定したダウンロードディレクトリから最新のダウンロードファイルを取得します
@@ -1735,56 +2758,14 @@ class Browser:
                 self.logger.error(f"ダウンロードディレクトリにアクセス権限がありません: {download_dir}")
                 return None
                 
-            # ダウンロードディレクトリのファイル一覧を取得
-            files = []
-            
-            # Chromeのダウンロード設定を取得してログ出力
-            try:
-                download_prefs = self.driver.execute_script("return window.navigator.userAgent")
-                self.logger.debug(f"ブラウザのユーザーエージェント: {download_prefs}")
-            except Exception as e:
-                self.logger.debug(f"ブラウザ設定の取得中にエラー: {str(e)}")
-            
-            # ファイルシステムの詳細情報をログに記録
-            try:
-                dir_contents = os.listdir(download_dir)
-                self.logger.debug(f"ダウンロードディレクトリの内容: {dir_contents}")
-                
-                # ディレクトリ内のファイル詳細情報
-                file_details = []
-                for f in dir_contents:
-                    file_path = os.path.join(download_dir, f)
-                    if os.path.isfile(file_path):
-                        file_size = os.path.getsize(file_path)
-                        file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path)).strftime('%Y-%m-%d %H:%M:%S')
-                        file_details.append(f"{f} (サイズ: {file_size}バイト, 更新日時: {file_mtime})")
-                
-                if file_details:
-                    self.logger.debug(f"ファイル詳細: {file_details}")
-            except Exception as e:
-                self.logger.error(f"ディレクトリ内容の確認中にエラー: {str(e)}")
-            
-            # 拡張子ごとに検索
-            if file_types:
-                for ext in file_types:
-                    # 拡張子にピリオドが含まれていない場合は追加
-                    if not ext.startswith('.'):
-                        ext = f".{ext}"
-                    pattern = os.path.join(download_dir, f"*{ext}")
-                    found_files = glob.glob(pattern)
-                    self.logger.debug(f"パターン '{pattern}' での検索結果: {len(found_files)} ファイル")
-                    files.extend(found_files)
-            else:
-                # すべてのファイルを検索
-                pattern = os.path.join(download_dir, "*")
-                files = glob.glob(pattern)
-                self.logger.debug(f"パターン '{pattern}' での検索結果: {len(files)} ファイル")
-                
-            # ダウンロード中の一時ファイルを除外
-            files = [f for f in files if not f.endswith('.crdownload') and 
-                     not f.endswith('.part') and not f.endswith('.download')]
-                
-            if not files:
+            # インデックス付きスキャナーで新規・更新ファイルのみを確認
+            scanner = self._get_download_scanner(download_dir, file_types)
+            changed = scanner.scan(file_types)
+            if changed:
+                self.logger.debug(f"新規/更新されたファイル: {[os.path.basename(e.path) for e in changed[:5]]}")
+            
+            latest_any = scanner.latest(min_size=0)
+            if latest_any is None:
                 self.logger.warning(f"ダウンロードディレクトリに適合するファイルが見つかりません: {download_dir}")
                 
                 # 他の場所も検索する（Window環境の場合）
@@ -1794,43 +2775,30 @@ class Browser:
                     self.logger.debug(f"代替ダウンロードディレクトリを確認: {alt_download_dir}")
                     
                     if os.path.exists(alt_download_dir):
-                        alt_files = glob.glob(os.path.join(alt_download_dir, "*"))
-                        alt_files = [f for f in alt_files if not f.endswith('.crdownload') and 
-                                     not f.endswith('.part') and not f.endswith('.download')]
+                        alt_scanner = self._get_download_scanner(alt_download_dir, None)
+                        alt_scanner.scan()
+                        latest_alt = alt_scanner.latest(min_size=0)
                         
-                        if alt_files:
-                            latest_alt_file = max(alt_files, key=os.path.getmtime)
-                            file_mtime = datetime.fromtimestamp(os.path.getmtime(latest_alt_file)).strftime('%Y-%m-%d %H:%M:%S')
-                            
-                            # 最近ダウンロードされたファイルかチェック（15分以内）
-                            if (datetime.now() - datetime.fromtimestamp(os.path.getmtime(latest_alt_file))).total_seconds() < 900:
-                                self.logger.info(f"代替ディレクトリでファイルを発見: {latest_alt_file} (更新日時: {file_mtime})")
-                                return latest_alt_file
+                        # 最近ダウンロードされたファイルかチェック（15分以内）
+                        if latest_alt and time.time() - latest_alt.mtime < 900:
+                            file_mtime = datetime.fromtimestamp(latest_alt.mtime).strftime('%Y-%m-%d %H:%M:%S')
+                            self.logger.info(f"代替ディレクトリでファイルを発見: {latest_alt.path} (更新日時: {file_mtime})")
+                            return latest_alt.path
                 
                 return None
-                
-            # ファイルを更新日時でソート
-            latest_file = max(files, key=os.path.getmtime)
             
-            # ファイルサイズを確認
-            file_size = os.path.getsize(latest_file)
             # 空ファイルをスキップ
-            if file_size == 0:
-                self.logger.warning(f"最新のファイルがサイズ0です: {latest_file}")
-                
-                # 2番目に新しいファイルを試す
-                if len(files) > 1:
-                    files.remove(latest_file)
-                    second_latest = max(files, key=os.path.getmtime)
-                    if os.path.getsize(second_latest) > 0:
-                        self.logger.info(f"2番目に新しいファイルを使用します: {second_latest}")
-                        return second_latest
-                
+            if latest_any.size == 0:
+                self.logger.warning(f"最新のファイルがサイズ0です: {latest_any.path}")
+                latest = scanner.latest(min_size=1)
+                if latest:
+                    self.logger.info(f"サイズ0でない最新のファイルを使用します: {latest.path}")
+                    return latest.path
                 return None
             
-            self.logger.info(f"最新のダウンロードファイルを検出: {latest_file} (サイズ: {file_size} バイト)")
+            self.logger.info(f"最新のダウンロードファイルを検出: {latest_any.path} (サイズ: {latest_any.size} バイト)")
             
-            return latest_file
+            return latest_any.path
             
         except Exception as e:
             self.logger.error(f"ダウンロードファイルの検出中にエラーが発生: {str(e)}")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+ダウンロードディレクトリのインデックス付きスキャナー
+
+os.scandir の DirEntry が保持する stat 情報を利用してディレクトリを走査し、
+前回走査時のインデックスと比較して新規・更新されたファイルのみを報告します。
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# ダウンロード中の一時ファイルの拡張子
+PARTIAL_DOWNLOAD_SUFFIXES = (".crdownload", ".part", ".download", ".tmp")
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """インデックスに保持するファイル情報"""
+    path: str
+    size: int
+    mtime: float
+
+
+class DownloadDirectoryScanner:
+    """
+    ダウンロードディレクトリを差分走査するスキャナー
+
+    走査ごとに全ファイルを再度 stat することはせず、DirEntry の stat 結果を
+    インデックスに保持して、サイズまたは更新日時が変わったファイルだけを返します。
+    """
+
+    def __init__(self, directory: str, logger: Optional[logging.Logger] = None):
+        """
+        スキャナーの初期化
+
+        Args:
+            directory: 監視するディレクトリ
+            logger: ロガー（省略時はモジュールロガー）
+        """
+        self.directory = directory
+        self.logger = logger or logging.getLogger(__name__)
+        self.index: Dict[str, FileEntry] = {}
+
+    def scan(self, file_types: Optional[Iterable[str]] = None) -> List[FileEntry]:
+        """
+        ディレクトリを走査し、前回から新規・更新されたファイルを返す
+
+        Args:
+            file_types: 対象とする拡張子のリスト（例: ['.csv']）。省略時はすべて
+
+        Returns:
+            List[FileEntry]: 新規または更新されたファイル（更新日時の新しい順）
+        """
+        suffixes = self._normalize_suffixes(file_types)
+        current: Dict[str, FileEntry] = {}
+        changed: List[FileEntry] = []
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                name = entry.name
+                lower_name = name.lower()
+                if lower_name.endswith(PARTIAL_DOWNLOAD_SUFFIXES):
+                    continue
+                if suffixes and not lower_name.endswith(suffixes):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # 走査中に移動・削除されたファイル
+                    continue
+                file_entry = FileEntry(entry.path, stat.st_size, stat.st_mtime)
+                current[name] = file_entry
+                previous = self.index.get(name)
+                if previous is None or previous.size != file_entry.size or previous.mtime != file_entry.mtime:
+                    changed.append(file_entry)
+
+        removed = len(set(self.index) - set(current))
+        self.index = current
+        if changed or removed:
+            self.logger.debug(
+                f"ダウンロードディレクトリの変化: 新規/更新 {len(changed)} 件, 削除 {removed} 件 "
+                f"(全 {len(current)} 件): {self.directory}"
+            )
+        changed.sort(key=lambda e: e.mtime, reverse=True)
+        return changed
+
+    def latest(self, min_size: int = 1) -> Optional[FileEntry]:
+        """
+        インデックス内で最も新しいファイルを返す
+
+        Args:
+            min_size: 対象とする最小サイズ（バイト）。空ファイルを除外する場合は1
+
+        Returns:
+            FileEntry or None: 最新のファイル。該当がない場合はNone
+        """
+        candidates = [e for e in self.index.values() if e.size >= min_size]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda e: e.mtime)
+
+    @staticmethod
+    def _normalize_suffixes(file_types: Optional[Iterable[str]]) -> tuple:
+        """拡張子のリストを小文字・ピリオド付きのタプルに変換する"""
+        if not file_types:
+            return ()
+        return tuple(
+            (ext if ext.startswith(".") else f".{ext}").lower() for ext in file_types
+        )
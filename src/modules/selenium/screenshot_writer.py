@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+スクリーンショットの非同期書き込みモジュール
+
+キャプチャ済みの画像バイト列を上限付きキューで受け取り、
+バックグラウンドスレッドでディスクへ書き込みます。
+書き込み後にディレクトリごとの保持ポリシー（最大件数・合計サイズ）を適用します。
+"""
+
+import os
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+# 保持ポリシーの対象とする画像ファイルの拡張子
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+class ScreenshotWriter:
+    """
+    スクリーンショットをバックグラウンドで保存するライター
+
+    自動化スレッドは enqueue() でバイト列を渡すだけで処理を続行できます。
+    キューが満杯の場合は待機せずに破棄し、自動化処理を遅延させません。
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        max_queue_size: int = 32,
+        max_files: int = 200,
+        max_total_bytes: int = 200 * 1024 * 1024
+    ):
+        """
+        ライターの初期化
+
+        Args:
+            logger: ロガー（省略時はモジュールロガー）
+            max_queue_size: キューの最大長
+            max_files: ディレクトリごとの最大保持件数（0以下で無制限）
+            max_total_bytes: ディレクトリごとの最大合計サイズ（0以下で無制限）
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_files = max_files
+        self.max_total_bytes = max_total_bytes
+        self._queue: "queue.Queue[Optional[Tuple[str, bytes, threading.Event]]]" = queue.Queue(maxsize=max_queue_size)
+        # 書き込み待ちのファイルごとの完了イベント
+        self._pending: Dict[str, threading.Event] = {}
+        self._pending_lock = threading.Lock()
+        # ディレクトリごとの保存済みファイル一覧（古い順）と合計サイズ
+        self._index: Dict[str, deque] = {}
+        self._index_bytes: Dict[str, int] = {}
+        self.written_count = 0
+        self.dropped_count = 0
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, filepath: str, data: bytes) -> bool:
+        """
+        書き込み対象をキューに追加する
+
+        Args:
+            filepath: 保存先のファイルパス
+            data: 画像のバイト列
+
+        Returns:
+            bool: キューに追加できた場合はTrue、満杯で破棄した場合はFalse
+        """
+        done = threading.Event()
+        try:
+            with self._pending_lock:
+                self._queue.put_nowait((filepath, data, done))
+                self._pending[os.path.abspath(filepath)] = done
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            self.logger.warning(f"スクリーンショットキューが満杯のため破棄しました: {filepath}")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        キュー内の書き込みが完了するまで待機する
+
+        Args:
+            timeout: 最大待機秒数（Noneの場合は無制限）
+
+        Returns:
+            bool: すべて書き込まれた場合はTrue
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+        done = threading.Event()
+
+        def _join():
+            self._queue.join()
+            done.set()
+
+        threading.Thread(target=_join, daemon=True).start()
+        return done.wait(timeout)
+
+    def wait_for(self, filepath: str, timeout: Optional[float] = None) -> bool:
+        """
+        指定したファイルの書き込みが完了するまで待機する
+
+        Args:
+            filepath: enqueue() に渡したファイルパス
+            timeout: 最大待機秒数（Noneの場合は無制限）
+
+        Returns:
+            bool: ファイルが書き込まれた場合はTrue（書き込みに失敗した・時間内に完了しなかった場合はFalse）
+        """
+        with self._pending_lock:
+            done = self._pending.get(os.path.abspath(filepath))
+        if done is not None and not done.wait(timeout):
+            return False
+        return os.path.exists(filepath)
+
+    def close(self, timeout: Optional[float] = 10) -> None:
+        """
+        残りの書き込みを完了させてスレッドを停止する
+
+        Args:
+            timeout: 最大待機秒数
+        """
+        if not self._thread.is_alive():
+            return
+        if not self.flush(timeout):
+            self.logger.warning("スクリーンショットの書き込みが時間内に完了しませんでした")
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """キューから取り出してファイルに書き込むワーカー"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                filepath, data, done = item
+                try:
+                    self._write(filepath, data)
+                finally:
+                    with self._pending_lock:
+                        # 同じパスが再度キューに追加されている場合はそちらの完了を待たせる
+                        if self._pending.get(os.path.abspath(filepath)) is done:
+                            del self._pending[os.path.abspath(filepath)]
+                    done.set()
+            except Exception as e:
+                self.logger.error(f"スクリーンショットの書き込み中にエラーが発生しました: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, filepath: str, data: bytes) -> None:
+        """
+        ファイルを書き込み、保持ポリシーを適用する
+
+        Args:
+            filepath: 保存先のファイルパス
+            data: 画像のバイト列
+        """
+        directory = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(directory, exist_ok=True)
+        # 書き込み途中のファイルが残らないよう一時ファイル経由で置き換える
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+        self.written_count += 1
+        self.logger.debug(f"スクリーンショットを書き込みました: {filepath} ({len(data)} bytes)")
+
+        entries = self._get_index(directory)
+        abs_path = os.path.abspath(filepath)
+        # 同名ファイルの上書き時は古いエントリを除去する
+        for entry in list(entries):
+            if entry[0] == abs_path:
+                entries.remove(entry)
+                self._index_bytes[directory] -= entry[1]
+        entries.append((abs_path, len(data)))
+        self._index_bytes[directory] += len(data)
+        self._enforce_retention(directory)
+
+    def _get_index(self, directory: str) -> deque:
+        """
+        ディレクトリの保存済みファイル一覧を取得する（初回のみ走査）
+
+        Args:
+            directory: 対象ディレクトリ
+
+        Returns:
+            deque: (パス, サイズ) を古い順に並べた一覧
+        """
+        if directory in self._index:
+            return self._index[directory]
+        files = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.path, stat.st_size))
+        files.sort()
+        self._index[directory] = deque((os.path.abspath(p), size) for _, p, size in files)
+        self._index_bytes[directory] = sum(size for _, _, size in files)
+        return self._index[directory]
+
+    def _enforce_retention(self, directory: str) -> None:
+        """
+        最大件数・合計サイズを超えた古いファイルを削除する
+
+        Args:
+            directory: 対象ディレクトリ
+        """
+        entries = self._index[directory]
+        removed = 0
+        # 直近に書き込んだファイルは常に残す
+        while len(entries) > 1 and (
+            (self.max_files > 0 and len(entries) > self.max_files)
+            or (self.max_total_bytes > 0 and self._index_bytes[directory] > self.max_total_bytes)
+        ):
+            path, size = entries.popleft()
+            self._index_bytes[directory] -= size
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"古いスクリーンショットの削除に失敗しました: {path} ({str(e)})")
+        if removed:
+            self.logger.debug(f"保持ポリシーにより {removed} 件のスクリーンショットを削除しました: {directory}")
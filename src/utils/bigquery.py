@@ -7,14 +7,24 @@ BigQuery/GCSクライアント (最小限バージョン)
 Google BigQueryとGoogle Cloud Storageとの連携に必要な最小限の機能を提供します。
 - GCS認証
 - BigQuery認証
-- テーブルスキーマ確認
-- GCSファイル操作
+- テーブルスキーマ確認（存在確認とスキーマはTTL付きでキャッシュ）
+- GCSファイル操作（一覧はページ単位で遅延取得）
+
+GoogleCloudAuth.get_instance() はキーファイルとプロジェクトごとにインスタンスを共有するため、
+認証情報の更新とHTTP接続プールをプロセス内の呼び出し元で再利用できます。
+
+settings.ini の [BIGQUERY] backend を local にすると、BigQueryとGCSの代わりに
+src.utils.local_backend のローカル実装（SQLiteとディレクトリ）を使用します（オフラインのテスト・計測用）。
 """
 
 import os
+import time
+import threading
 from pathlib import Path
-from typing import Optional, List, BinaryIO, Union
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, List, BinaryIO, Tuple, Union
 
+import requests
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
 from google.cloud import storage
 from google.oauth2 import service_account
@@ -22,19 +32,107 @@ from google.cloud.exceptions import NotFound
 
 from src.utils.logging_config import get_logger
 from src.utils.environment import env
+from src.utils.local_backend import create_local_clients
 
 logger = get_logger(__name__)
 
+
+def _list_fields(fields: Optional[str]) -> Optional[str]:
+    """
+    Blobの取得項目（カンマ区切り）を objects.list の fields パラメータに変換する
+
+    ページ送りとディレクトリ一覧に必要な nextPageToken と prefixes は常に含める。
+    """
+    if not fields:
+        return None
+    return f"items({fields}),prefixes,nextPageToken"
+
+
+class MetadataCache:
+    """
+    データセット・テーブル・バケットのメタデータを有効期限付きで保持するキャッシュ
+
+    存在しない（NotFound）という結果も negative_ttl の間だけ保持する。
+    複数スレッドから使用できる。
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 30):
+        """
+        Args:
+            ttl: 取得した値を保持する秒数（0でキャッシュしない）
+            negative_ttl: 存在しないという結果を保持する秒数（0でキャッシュしない）
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        キャッシュから値を取得する
+
+        Returns:
+            Tuple[bool, Any]: (有効な値があるか, 値。存在しない場合の値はNone)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """値を保持する（Noneは存在しないという結果として negative_ttl の間保持）"""
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, match: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        キャッシュを破棄する
+
+        Args:
+            match: 破棄するキーの条件（省略時はすべて）
+
+        Returns:
+            int: 破棄した件数
+        """
+        with self._lock:
+            keys = [key for key in self._entries if match is None or match(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット数・ミス数・保持している件数"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
 class GoogleCloudAuth:
     """Google BigQueryとGCSへの認証を行うユーティリティクラス"""
 
-    def __init__(self, key_path: Optional[str] = None):
+    # get_instance() で共有するインスタンス（キー: (キーファイルのパス, プロジェクトID)）
+    _instances: Dict[Tuple[Optional[str], Optional[str]], 'GoogleCloudAuth'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, key_path: Optional[str] = None, project_id: Optional[str] = None,
+                 backend: Optional[str] = None):
         """
         GoogleCloudAuthの初期化
         
         Args:
             key_path (Optional[str]): サービスアカウントのJSONファイルパス。
                                      指定しない場合は環境変数から読み込み
+            project_id (Optional[str]): プロジェクトID。指定しない場合は環境変数から読み込み
+            backend (Optional[str]): gcp または local。指定しない場合は設定ファイルの値
         """
         # 環境変数を読み込む
         try:
@@ -42,26 +140,49 @@ class GoogleCloudAuth:
         except Exception as e:
             logger.warning(f"環境変数の読み込みに失敗しました: {e}")
         
-        # 設定を環境変数から取得
-        self.project_id = env.get_env_var("PROJECT_ID")
-        self.dataset_id = env.get_env_var("BIGQUERY_DATASET")
-        self.bucket_name = env.get_env_var("GCS_BUCKET_NAME")
+        # ローカル実装では環境変数がなくても動作するように既定値を使用する
+        self.backend = (backend or env.get_config_value("BIGQUERY", "backend", "gcp")).lower()
+        local = self.backend == "local"
+        self.local_backend_dir = env.get_config_value("BIGQUERY", "local_backend_dir", "data/local_cloud")
         
-        # キーファイルのパス取得
-        if key_path is None:
-            key_path = env.get_env_var("GOOGLE_APPLICATION_CREDENTIALS")
-        
-        # 相対パスを絶対パスに解決
-        if key_path and not os.path.isabs(key_path):
-            key_path = os.path.join(str(env.get_project_root()), key_path)
+        # 設定を環境変数から取得
+        self.project_id = project_id or env.get_env_var("PROJECT_ID", "local-project" if local else None)
+        self.dataset_id = env.get_env_var("BIGQUERY_DATASET", "local_dataset" if local else None)
+        self.bucket_name = env.get_env_var("GCS_BUCKET_NAME", "local-bucket" if local else None)
         
-        self.key_path = key_path
+        self.key_path = self._resolve_key_path(key_path)
         self.credentials = None
         self.bigquery_client = None
         self.storage_client = None
         
+        # BigQueryとGCSのクライアントで共有するHTTPセッション（認証情報の更新と接続プールを共有）
+        self.http_pool_size = int(env.get_config_value("BIGQUERY", "http_pool_size", 32))
+        self._http = None
+        
+        # GCSの一覧取得の設定（1ページの件数と取得する項目）
+        self.list_page_size = int(env.get_config_value("GCS", "list_page_size", 1000))
+        self.list_fields = env.get_config_value("GCS", "list_fields", "") or None
+        
+        # データセット・テーブル・バケットの存在確認とスキーマのキャッシュ
+        self.metadata_cache = MetadataCache(
+            float(env.get_config_value("BIGQUERY", "metadata_cache_ttl", 300)),
+            float(env.get_config_value("BIGQUERY", "metadata_cache_negative_ttl", 30)),
+        )
+        
+        # クライアントの遅延初期化を複数スレッドから安全に行うためのロック
+        self._lock = threading.RLock()
+        
         logger.info(f"GoogleCloudAuthを初期化しました: プロジェクトID={self.project_id}")
     
+    @staticmethod
+    def _resolve_key_path(key_path: Optional[str] = None) -> Optional[str]:
+        """キーファイルのパスを取得し、相対パスをプロジェクトルートからの絶対パスに解決する"""
+        if key_path is None:
+            key_path = env.get_env_var("GOOGLE_APPLICATION_CREDENTIALS", "") or None
+        if key_path and not os.path.isabs(key_path):
+            key_path = os.path.join(str(env.get_project_root()), key_path)
+        return key_path
+    
     def get_credentials(self) -> Optional[service_account.Credentials]:
         """
         Google Cloud認証情報を取得
@@ -71,21 +192,51 @@ class GoogleCloudAuth:
         """
         if self.credentials:
             return self.credentials
+        
+        with self._lock:
+            if self.credentials:
+                return self.credentials
             
-        if not self.key_path or not os.path.exists(self.key_path):
-            logger.error(f"認証キーファイルが見つかりません: {self.key_path}")
-            return None
+            if not self.key_path or not os.path.exists(self.key_path):
+                logger.error(f"認証キーファイルが見つかりません: {self.key_path}")
+                return None
+            
+            try:
+                # 認証情報を作成
+                self.credentials = service_account.Credentials.from_service_account_file(
+                    self.key_path,
+                    scopes=["https://www.googleapis.com/auth/cloud-platform"]
+                )
+                return self.credentials
+            except Exception as e:
+                logger.error(f"認証情報取得中にエラーが発生しました: {str(e)}")
+                return None
+    
+    def get_http_session(self) -> Optional[AuthorizedSession]:
+        """
+        BigQueryとGCSのクライアントで共有する認証済みHTTPセッションを取得
         
-        try:
-            # 認証情報を作成
-            self.credentials = service_account.Credentials.from_service_account_file(
-                self.key_path,
-                scopes=["https://www.googleapis.com/auth/cloud-platform"]
-            )
-            return self.credentials
-        except Exception as e:
-            logger.error(f"認証情報取得中にエラーが発生しました: {str(e)}")
+        Returns:
+            Optional[AuthorizedSession]: 認証済みのセッション、失敗時はNone
+        """
+        if self._http:
+            return self._http
+        
+        credentials = self.get_credentials()
+        if not credentials:
             return None
+        
+        with self._lock:
+            if self._http is None:
+                session = AuthorizedSession(credentials)
+                # 並列アップロードなどで同時に使用できる接続数を増やす
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.http_pool_size,
+                    pool_maxsize=self.http_pool_size
+                )
+                session.mount("https://", adapter)
+                self._http = session
+            return self._http
     
     def authenticate_bigquery(self) -> Optional[bigquery.Client]:
         """
@@ -96,24 +247,31 @@ class GoogleCloudAuth:
         """
         if self.bigquery_client:
             return self.bigquery_client
+        if self.backend == "local":
+            return self._create_local_clients()[0]
             
         credentials = self.get_credentials()
         if not credentials:
             return None
         
-        try:
-            # BigQueryクライアントを初期化
-            self.bigquery_client = bigquery.Client(
-                credentials=credentials,
-                project=self.project_id
-            )
+        with self._lock:
+            if self.bigquery_client:
+                return self.bigquery_client
             
-            logger.info("BigQuery認証が完了しました")
-            return self.bigquery_client
-            
-        except Exception as e:
-            logger.error(f"BigQuery認証処理中にエラーが発生しました: {str(e)}")
-            return None
+            try:
+                # BigQueryクライアントを初期化
+                self.bigquery_client = bigquery.Client(
+                    credentials=credentials,
+                    project=self.project_id,
+                    _http=self.get_http_session()
+                )
+                
+                logger.info("BigQuery認証が完了しました")
+                return self.bigquery_client
+                
+            except Exception as e:
+                logger.error(f"BigQuery認証処理中にエラーが発生しました: {str(e)}")
+                return None
     
     def authenticate_gcs(self) -> Optional[storage.Client]:
         """
@@ -124,24 +282,41 @@ class GoogleCloudAuth:
         """
         if self.storage_client:
             return self.storage_client
+        if self.backend == "local":
+            return self._create_local_clients()[1]
             
         credentials = self.get_credentials()
         if not credentials:
             return None
         
-        try:
-            # GCSクライアントを初期化
-            self.storage_client = storage.Client(
-                credentials=credentials,
-                project=self.project_id
-            )
+        with self._lock:
+            if self.storage_client:
+                return self.storage_client
             
-            logger.info("Google Cloud Storage認証が完了しました")
-            return self.storage_client
-            
-        except Exception as e:
-            logger.error(f"GCS認証処理中にエラーが発生しました: {str(e)}")
-            return None
+            try:
+                # GCSクライアントを初期化
+                self.storage_client = storage.Client(
+                    credentials=credentials,
+                    project=self.project_id,
+                    _http=self.get_http_session()
+                )
+                
+                logger.info("Google Cloud Storage認証が完了しました")
+                return self.storage_client
+                
+            except Exception as e:
+                logger.error(f"GCS認証処理中にエラーが発生しました: {str(e)}")
+                return None
+    
+    def _create_local_clients(self) -> Tuple[Any, Any]:
+        """ローカル実装のBigQueryとGCSのクライアントを作成する（両方を同じディレクトリで作成）"""
+        with self._lock:
+            if self.bigquery_client is None or self.storage_client is None:
+                root = self.local_backend_dir
+                if not os.path.isabs(root):
+                    root = os.path.join(str(env.get_project_root()), root)
+                self.bigquery_client, self.storage_client = create_local_clients(root, self.project_id)
+            return self.bigquery_client, self.storage_client
     
     def dataset_exists(self, dataset_id: Optional[str] = None) -> bool:
         """
@@ -165,15 +340,17 @@ class GoogleCloudAuth:
         try:
             # 推奨される方法でデータセットの存在を確認
             dataset_ref = f"{self.project_id}.{dataset_id}"
-            client.get_dataset(dataset_ref)  # API呼び出しでデータセットを取得
-            logger.info(f"データセット '{dataset_id}' は存在します")
-            return True
-        except NotFound:
-            logger.info(f"データセット '{dataset_id}' は存在しません")
-            return False
+            exists = self._cached(("dataset", self.project_id, dataset_id),
+                                  lambda: client.get_dataset(dataset_ref) is not None)
         except Exception as e:
             logger.error(f"データセット確認中にエラーが発生しました: {str(e)}")
             return False
+        
+        if exists:
+            logger.info(f"データセット '{dataset_id}' は存在します")
+            return True
+        logger.info(f"データセット '{dataset_id}' は存在しません")
+        return False
     
     def table_exists(self, table_id: str, dataset_id: Optional[str] = None) -> bool:
         """
@@ -196,17 +373,17 @@ class GoogleCloudAuth:
             return False
         
         try:
-            # 推奨される方法でテーブルの存在を確認
-            table_ref = f"{self.project_id}.{dataset_id}.{table_id}"
-            client.get_table(table_ref)  # API呼び出しでテーブルを取得
-            logger.info(f"テーブル '{dataset_id}.{table_id}' は存在します")
-            return True
-        except NotFound:
-            logger.info(f"テーブル '{dataset_id}.{table_id}' は存在しません")
-            return False
+            # スキーマと同じキャッシュを使用する（テーブルがない場合はNone）
+            schema = self._cached_table_schema(client, table_id, dataset_id)
         except Exception as e:
             logger.error(f"テーブル確認中にエラーが発生しました: {str(e)}")
             return False
+        
+        if schema is not None:
+            logger.info(f"テーブル '{dataset_id}.{table_id}' は存在します")
+            return True
+        logger.info(f"テーブル '{dataset_id}.{table_id}' は存在しません")
+        return False
     
     def get_table_schema(self, table_id: str, dataset_id: Optional[str] = None) -> Optional[List[bigquery.SchemaField]]:
         """
@@ -229,23 +406,22 @@ class GoogleCloudAuth:
             return None
         
         try:
-            # 推奨される方法でテーブルの参照を取得
-            table_ref = f"{self.project_id}.{dataset_id}.{table_id}"
-            table = client.get_table(table_ref)  # API呼び出しでテーブルを取得
-            
-            logger.info(f"テーブル '{dataset_id}.{table_id}' のスキーマを取得しました")
-            
-            # スキーマ情報をログに出力
-            for field in table.schema:
-                logger.debug(f"フィールド: {field.name}, 型: {field.field_type}, モード: {field.mode}")
-            
-            return table.schema
-        except NotFound:
-            logger.warning(f"テーブル '{dataset_id}.{table_id}' が見つかりません")
-            return None
+            schema = self._cached_table_schema(client, table_id, dataset_id)
         except Exception as e:
             logger.error(f"スキーマ取得中にエラーが発生しました: {str(e)}")
             return None
+        
+        if schema is None:
+            logger.warning(f"テーブル '{dataset_id}.{table_id}' が見つかりません")
+            return None
+        
+        logger.info(f"テーブル '{dataset_id}.{table_id}' のスキーマを取得しました")
+        
+        # スキーマ情報をログに出力
+        for field in schema:
+            logger.debug(f"フィールド: {field.name}, 型: {field.field_type}, モード: {field.mode}")
+        
+        return list(schema)
     
     def bucket_exists(self, bucket_name: Optional[str] = None) -> bool:
         """
@@ -267,15 +443,66 @@ class GoogleCloudAuth:
             return False
         
         try:
-            bucket = client.get_bucket(bucket_name)
-            logger.info(f"バケット '{bucket_name}' は存在します")
-            return True
-        except NotFound:
-            logger.info(f"バケット '{bucket_name}' は存在しません")
-            return False
+            exists = self._cached(("bucket", bucket_name), lambda: client.get_bucket(bucket_name) is not None)
         except Exception as e:
             logger.error(f"バケット確認中にエラーが発生しました: {str(e)}")
             return False
+        
+        if exists:
+            logger.info(f"バケット '{bucket_name}' は存在します")
+            return True
+        logger.info(f"バケット '{bucket_name}' は存在しません")
+        return False
+    
+    def invalidate_table(self, table_id: str, dataset_id: Optional[str] = None) -> None:
+        """
+        テーブルのキャッシュを破棄する（ロード・MERGE・DDLの後に呼び出す）
+        
+        Args:
+            table_id (str): テーブルID（project.dataset.table 形式やパーティションデコレータ付きも可）
+            dataset_id (Optional[str]): データセットID
+        """
+        parts = table_id.split("$")[0].split(".")
+        project_id = parts[-3] if len(parts) >= 3 else self.project_id
+        dataset_id = parts[-2] if len(parts) >= 2 else dataset_id or self.dataset_id
+        self.metadata_cache.invalidate(lambda key: key == ("table", project_id, dataset_id, parts[-1]))
+    
+    def invalidate_dataset(self, dataset_id: Optional[str] = None) -> None:
+        """データセットとそのテーブルのキャッシュを破棄する"""
+        dataset_id = dataset_id or self.dataset_id
+        self.metadata_cache.invalidate(
+            lambda key: key[0] in ("dataset", "table") and key[1:3] == (self.project_id, dataset_id)
+        )
+    
+    def invalidate_bucket(self, bucket_name: Optional[str] = None) -> None:
+        """バケットのキャッシュを破棄する"""
+        bucket_name = bucket_name or self.bucket_name
+        self.metadata_cache.invalidate(lambda key: key == ("bucket", bucket_name))
+    
+    def _cached(self, key: Tuple, fetch: Callable[[], Any]) -> Any:
+        """
+        キャッシュから値を取得し、なければ fetch() で取得してキャッシュする
+        
+        NotFound の場合はNoneを返し、存在しないという結果としてキャッシュする。
+        その他のエラーはキャッシュせずにそのまま送出する。
+        """
+        found, value = self.metadata_cache.get(key)
+        if found:
+            logger.debug(f"メタデータのキャッシュを使用しました: {key}")
+            return value
+        try:
+            value = fetch()
+        except NotFound:
+            value = None
+        self.metadata_cache.set(key, value)
+        return value
+    
+    def _cached_table_schema(self, client: bigquery.Client, table_id: str,
+                             dataset_id: str) -> Optional[List[bigquery.SchemaField]]:
+        """テーブルのスキーマをキャッシュ経由で取得する（テーブルがない場合はNone）"""
+        table_ref = f"{self.project_id}.{dataset_id}.{table_id}"
+        return self._cached(("table", self.project_id, dataset_id, table_id),
+                            lambda: list(client.get_table(table_ref).schema))
     
     def list_blobs(self, bucket_name: Optional[str] = None, prefix: str = "") -> Optional[List[storage.Blob]]:
         """
@@ -298,8 +525,7 @@ class GoogleCloudAuth:
             return None
         
         try:
-            bucket = client.get_bucket(bucket_name)
-            blobs = list(bucket.list_blobs(prefix=prefix))
+            blobs = list(self._iter_blobs(client, bucket_name, prefix))
             
             logger.info(f"バケット '{bucket_name}' 内のファイル数: {len(blobs)}")
             return blobs
@@ -307,6 +533,99 @@ class GoogleCloudAuth:
             logger.error(f"ファイル一覧取得中にエラーが発生しました: {str(e)}")
             return None
     
+    def iter_blobs(self,
+                   prefix: str = "",
+                   bucket_name: Optional[str] = None,
+                   page_size: Optional[int] = None,
+                   fields: Optional[str] = None,
+                   delimiter: Optional[str] = None,
+                   max_results: Optional[int] = None) -> Iterator[storage.Blob]:
+        """
+        バケット内のファイルをページ単位で取得しながら順に返す
+        
+        一覧全体をメモリに保持しないため、ファイル数の多いプレフィックスでも使用できる。
+        取得中にエラーが発生した場合はログを出力して終了する。
+        
+        Args:
+            prefix (str): フィルタリング用のプレフィックス
+            bucket_name (Optional[str]): バケット名
+            page_size (Optional[int]): 1回のリクエストで取得する件数（省略時は設定ファイルの値）
+            fields (Optional[str]): 取得するBlobの項目（例: "name,size,updated"、省略時は設定ファイルの値）
+            delimiter (Optional[str]): 区切り文字（指定した場合は直下のファイルのみ返す）
+            max_results (Optional[int]): 返す件数の上限
+            
+        Yields:
+            storage.Blob: ファイル
+        """
+        client = self.authenticate_gcs()
+        if not client:
+            return
+        
+        bucket_name = bucket_name or self.bucket_name
+        if not bucket_name:
+            logger.error("バケット名が指定されていません")
+            return
+        
+        try:
+            yield from self._iter_blobs(client, bucket_name, prefix, page_size, fields, delimiter, max_results)
+        except Exception as e:
+            logger.error(f"ファイル一覧取得中にエラーが発生しました: {str(e)}")
+    
+    def list_prefixes(self,
+                      prefix: str = "",
+                      bucket_name: Optional[str] = None,
+                      delimiter: str = "/") -> Optional[List[str]]:
+        """
+        プレフィックス直下の「ディレクトリ」の一覧を取得
+        
+        Args:
+            prefix (str): 親のプレフィックス（例: "staging/"）
+            bucket_name (Optional[str]): バケット名
+            delimiter (str): 区切り文字
+            
+        Returns:
+            Optional[List[str]]: 子プレフィックスの一覧（例: ["staging/ebis_report/"]）、失敗時はNone
+        """
+        client = self.authenticate_gcs()
+        if not client:
+            return None
+        
+        bucket_name = bucket_name or self.bucket_name
+        if not bucket_name:
+            logger.error("バケット名が指定されていません")
+            return None
+        
+        try:
+            iterator = client.list_blobs(
+                client.bucket(bucket_name), prefix=prefix, delimiter=delimiter, page_size=self.list_page_size,
+                fields="prefixes,nextPageToken",
+            )
+            # prefixes はページを読み進めるごとに追加される
+            for _ in iterator.pages:
+                pass
+            return sorted(iterator.prefixes)
+        except Exception as e:
+            logger.error(f"ディレクトリ一覧取得中にエラーが発生しました: {str(e)}")
+            return None
+    
+    def _iter_blobs(self,
+                    client: storage.Client,
+                    bucket_name: str,
+                    prefix: str = "",
+                    page_size: Optional[int] = None,
+                    fields: Optional[str] = None,
+                    delimiter: Optional[str] = None,
+                    max_results: Optional[int] = None) -> Iterator[storage.Blob]:
+        """ファイルをページ単位で取得する（バケットのメタデータは取得しない）"""
+        return client.list_blobs(
+            client.bucket(bucket_name),
+            prefix=prefix or None,
+            delimiter=delimiter,
+            max_results=max_results,
+            page_size=page_size or self.list_page_size,
+            fields=_list_fields(fields or self.list_fields),
+        )
+    
     def upload_file(self, 
                    source_file: Union[str, BinaryIO], 
                    destination_blob_name: str, 
@@ -332,8 +651,8 @@ class GoogleCloudAuth:
             return None
         
         try:
-            bucket = client.get_bucket(bucket_name)
-            blob = bucket.blob(destination_blob_name)
+            # バケットの存在確認（メタデータの取得）は行わずにアップロードする
+            blob = client.bucket(bucket_name).blob(destination_blob_name)
             
             # ファイルパスまたはファイルオブジェクトに基づいてアップロード
             if isinstance(source_file, str):
@@ -348,15 +667,41 @@ class GoogleCloudAuth:
             logger.error(f"ファイルアップロード中にエラーが発生しました: {str(e)}")
             return None
     
-    @staticmethod
-    def get_instance() -> 'GoogleCloudAuth':
+    @classmethod
+    def get_instance(cls, key_path: Optional[str] = None, project_id: Optional[str] = None) -> 'GoogleCloudAuth':
         """
-        GoogleCloudAuthのインスタンスを取得
+        GoogleCloudAuthの共有インスタンスを取得
         
+        キーファイルとプロジェクトIDの組み合わせごとに1つのインスタンスを作成し、
+        以降の呼び出しでは同じインスタンス（認証情報・クライアント・接続プール）を返す。
+        
+        Args:
+            key_path (Optional[str]): サービスアカウントのJSONファイルパス
+            project_id (Optional[str]): プロジェクトID
+            
         Returns:
             GoogleCloudAuth: GoogleCloudAuthのインスタンス
         """
-        return GoogleCloudAuth()
+        registry_key = (cls._resolve_key_path(key_path), project_id or os.getenv("PROJECT_ID"))
+        instance = cls._instances.get(registry_key)
+        if instance is not None:
+            return instance
+        
+        with cls._instances_lock:
+            instance = cls._instances.get(registry_key)
+            if instance is None:
+                instance = cls(registry_key[0], project_id)
+                cls._instances[registry_key] = instance
+            return instance
+    
+    @classmethod
+    def clear_instances(cls) -> None:
+        """共有インスタンスを破棄する（認証情報の切り替えやテストで使用）"""
+        with cls._instances_lock:
+            for instance in cls._instances.values():
+                if instance._http is not None:
+                    instance._http.close()
+            cls._instances.clear()
 
 
 # 後方互換性のために別名を提供
@@ -0,0 +1,752 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+BigQueryロードジョブによるデータ投入
+
+CSVProcessorで処理したCSV（またはParquet）ファイルをGCSにステージングし、
+BigQueryのロードジョブでテーブルに投入します。
+ロードジョブは行単位の挿入と異なり課金対象外で、大量データでも高速に処理できます。
+
+- CSVはBigQueryが読み込める形式（UTF-8、桁区切りなしの数値、YYYY-MM-DDの日付）に変換してからアップロード
+- ステージングしたファイルはロードジョブの終了後に削除（[BIGQUERY] keep_staged_files で残せる）
+- スキーマはCSVProcessorが出力したスキーマJSON（*_schema.json）から作成し、
+  ロード先テーブルとの差分を事前に確認（非互換な差分があればロードしない）
+- ジョブの処理行数・バイト数・スロット時間・所要時間を LoadResult として返却
+- 日次ファイルは日付パーティションのデコレータ（table$YYYYMMDD）と WRITE_TRUNCATE で
+  該当日のパーティションだけを置き換える（再実行やバックフィルでも重複しない）
+- 後日修正される行を含むファイル（コンバージョン属性レポートなど）は、ステージングテーブルに
+  ロードしてから業務キーで1回の MERGE 文を実行し、追加・更新・変更なしの件数を返却
+
+使用例:
+$ python -m src.utils.bigquery_loader data/downloads/report.csv --table ebis_report
+$ python -m src.utils.bigquery_loader data/downloads/report.csv --table ebis_report --daily
+$ python -m src.utils.bigquery_loader data/downloads/cv_attribute.csv --table cv_attribute --upsert
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import time
+import argparse
+import tempfile
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from google.cloud import bigquery
+
+from src.utils.logging_config import get_logger
+from src.utils.environment import env
+from src.utils.bigquery import GoogleCloudAuth
+from src.utils.bigquery_schema import SchemaDrift, diff_schema, normalize_type, translate_schema
+
+logger = get_logger(__name__)
+
+# 拡張子ごとのソース形式
+SOURCE_FORMATS = {
+    ".csv": bigquery.SourceFormat.CSV,
+    ".parquet": bigquery.SourceFormat.PARQUET,
+}
+
+
+@dataclass
+class LoadResult:
+    """ロードジョブの実行結果"""
+    table: str
+    source_uri: str
+    job_id: Optional[str] = None
+    state: str = ""
+    output_rows: int = 0
+    output_bytes: int = 0
+    input_bytes: int = 0
+    slot_millis: int = 0
+    duration_seconds: float = 0.0
+    errors: List[Any] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        """ジョブが正常に完了したかどうか"""
+        return self.state == "DONE" and not self.errors
+
+    def as_dict(self) -> Dict[str, Any]:
+        """辞書形式で返す"""
+        return {
+            "table": self.table,
+            "source_uri": self.source_uri,
+            "job_id": self.job_id,
+            "state": self.state,
+            "output_rows": self.output_rows,
+            "output_bytes": self.output_bytes,
+            "input_bytes": self.input_bytes,
+            "slot_millis": self.slot_millis,
+            "duration_seconds": self.duration_seconds,
+            "errors": list(self.errors),
+        }
+
+
+@dataclass
+class MergeResult:
+    """MERGEによるアップサートの実行結果"""
+    table: str
+    staging_table: str = ""
+    job_id: Optional[str] = None
+    source_rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    bytes_processed: int = 0
+    slot_millis: int = 0
+    duration_seconds: float = 0.0
+    errors: List[Any] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> int:
+        """ファイルの行のうち、追加も更新もされなかった行数（ファイル内のキーの重複を含む）"""
+        return max(0, self.source_rows - self.inserted - self.updated)
+
+    @property
+    def success(self) -> bool:
+        """エラーなく完了したかどうか"""
+        return not self.errors
+
+    def as_dict(self) -> Dict[str, Any]:
+        """辞書形式で返す"""
+        return {
+            "table": self.table,
+            "staging_table": self.staging_table,
+            "job_id": self.job_id,
+            "source_rows": self.source_rows,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "bytes_processed": self.bytes_processed,
+            "slot_millis": self.slot_millis,
+            "duration_seconds": self.duration_seconds,
+            "errors": list(self.errors),
+        }
+
+
+def _quote(name: str) -> str:
+    """識別子をバッククォートで囲む"""
+    return f"`{name}`"
+
+
+def build_merge_sql(target: str, staging: str, columns: List[str], key_columns: List[str]) -> str:
+    """
+    ステージングテーブルの内容をターゲットテーブルにアップサートするMERGE文を作成する
+
+    - キーはNULLも含めて比較する（IS NOT DISTINCT FROM）
+    - ステージング内で同じキーの行が複数ある場合は1行だけを使用する
+    - キー以外の列のいずれかが異なる行だけを更新する（変更のない行は更新件数に含まれない）
+
+    Args:
+        target: ターゲットテーブルの完全修飾ID
+        staging: ステージングテーブルの完全修飾ID
+        columns: ステージングテーブルの列名
+        key_columns: 業務キーの列名
+
+    Returns:
+        str: MERGE文
+    """
+    keys = ", ".join(_quote(c) for c in key_columns)
+    condition = " AND ".join(f"T.{_quote(c)} IS NOT DISTINCT FROM S.{_quote(c)}" for c in key_columns)
+    values = [c for c in columns if c not in key_columns]
+    lines = [
+        f"MERGE {_quote(target)} T",
+        "USING (",
+        f"  SELECT * FROM {_quote(staging)}",
+        f"  WHERE TRUE QUALIFY ROW_NUMBER() OVER (PARTITION BY {keys}) = 1",
+        ") S",
+        f"ON {condition}",
+    ]
+    if values:
+        changed = " OR ".join(f"T.{_quote(c)} IS DISTINCT FROM S.{_quote(c)}" for c in values)
+        assignments = ", ".join(f"{_quote(c)} = S.{_quote(c)}" for c in values)
+        lines += [f"WHEN MATCHED AND ({changed}) THEN", f"  UPDATE SET {assignments}"]
+    lines += [
+        "WHEN NOT MATCHED THEN",
+        f"  INSERT ({', '.join(_quote(c) for c in columns)})",
+        f"  VALUES ({', '.join(f'S.{_quote(c)}' for c in columns)})",
+    ]
+    return "\n".join(lines)
+
+
+def load_schema_json(schema_path: str) -> List[Dict[str, Any]]:
+    """
+    CSVProcessorが出力したスキーマJSONを読み込む
+
+    Args:
+        schema_path: スキーマJSONのパス（{"schema": [...]} 形式、またはスキーマのリスト）
+
+    Returns:
+        List[Dict[str, Any]]: COLUMN_ORIGIN_NAME, DATA_TYPE, COLUMN_AFTER_NAME などを持つ列定義のリスト
+    """
+    with open(schema_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["schema"] if isinstance(data, dict) else data
+
+
+def _normalize_value(value: str, field_type: str) -> str:
+    """値をBigQueryのCSV読み込みで解釈できる表記に変換する"""
+    value = value.strip()
+    if not value:
+        return value
+    if field_type in ("INTEGER", "FLOAT", "NUMERIC", "BIGNUMERIC"):
+        return value.replace(",", "")
+    if field_type in ("DATE", "DATETIME", "TIMESTAMP"):
+        return re.sub(r"^(\d{4})/(\d{1,2})/(\d{1,2})", lambda m: f"{m[1]}-{int(m[2]):02d}-{int(m[3]):02d}", value)
+    return value
+
+
+def prepare_csv(source_path: str, field_types: List[str], encoding: str,
+                output_path: str) -> int:
+    """
+    CSVをBigQueryで読み込める形式に変換する（1行ずつ処理するためメモリ使用量は一定）
+
+    Args:
+        source_path: 元のCSVファイル
+        field_types: 列ごとのBigQueryの型（CSVの列順）
+        encoding: 元のCSVファイルの文字コード
+        output_path: 変換後のCSVファイル（UTF-8）
+
+    Returns:
+        int: 変換したデータ行数
+    """
+    types = [normalize_type(t) for t in field_types]
+    rows = 0
+    with open(source_path, "r", encoding=encoding, newline="") as src, \
+            open(output_path, "w", encoding="utf-8", newline="") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        writer.writerow(header)
+        for row in reader:
+            writer.writerow([
+                _normalize_value(value, types[i]) if i < len(types) else value
+                for i, value in enumerate(row)
+            ])
+            rows += 1
+    return rows
+
+
+def detect_partition_dates(source_path: str, column: str, encoding: str) -> Set[str]:
+    """
+    CSVの日付列に含まれる日付を取得する
+
+    Args:
+        source_path: CSVファイル
+        column: 日付列のヘッダー名
+        encoding: CSVファイルの文字コード
+
+    Returns:
+        Set[str]: YYYY-MM-DD形式の日付（空欄は除く）
+
+    Raises:
+        ValueError: 日付列がない場合
+    """
+    with open(source_path, "r", encoding=encoding, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        if column not in header:
+            raise ValueError(f"日付列 '{column}' がありません: {source_path}")
+        index = header.index(column)
+        return {
+            _normalize_value(row[index], "DATE")
+            for row in reader
+            if index < len(row) and row[index].strip()
+        }
+
+
+class BigQueryLoader:
+    """
+    GCSステージングとロードジョブでBigQueryにデータを投入するクラス
+    """
+
+    def __init__(self, auth: Optional[GoogleCloudAuth] = None, client: Optional[bigquery.Client] = None):
+        """
+        初期化
+
+        Args:
+            auth: GoogleCloudAuth（省略時は GoogleCloudAuth.get_instance()）
+            client: BigQueryクライアント（省略時は auth から取得。テストではフェイクを渡せる）
+        """
+        self.auth = auth or GoogleCloudAuth.get_instance()
+        self._client = client
+        self.staging_prefix = env.get_config_value("BIGQUERY", "staging_prefix", "staging").strip("/")
+        self.write_disposition = env.get_config_value("BIGQUERY", "write_disposition", "WRITE_APPEND")
+        self.job_timeout = float(env.get_config_value("BIGQUERY", "job_timeout", 600))
+        self.location = env.get_config_value("BIGQUERY", "location", "") or None
+        self.csv_encoding = env.get_config_value("CSV_FILES", "DEFAULT_ENCODING", "cp932")
+        self.schema_dir = env.get_config_value("CSV_FILES", "SCHEMA_DIR", "data/csv/schema/")
+        self.partition_field = env.get_config_value("BIGQUERY", "partition_field", "日付")
+        clustering = env.get_config_value("BIGQUERY", "clustering_fields", "")
+        self.clustering_fields = [c.strip() for c in clustering.split(",") if c.strip()]
+        merge_keys = env.get_config_value("BIGQUERY", "merge_key_columns", "")
+        self.merge_key_columns = [c.strip() for c in merge_keys.split(",") if c.strip()]
+        self.merge_staging_suffix = env.get_config_value("BIGQUERY", "merge_staging_suffix", "_staging")
+        self.merge_keep_staging = str(env.get_config_value("BIGQUERY", "merge_keep_staging", "false")).lower() in ("true", "1", "yes")
+        self.keep_staged_files = str(env.get_config_value("BIGQUERY", "keep_staged_files", "false")).lower() in ("true", "1", "yes")
+
+    @property
+    def client(self) -> Optional[bigquery.Client]:
+        """BigQueryクライアント"""
+        if self._client is None:
+            self._client = self.auth.authenticate_bigquery()
+        return self._client
+
+    def find_schema_json(self, file_path: str) -> Optional[str]:
+        """
+        ファイルに対応するCSVProcessorのスキーマJSONを探す
+
+        Args:
+            file_path: データファイルのパス
+
+        Returns:
+            str or None: スキーマJSONのパス。見つからない場合はNone
+        """
+        schema_dir = self.schema_dir
+        if not os.path.isabs(schema_dir):
+            schema_dir = os.path.join(str(env.get_project_root()), schema_dir)
+        candidate = os.path.join(schema_dir, f"{Path(file_path).stem}_schema.json")
+        return candidate if os.path.exists(candidate) else None
+
+    def staging_blob_name(self, file_path: str, table_id: str) -> str:
+        """ステージング先のGCS上のパスを生成する"""
+        return f"{self.staging_prefix}/{table_id}/{datetime.now():%Y%m%d_%H%M%S}/{os.path.basename(file_path)}"
+
+    def table_ref(self, table_id: str, dataset_id: Optional[str] = None) -> str:
+        """完全修飾のテーブルIDを返す"""
+        if table_id.count(".") == 2:
+            return table_id
+        return f"{self.auth.project_id}.{dataset_id or self.auth.dataset_id}.{table_id}"
+
+    def split_table_id(self, table_id: str, dataset_id: Optional[str] = None) -> Tuple[str, str]:
+        """テーブルIDを (データセットID, テーブル名) に分解する"""
+        parts = table_id.split(".")
+        table_name = parts[-1].split("$")[0]
+        if len(parts) >= 2:
+            return parts[-2], table_name
+        return dataset_id or self.auth.dataset_id, table_name
+
+    def check_schema(self, schema: List[Dict[str, Any]], table_id: str,
+                     dataset_id: Optional[str] = None) -> SchemaDrift:
+        """
+        ファイルのスキーマとロード先テーブルのスキーマの差分を確認する
+
+        Args:
+            schema: CSVProcessorが出力した列定義のリスト
+            table_id: ロード先のテーブルID
+            dataset_id: データセットID
+
+        Returns:
+            SchemaDrift: 差分（テーブルがない場合は table_exists=False）
+        """
+        dataset, table_name = self.split_table_id(table_id, dataset_id)
+        drift = diff_schema(translate_schema(schema), self.auth.get_table_schema(table_name, dataset))
+        if drift.has_drift:
+            level = logger.error if drift.breaking else logger.info
+            level(f"スキーマの差分を検出しました ({dataset}.{table_name}): {drift.describe()}")
+        return drift
+
+    def build_job_config(self, source_format: str, drift: Optional[SchemaDrift] = None,
+                         write_disposition: Optional[str] = None, partition_field: Optional[str] = None,
+                         clustering_fields: Optional[List[str]] = None) -> bigquery.LoadJobConfig:
+        """
+        ロードジョブの設定を作成する
+
+        Args:
+            source_format: bigquery.SourceFormat の値
+            drift: check_schema() の戻り値（CSVの場合。Noneの場合はスキーマを自動検出）
+            write_disposition: 書き込みモード（WRITE_APPEND / WRITE_TRUNCATE / WRITE_EMPTY）
+            partition_field: 日付パーティションの列名（テーブルがない場合はこの設定で作成される）
+            clustering_fields: クラスタリングの列名
+
+        Returns:
+            bigquery.LoadJobConfig: ロードジョブの設定
+        """
+        job_config = bigquery.LoadJobConfig(
+            source_format=source_format,
+            write_disposition=write_disposition or self.write_disposition,
+        )
+        if partition_field:
+            job_config.time_partitioning = bigquery.TimePartitioning(
+                type_=bigquery.TimePartitioningType.DAY, field=partition_field
+            )
+            if clustering_fields:
+                job_config.clustering_fields = clustering_fields
+        if source_format == bigquery.SourceFormat.CSV:
+            job_config.skip_leading_rows = 1
+            job_config.encoding = "UTF-8"
+            job_config.allow_quoted_newlines = True
+            if drift:
+                job_config.schema = drift.resolved_fields
+                job_config.allow_jagged_rows = drift.allow_jagged_rows
+                if drift.schema_update_options:
+                    job_config.schema_update_options = drift.schema_update_options
+            else:
+                job_config.autodetect = True
+        return job_config
+
+    def load_file(self, file_path: str, table_id: str, dataset_id: Optional[str] = None,
+                  schema_path: Optional[str] = None, write_disposition: Optional[str] = None,
+                  encoding: Optional[str] = None, partition_field: Optional[str] = None,
+                  clustering_fields: Optional[List[str]] = None,
+                  drift: Optional[SchemaDrift] = None) -> Optional[LoadResult]:
+        """
+        ファイルをGCSにステージングしてBigQueryのテーブルにロードする
+
+        Args:
+            file_path: CSVまたはParquetファイルのパス
+            table_id: ロード先のテーブルID（project.dataset.table 形式も可）
+            dataset_id: データセットID（省略時は環境変数 BIGQUERY_DATASET）
+            schema_path: スキーマJSONのパス（省略時は SCHEMA_DIR から自動検出）
+            write_disposition: 書き込みモード（省略時は設定ファイルの値）
+            encoding: CSVファイルの文字コード（省略時は設定ファイルの DEFAULT_ENCODING）
+            partition_field: 日付パーティションの列名（元のヘッダー名も可）
+            clustering_fields: クラスタリングの列名（元のヘッダー名も可）
+            drift: ロードに使用するスキーマの差分（指定時はロード先のテーブルのスキーマを確認しない）
+
+        Returns:
+            LoadResult or None: ロード結果。ロードジョブを開始できなかった場合はNone
+        """
+        source_format = SOURCE_FORMATS.get(Path(file_path).suffix.lower())
+        if source_format is None:
+            logger.error(f"対応していないファイル形式です: {file_path}")
+            return None
+        if not os.path.exists(file_path):
+            logger.error(f"ファイルが見つかりません: {file_path}")
+            return None
+        client = self.client
+        if not client:
+            return None
+
+        prepared_path = None
+        try:
+            upload_path = file_path
+            if source_format == bigquery.SourceFormat.CSV:
+                schema_path = schema_path or self.find_schema_json(file_path)
+                field_types = []
+                if schema_path:
+                    schema = load_schema_json(schema_path)
+                    drift = drift or self.check_schema(schema, table_id, dataset_id)
+                    if drift.breaking:
+                        logger.error(f"テーブルのスキーマと互換性がないためロードを中止します: {file_path}")
+                        return None
+                    field_types = [f.field_type for f in drift.resolved_fields[:len(schema)]]
+                    if partition_field:
+                        partition_field = self._bigquery_column(schema, partition_field)
+                    clustering_fields = [self._bigquery_column(schema, c) for c in clustering_fields or []]
+                else:
+                    drift = None
+                    logger.warning(f"スキーマJSONが見つからないため、スキーマを自動検出します: {file_path}")
+                fd, prepared_path = tempfile.mkstemp(suffix=".csv", prefix=f"{Path(file_path).stem}_")
+                os.close(fd)
+                rows = prepare_csv(file_path, field_types, encoding or self.csv_encoding, prepared_path)
+                logger.debug(f"CSVをロード用に変換しました: {rows}行")
+                upload_path = prepared_path
+            else:
+                drift = None
+
+            return self._load(upload_path, self.staging_blob_name(file_path, self.split_table_id(table_id)[1]),
+                              self.table_ref(table_id, dataset_id),
+                              self.build_job_config(source_format, drift, write_disposition,
+                                                    partition_field, clustering_fields))
+        except Exception as e:
+            logger.error(f"ロード処理中にエラーが発生しました: {e}")
+            return None
+        finally:
+            if prepared_path and os.path.exists(prepared_path):
+                os.remove(prepared_path)
+
+    def load_daily_partition(self, file_path: str, table_id: str,
+                             partition_date: Optional[Union[str, date]] = None,
+                             dataset_id: Optional[str] = None, schema_path: Optional[str] = None,
+                             encoding: Optional[str] = None) -> Optional[LoadResult]:
+        """
+        日次ファイルを日付パーティションに冪等にロードする
+
+        パーティションデコレータ（table$YYYYMMDD）と WRITE_TRUNCATE を使用するため、
+        同じ日のファイルを再ロードしてもその日のパーティションだけが置き換わる。
+
+        Args:
+            file_path: CSVまたはParquetファイルのパス
+            table_id: ロード先のテーブルID
+            partition_date: パーティションの日付（省略時はCSVの日付列から取得）
+            dataset_id: データセットID
+            schema_path: スキーマJSONのパス
+            encoding: CSVファイルの文字コード
+
+        Returns:
+            LoadResult or None: ロード結果。日付を特定できない場合などはNone
+        """
+        encoding = encoding or self.csv_encoding
+        if partition_date is None:
+            try:
+                dates = detect_partition_dates(file_path, self._source_column(file_path, schema_path), encoding)
+            except Exception as e:
+                logger.error(f"パーティションの日付を取得できませんでした: {e}")
+                return None
+            if len(dates) != 1:
+                logger.error(f"1つのパーティションにロードするには日付が1種類である必要があります: {sorted(dates)}")
+                return None
+            partition_date = dates.pop()
+        if isinstance(partition_date, str):
+            partition_date = datetime.strptime(partition_date, "%Y-%m-%d").date()
+
+        decorated = f"{table_id.split('$')[0]}${partition_date:%Y%m%d}"
+        logger.info(f"パーティション {partition_date:%Y-%m-%d} を置き換えます: {decorated}")
+        return self.load_file(file_path, decorated, dataset_id, schema_path, "WRITE_TRUNCATE", encoding,
+                              partition_field=self.partition_field, clustering_fields=self.clustering_fields)
+
+    def upsert_file(self, file_path: str, table_id: str, key_columns: Optional[List[str]] = None,
+                    dataset_id: Optional[str] = None, schema_path: Optional[str] = None,
+                    encoding: Optional[str] = None) -> Optional[MergeResult]:
+        """
+        ファイルをステージングテーブルにロードし、業務キーでターゲットテーブルにMERGEする
+
+        後日修正される行を追記すると重複するため、キーが一致する行は更新し、一致しない行は追加する。
+        ターゲットテーブルがない場合はファイルをそのままロードして作成する。
+
+        Args:
+            file_path: CSVファイルのパス
+            table_id: ターゲットのテーブルID
+            key_columns: 業務キーの列名（元のヘッダー名も可。省略時は設定ファイルの merge_key_columns）
+            dataset_id: データセットID
+            schema_path: スキーマJSONのパス（省略時は SCHEMA_DIR から自動検出。MERGEには必須）
+            encoding: CSVファイルの文字コード
+
+        Returns:
+            MergeResult or None: 実行結果。キーやスキーマを特定できない場合などはNone
+        """
+        schema_path = schema_path or self.find_schema_json(file_path)
+        if not schema_path:
+            logger.error(f"MERGEにはスキーマJSONが必要です: {file_path}")
+            return None
+        try:
+            schema = load_schema_json(schema_path)
+        except Exception as e:
+            logger.error(f"スキーマJSONの読み込みに失敗しました: {schema_path} ({e})")
+            return None
+        columns = [f.name for f in translate_schema(schema)]
+        keys = [self._bigquery_column(schema, c) for c in key_columns or self.merge_key_columns]
+        unknown = [k for k in keys if k not in columns]
+        if not keys or unknown:
+            logger.error(f"業務キーの列がファイルにありません: {unknown or '未指定'}")
+            return None
+        client = self.client
+        if not client:
+            return None
+
+        dataset, table_name = self.split_table_id(table_id, dataset_id)
+        target = self.table_ref(table_name, dataset)
+        drift = self.check_schema(schema, table_name, dataset)
+        if drift.breaking:
+            logger.error(f"テーブルのスキーマと互換性がないためMERGEを中止します: {file_path}")
+            return None
+        if not drift.table_exists:
+            logger.info(f"テーブルがないため、ファイルをロードして作成します: {target}")
+            load = self.load_file(file_path, target, schema_path=schema_path, encoding=encoding)
+            if load is None:
+                return None
+            return MergeResult(table=target, job_id=load.job_id, source_rows=load.output_rows,
+                               inserted=load.output_rows if load.success else 0,
+                               slot_millis=load.slot_millis, duration_seconds=load.duration_seconds,
+                               errors=load.errors)
+
+        staging = self.table_ref(f"{table_name}{self.merge_staging_suffix}_{datetime.now():%Y%m%d%H%M%S}", dataset)
+        result = MergeResult(table=target, staging_table=staging)
+        try:
+            # ステージングテーブルはターゲットの型で作成し、MERGEで型が一致するようにする
+            # （列の追加はターゲットに対して行うため、ステージングのロードでは不要）
+            staging_drift = replace(drift, table_exists=False, added=[])
+            load = self.load_file(file_path, staging, schema_path=schema_path,
+                                  write_disposition="WRITE_TRUNCATE", encoding=encoding, drift=staging_drift)
+            if load is None or not load.success:
+                result.errors = load.errors if load else ["ステージングテーブルへのロードに失敗しました"]
+                logger.error(f"ステージングテーブルへのロードに失敗しました: {staging}")
+                return result
+            result.source_rows = load.output_rows
+
+            if drift.added:
+                # ファイルにだけある列をターゲットテーブルに追加してからMERGEする
+                table = client.get_table(target)
+                table.schema = drift.resolved_fields
+                client.update_table(table, ["schema"])
+                self.auth.invalidate_table(target)
+                logger.info(f"ターゲットテーブルに列を追加しました: {', '.join(drift.added)}")
+
+            self._merge(build_merge_sql(target, staging, columns, keys), result)
+            return result
+        except Exception as e:
+            logger.error(f"MERGE処理中にエラーが発生しました: {e}")
+            result.errors = [str(e)]
+            return result
+        finally:
+            if not self.merge_keep_staging:
+                try:
+                    client.delete_table(staging, not_found_ok=True)
+                    self.auth.invalidate_table(staging)
+                except Exception as e:
+                    logger.warning(f"ステージングテーブルの削除に失敗しました: {staging} ({e})")
+
+    def _merge(self, sql: str, result: MergeResult) -> None:
+        """MERGE文を実行し、DMLの統計情報を結果に反映する"""
+        start_time = time.time()
+        job = self.client.query(sql, location=self.location)
+        result.job_id = job.job_id
+        logger.info(f"MERGEを開始しました: {job.job_id} ({result.staging_table} -> {result.table})")
+        try:
+            job.result(timeout=self.job_timeout)
+        except Exception as e:
+            result.errors = list(getattr(job, "errors", None) or [str(e)])
+        stats = getattr(job, "dml_stats", None)
+        if stats is not None:
+            result.inserted = int(stats.inserted_row_count or 0)
+            result.updated = int(stats.updated_row_count or 0)
+        result.bytes_processed = int(getattr(job, "total_bytes_processed", None) or 0)
+        result.slot_millis = int(getattr(job, "slot_millis", None) or 0)
+        started, ended = getattr(job, "started", None), getattr(job, "ended", None)
+        result.duration_seconds = (ended - started).total_seconds() if started and ended else time.time() - start_time
+
+        if result.success:
+            logger.info(
+                f"MERGEが完了しました: {result.table} (追加 {result.inserted}行, 更新 {result.updated}行, "
+                f"変更なし {result.unchanged}行, {result.duration_seconds:.1f}秒)"
+            )
+        else:
+            logger.error(f"MERGEが失敗しました: {result.table} {result.errors}")
+
+    def _source_column(self, file_path: str, schema_path: Optional[str]) -> str:
+        """パーティション列のCSV上のヘッダー名を返す（COLUMN_AFTER_NAMEで指定された場合も考慮）"""
+        schema_path = schema_path or self.find_schema_json(file_path)
+        if schema_path:
+            for column in load_schema_json(schema_path):
+                if self.partition_field in (column.get("COLUMN_AFTER_NAME"), column["COLUMN_ORIGIN_NAME"]):
+                    return column["COLUMN_ORIGIN_NAME"]
+        return self.partition_field
+
+    @staticmethod
+    def _bigquery_column(schema: List[Dict[str, Any]], name: str) -> str:
+        """元のヘッダー名をBigQuery上の列名に変換する（該当しない場合はそのまま）"""
+        for column, schema_field in zip(schema, translate_schema(schema)):
+            if name in (column.get("COLUMN_AFTER_NAME"), column["COLUMN_ORIGIN_NAME"]):
+                return schema_field.name
+        return name
+
+    def _load(self, upload_path: str, blob_name: str, destination: str,
+              job_config: bigquery.LoadJobConfig) -> Optional[LoadResult]:
+        """ステージングとロードジョブの実行"""
+        blob = self.auth.upload_file(upload_path, blob_name)
+        if blob is None:
+            logger.error(f"GCSへのステージングに失敗しました: {upload_path}")
+            return None
+        source_uri = f"gs://{self.auth.bucket_name}/{blob_name}"
+
+        start_time = time.time()
+        job = self.client.load_table_from_uri(source_uri, destination, job_config=job_config,
+                                              location=self.location)
+        logger.info(f"ロードジョブを開始しました: {job.job_id} ({source_uri} -> {destination})")
+        result = LoadResult(table=destination, source_uri=source_uri, job_id=job.job_id)
+        try:
+            job.result(timeout=self.job_timeout)
+        except Exception as e:
+            result.errors = list(getattr(job, "errors", None) or [str(e)])
+        finally:
+            # テーブルの作成や列の追加が行われるため、キャッシュしたスキーマを破棄する
+            self.auth.invalidate_table(destination)
+            self._delete_staged_blob(blob, job)
+        self._fill_statistics(result, job, time.time() - start_time)
+
+        if result.success:
+            logger.info(
+                f"ロードが完了しました: {destination} ({result.output_rows}行, {result.output_bytes}バイト, "
+                f"スロット時間 {result.slot_millis}ms, {result.duration_seconds:.1f}秒)"
+            )
+        else:
+            logger.error(f"ロードジョブが失敗しました: {destination} {result.errors}")
+        return result
+
+    def _delete_staged_blob(self, blob: Any, job: Any) -> None:
+        """
+        ロードジョブが終了したステージングファイルを削除する
+
+        keep_staged_files が有効な場合と、ジョブが終了していない（待機がタイムアウトした）場合は残す
+        """
+        if self.keep_staged_files:
+            return
+        if getattr(job, "state", None) != "DONE":
+            logger.warning(f"ロードジョブが終了していないため、ステージングファイルを残します: {blob.name}")
+            return
+        try:
+            blob.delete()
+            logger.debug(f"ステージングファイルを削除しました: {blob.name}")
+        except Exception as e:
+            logger.warning(f"ステージングファイルの削除に失敗しました: {blob.name} ({e})")
+
+    @staticmethod
+    def _fill_statistics(result: LoadResult, job: Any, elapsed: float) -> None:
+        """ジョブの統計情報をロード結果に反映する"""
+        result.state = getattr(job, "state", "") or ""
+        result.output_rows = int(getattr(job, "output_rows", None) or 0)
+        result.output_bytes = int(getattr(job, "output_bytes", None) or 0)
+        result.input_bytes = int(getattr(job, "input_file_bytes", None) or 0)
+        result.slot_millis = int(getattr(job, "slot_millis", None) or 0)
+        started, ended = getattr(job, "started", None), getattr(job, "ended", None)
+        result.duration_seconds = (ended - started).total_seconds() if started and ended else elapsed
+        if not result.errors and getattr(job, "error_result", None):
+            result.errors = list(getattr(job, "errors", None) or [job.error_result])
+
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="CSV/ParquetファイルをBigQueryにロード")
+    parser.add_argument("file", help="ロードするファイル")
+    parser.add_argument("--table", help="ロード先のテーブルID", required=True)
+    parser.add_argument("--dataset", help="データセットID", default=None)
+    parser.add_argument("--schema", help="スキーマJSONのパス", default=None)
+    parser.add_argument("--write-disposition", help="書き込みモード", default=None,
+                        choices=["WRITE_APPEND", "WRITE_TRUNCATE", "WRITE_EMPTY"])
+    parser.add_argument("--encoding", help="CSVファイルの文字コード", default=None)
+    parser.add_argument("--daily", help="日付パーティションを置き換えてロード", action="store_true")
+    parser.add_argument("--partition-date", help="パーティションの日付（YYYY-MM-DD。省略時はCSVの日付列）", default=None)
+    parser.add_argument("--check-schema", help="ロードせずにテーブルとのスキーマ差分のみを表示", action="store_true")
+    parser.add_argument("--upsert", help="ステージングテーブル経由で業務キーによりMERGE", action="store_true")
+    parser.add_argument("--key", help="MERGEの業務キー（カンマ区切り。省略時は設定ファイルの値）", default=None)
+    return parser.parse_args()
+
+
+def main():
+    """メイン処理"""
+    args = parse_args()
+    loader = BigQueryLoader()
+    if args.check_schema:
+        schema_path = args.schema or loader.find_schema_json(args.file)
+        if not schema_path:
+            logger.error(f"スキーマJSONが見つかりません: {args.file}")
+            return 1
+        drift = loader.check_schema(load_schema_json(schema_path), args.table, args.dataset)
+        print(drift.describe())
+        return 1 if drift.breaking else 0
+
+    if args.upsert:
+        keys = [c.strip() for c in args.key.split(",") if c.strip()] if args.key else None
+        result = loader.upsert_file(args.file, args.table, keys, args.dataset, args.schema, args.encoding)
+    elif args.daily:
+        result = loader.load_daily_partition(args.file, args.table, args.partition_date, args.dataset,
+                                             args.schema, args.encoding)
+    else:
+        result = loader.load_file(args.file, args.table, args.dataset, args.schema,
+                                  args.write_disposition, args.encoding)
+    if result is None:
+        return 1
+    print(json.dumps(result.as_dict(), ensure_ascii=False, indent=2, default=str))
+    return 0 if result.success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CSVProcessorのスキーマとBigQueryスキーマの変換・差分検出
+
+CSVProcessor.generate_schema が出力した列定義（DATA_TYPE, COLUMN_AFTER_NAME など）を
+bigquery.SchemaField に変換し、ロード先テーブルの現在のスキーマと比較します。
+
+差分の分類:
+- 互換（compatible）: NULL許容の列の追加、既存列の型で読み込める値（INTEGER → FLOAT/STRING など）、
+  ファイルにないNULL許容の既存列（末尾の列として扱い、NULLで読み込む）
+- 非互換（breaking）: ファイルにないREQUIRED列、読み込めない型への変更
+
+互換の差分はロードジョブの schema_update_options で自動的に反映できます。
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.cloud import bigquery
+
+# CSVProcessorのデータ型とBigQueryの型の対応
+BIGQUERY_TYPE_MAP = {
+    "STR": "STRING",
+    "INT": "INTEGER",
+    "FLOAT": "FLOAT",
+    "DATE": "DATE",
+    "TIMESTAMP": "TIMESTAMP",
+    "BOOLEAN": "BOOLEAN",
+}
+
+# 型名の別名（APIはレガシーSQLとGoogleSQLのどちらの名前も返すことがある）
+TYPE_ALIASES = {
+    "INT64": "INTEGER",
+    "FLOAT64": "FLOAT",
+    "BOOL": "BOOLEAN",
+}
+
+# ファイル側の型の値をそのまま読み込めるテーブル側の型
+COERCIBLE_TYPES = {
+    "INTEGER": {"FLOAT", "NUMERIC", "BIGNUMERIC", "STRING"},
+    "FLOAT": {"NUMERIC", "BIGNUMERIC", "STRING"},
+    "BOOLEAN": {"STRING"},
+    "DATE": {"DATETIME", "TIMESTAMP", "STRING"},
+    "TIMESTAMP": {"DATETIME", "STRING"},
+}
+
+# BigQueryの列名の最大長
+MAX_COLUMN_NAME_LENGTH = 300
+
+
+def sanitize_column_name(name: str) -> str:
+    """
+    BigQueryで使用できる列名に変換する
+
+    日本語などの文字はそのまま残し、記号と空白は "_" に置き換える。
+
+    Args:
+        name: 元の列名
+
+    Returns:
+        str: 変換後の列名
+    """
+    sanitized = re.sub(r"[^\w]+", "_", name.strip()).strip("_")
+    if not sanitized:
+        sanitized = "column"
+    if sanitized[0].isdigit():
+        sanitized = f"_{sanitized}"
+    return sanitized[:MAX_COLUMN_NAME_LENGTH]
+
+
+def normalize_type(field_type: str) -> str:
+    """型名を正規化する"""
+    field_type = (field_type or "STRING").upper()
+    return TYPE_ALIASES.get(field_type, field_type)
+
+
+def translate_schema(schema: List[Dict[str, Any]]) -> List[bigquery.SchemaField]:
+    """
+    CSVProcessorのスキーマをBigQueryのスキーマに変換する
+
+    列名は COLUMN_AFTER_NAME を優先し、未設定の場合は COLUMN_ORIGIN_NAME を変換して使用する。
+    変換後に重複する列名には連番を付ける。
+
+    Args:
+        schema: CSVProcessorが出力した列定義のリスト
+
+    Returns:
+        List[bigquery.SchemaField]: BigQueryのスキーマ（CSVの列順）
+    """
+    fields = []
+    used = set()
+    for column in schema:
+        name = column.get("COLUMN_AFTER_NAME") or sanitize_column_name(column["COLUMN_ORIGIN_NAME"])
+        unique_name, suffix = name, 2
+        while unique_name.lower() in used:
+            unique_name = f"{name}_{suffix}"
+            suffix += 1
+        used.add(unique_name.lower())
+        fields.append(bigquery.SchemaField(
+            unique_name,
+            BIGQUERY_TYPE_MAP.get(column.get("DATA_TYPE"), "STRING"),
+            mode="NULLABLE",
+            description=column.get("DESCRIPTION") or None,
+        ))
+    return fields
+
+
+@dataclass
+class SchemaDrift:
+    """ファイルのスキーマとテーブルのスキーマの差分"""
+    table_exists: bool = True
+    added: List[str] = field(default_factory=list)
+    coerced: List[Tuple[str, str, str]] = field(default_factory=list)
+    filled: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    type_changes: List[Tuple[str, str, str]] = field(default_factory=list)
+    resolved_fields: List[bigquery.SchemaField] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        """差分があるかどうか"""
+        return bool(self.added or self.coerced or self.filled or self.missing or self.type_changes)
+
+    @property
+    def breaking(self) -> bool:
+        """ロードジョブで自動的に反映できない差分があるかどうか"""
+        return bool(self.missing or self.type_changes)
+
+    @property
+    def schema_update_options(self) -> List[str]:
+        """差分の反映に必要なロードジョブの schema_update_options"""
+        return [bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION] if self.added else []
+
+    @property
+    def allow_jagged_rows(self) -> bool:
+        """ファイルにない列をNULLで読み込む必要があるかどうか"""
+        return bool(self.filled)
+
+    def describe(self) -> str:
+        """差分の説明文を返す"""
+        parts = []
+        if self.added:
+            parts.append(f"追加: {', '.join(self.added)}")
+        if self.coerced:
+            parts.append("既存の型で読み込み: " + ", ".join(f"{n} ({a} → {b})" for n, a, b in self.coerced))
+        if self.filled:
+            parts.append(f"NULLで読み込む列: {', '.join(self.filled)}")
+        if self.missing:
+            parts.append(f"ファイルにないREQUIRED列: {', '.join(self.missing)}")
+        if self.type_changes:
+            parts.append("型の変更: " + ", ".join(f"{n} ({a} → {b})" for n, a, b in self.type_changes))
+        return " / ".join(parts) if parts else "差分なし"
+
+
+def diff_schema(expected: List[bigquery.SchemaField],
+                actual: Optional[List[bigquery.SchemaField]]) -> SchemaDrift:
+    """
+    ファイルのスキーマとテーブルのスキーマを比較する
+
+    Args:
+        expected: translate_schema() で作成したファイルのスキーマ
+        actual: テーブルの現在のスキーマ（テーブルがない場合はNone）
+
+    Returns:
+        SchemaDrift: 差分。resolved_fields はロードジョブに指定するスキーマ
+    """
+    if actual is None:
+        return SchemaDrift(table_exists=False, resolved_fields=list(expected))
+
+    drift = SchemaDrift()
+    current = {f.name.lower(): f for f in actual}
+    expected_names = {f.name.lower() for f in expected}
+
+    for file_field in expected:
+        table_field = current.get(file_field.name.lower())
+        if table_field is None:
+            drift.added.append(file_field.name)
+            drift.resolved_fields.append(file_field)
+            continue
+
+        file_type = normalize_type(file_field.field_type)
+        table_type = normalize_type(table_field.field_type)
+        if file_type != table_type:
+            if table_type in COERCIBLE_TYPES.get(file_type, set()):
+                drift.coerced.append((table_field.name, file_type, table_type))
+            else:
+                drift.type_changes.append((table_field.name, table_type, file_type))
+
+        # 既存列はテーブルの定義（列名の大文字小文字・型・モード）に合わせる
+        drift.resolved_fields.append(bigquery.SchemaField(
+            table_field.name, table_field.field_type, mode=table_field.mode or "NULLABLE",
+            description=table_field.description,
+        ))
+
+    # ファイルにない既存列は、NULL許容であればCSVの末尾の列としてNULLで読み込む
+    for table_field in actual:
+        if table_field.name.lower() in expected_names:
+            continue
+        if (table_field.mode or "NULLABLE") == "REQUIRED":
+            drift.missing.append(table_field.name)
+        else:
+            drift.filled.append(table_field.name)
+            drift.resolved_fields.append(table_field)
+    return drift
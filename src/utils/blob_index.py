@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+アップロード済みGCSオブジェクトのローカルインデックス
+
+バックフィルで「この日次ファイルはアップロード済みか」をGCSに問い合わせずに
+確認するためのモジュールです。インデックスはJSONファイルに保存し、
+GCSの一覧（取得項目を絞ったページ単位の取得）から作り直すこともできます。
+
+使用例:
+    index = BlobIndex()
+    index.refresh(GoogleCloudAuth.get_instance(), prefix="daily/")
+    if not index.exists("my-bucket", "daily/20250401.csv"):
+        ...
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.utils.logging_config import get_logger
+from src.utils.environment import env
+
+logger = get_logger(__name__)
+
+# refresh() で取得するBlobの項目
+INDEX_FIELDS = "name,size,crc32c,updated"
+
+
+class BlobIndex:
+    """
+    バケットごとのオブジェクト名とサイズを保持するインデックス
+
+    複数スレッドから record() を呼び出せる。変更は save() を呼ぶまでファイルに書き込まれない。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初期化（ファイルがあれば読み込む）
+
+        Args:
+            path: インデックスファイルのパス（省略時は settings.ini の [GCS] index_path）
+        """
+        path = path or env.get_config_value("GCS", "index_path", "data/gcs_index.json")
+        self.path = path if os.path.isabs(path) else str(env.get_project_root() / path)
+        self._objects: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """インデックスファイルを読み込む（存在しない・読み込めない場合は空のインデックス）"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._objects = data.get("buckets", {})
+                self._dirty = False
+            logger.debug(f"GCSインデックスを読み込みました: {self.path} ({len(self)}件)")
+        except Exception as e:
+            logger.warning(f"GCSインデックスの読み込みに失敗しました: {self.path} ({e})")
+
+    def save(self) -> bool:
+        """
+        インデックスをファイルに保存する（変更がない場合は何もしない）
+
+        Returns:
+            bool: 保存に成功した（または変更がなかった）場合はTrue
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            data = {"updated": datetime.now().isoformat(timespec="seconds"), "buckets": self._objects}
+            temp_path = f"{self.path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                # 書き込み途中で中断されてもインデックスが壊れないように置き換える
+                os.replace(temp_path, self.path)
+                self._dirty = False
+                return True
+            except Exception as e:
+                logger.error(f"GCSインデックスの保存に失敗しました: {self.path} ({e})")
+                return False
+
+    def record(self, bucket_name: str, name: str, size: int, crc32c: Optional[str] = None) -> None:
+        """アップロードしたオブジェクトを追加する"""
+        entry = {"size": size, "recorded": datetime.now().isoformat(timespec="seconds")}
+        if crc32c:
+            entry["crc32c"] = crc32c
+        with self._lock:
+            self._objects.setdefault(bucket_name, {})[name] = entry
+            self._dirty = True
+
+    def discard(self, bucket_name: str, name: str) -> None:
+        """削除したオブジェクトを除外する"""
+        with self._lock:
+            if self._objects.get(bucket_name, {}).pop(name, None) is not None:
+                self._dirty = True
+
+    def exists(self, bucket_name: str, name: str, size: Optional[int] = None) -> bool:
+        """
+        オブジェクトがインデックスにあるか確認する
+
+        Args:
+            bucket_name: バケット名
+            name: オブジェクト名
+            size: 指定した場合はサイズも一致することを確認する
+        """
+        entry = self._objects.get(bucket_name, {}).get(name)
+        return entry is not None and (size is None or entry.get("size") == size)
+
+    def names(self, bucket_name: str, prefix: str = "") -> List[str]:
+        """プレフィックスに一致するオブジェクト名の一覧"""
+        with self._lock:
+            return sorted(name for name in self._objects.get(bucket_name, {}) if name.startswith(prefix))
+
+    def refresh(self, auth: Any, prefix: str = "", bucket_name: Optional[str] = None) -> int:
+        """
+        GCSの一覧からインデックスを更新する
+
+        一覧に含まれるオブジェクトを追加・更新する。GCSから削除されたオブジェクトは
+        取得が途中で失敗した場合と区別できないため、discard() で除外する。
+
+        Args:
+            auth: GoogleCloudAuth
+            prefix: 対象のプレフィックス
+            bucket_name: バケット名（省略時は auth.bucket_name）
+
+        Returns:
+            int: 追加・更新した件数
+        """
+        bucket_name = bucket_name or auth.bucket_name
+        count = 0
+        for blob in auth.iter_blobs(prefix, bucket_name, fields=INDEX_FIELDS):
+            entry = {"size": blob.size, "crc32c": blob.crc32c}
+            if blob.updated is not None:
+                entry["recorded"] = blob.updated.isoformat(timespec="seconds")
+            with self._lock:
+                self._objects.setdefault(bucket_name, {})[blob.name] = entry
+                self._dirty = True
+            count += 1
+        logger.info(f"GCSインデックスを更新しました: {bucket_name}/{prefix} ({count}件)")
+        return count
+
+    def __len__(self) -> int:
+        return sum(len(objects) for objects in self._objects.values())
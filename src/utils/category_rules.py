@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+ルールテーブルによる要素カテゴリー判定
+
+config/category_rules.yaml（またはJSON）に定義したルールを一度だけコンパイルし、
+メモリ上の要素情報（タグ・テキスト・クラスなど）からカテゴリーを判定します。
+
+コンパイル時に次の構造を作成するため、要素1件あたりの判定はブラウザに問い合わせずに行えます。
+- フィールドごとのキーワードをまとめたAho-Corasickオートマトン（部分一致を1回の走査で判定）
+- 完全一致条件の (フィールド, 値) インデックス
+- 正規表現のプリコンパイル
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# PyYAMLのインポート（可能であれば）
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+# デフォルトのルールファイル
+DEFAULT_RULES_PATH = os.path.join("config", "category_rules.yaml")
+
+# 数値比較の演算子
+NUMERIC_OPERATORS = {
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+}
+
+# 位置情報から取り出す数値フィールド
+LOCATION_FIELDS = {"location_x": "x", "location_y": "y"}
+
+
+class KeywordAutomaton:
+    """
+    複数キーワードの部分一致を1回の走査で検出するAho-Corasickオートマトン
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        オートマトンを構築する
+
+        Args:
+            keywords: 検出するキーワード（小文字で比較する）
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[str]] = [set()]
+        for keyword in keywords:
+            self._add(keyword.lower())
+        self._build()
+
+    def _add(self, keyword: str) -> None:
+        """キーワードをトライ木に追加する"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            state = next_state
+        if keyword:
+            self._output[state].add(keyword)
+
+    def _build(self) -> None:
+        """失敗遷移を幅優先で計算する"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """
+        テキストに含まれるキーワードを返す
+
+        Args:
+            text: 検索対象のテキスト
+
+        Returns:
+            Set[str]: 含まれていたキーワード
+        """
+        found: Set[str] = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found |= self._output[state]
+        return found
+
+
+class _Context:
+    """1要素分の判定用データ（キーワード検出結果などを遅延計算して保持する）"""
+
+    __slots__ = ("fields", "matcher", "_keywords", "_location")
+
+    def __init__(self, fields: Dict[str, Any], matcher: "CategoryMatcher"):
+        self.fields = fields
+        self.matcher = matcher
+        self._keywords: Dict[str, Set[str]] = {}
+        self._location = None
+
+    def text(self, field: str) -> str:
+        value = self.fields.get(field)
+        return "" if value is None else str(value)
+
+    def keywords(self, field: str) -> Set[str]:
+        found = self._keywords.get(field)
+        if found is None:
+            automaton = self.matcher.automata.get(field)
+            found = automaton.find(self.text(field)) if automaton else set()
+            self._keywords[field] = found
+        return found
+
+    def number(self, field: str) -> Optional[float]:
+        if field in LOCATION_FIELDS:
+            if self._location is None:
+                location = self.fields.get("location")
+                # 位置情報は必要になった時点で取得する（WebElement.location などを渡せるように）
+                if callable(location):
+                    try:
+                        location = location()
+                    except Exception:
+                        location = None
+                self._location = location or {}
+            if not self._location:
+                return None
+            return float(self._location.get(LOCATION_FIELDS[field], 0) or 0)
+        value = self.fields.get(field)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+
+class CategoryMatcher:
+    """
+    コンパイル済みのカテゴリー判定ルール
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]], default: str = "その他"):
+        """
+        ルールをコンパイルする
+
+        Args:
+            rules: {"category": ..., "when": 条件} のリスト（先頭から順に評価）
+            default: どのルールにも一致しない場合のカテゴリー
+        """
+        self.default = default
+        self._keywords: Dict[str, Set[str]] = {}
+        self._equals_index: Dict[Tuple[str, str], Set[int]] = {}
+        self._equals_fields: Set[str] = set()
+        self._equals_count = 0
+        self._rules: List[Tuple[str, Callable[[_Context], bool]]] = []
+        for rule in rules:
+            self._rules.append((rule["category"], self._compile(rule["when"])))
+        self.automata = {field: KeywordAutomaton(words) for field, words in self._keywords.items()}
+
+    def _compile(self, condition: Dict[str, Any]) -> Callable[[_Context], bool]:
+        """条件を判定関数にコンパイルする"""
+        if "any" in condition:
+            parts = [self._compile(c) for c in condition["any"]]
+            return lambda ctx: any(part(ctx) for part in parts)
+        if "all" in condition:
+            parts = [self._compile(c) for c in condition["all"]]
+            return lambda ctx: all(part(ctx) for part in parts)
+
+        field = condition["field"]
+        if "contains" in condition:
+            words = frozenset(str(w).lower() for w in _as_list(condition["contains"]))
+            self._keywords.setdefault(field, set()).update(words)
+            return lambda ctx: not words.isdisjoint(ctx.keywords(field))
+        if "equals" in condition:
+            # 条件ごとのIDをインデックスに登録し、判定は (フィールド, 値) の引き当てで行う
+            condition_id = self._equals_count
+            self._equals_count += 1
+            for value in _as_list(condition["equals"]):
+                self._equals_index.setdefault((field, str(value).lower()), set()).add(condition_id)
+            self._equals_fields.add(field)
+            return lambda ctx: condition_id in self._equality_hits(ctx)
+        if "regex" in condition:
+            pattern = re.compile(condition["regex"], re.IGNORECASE)
+            return lambda ctx: pattern.search(ctx.text(field)) is not None
+        for op, compare in NUMERIC_OPERATORS.items():
+            if op in condition:
+                threshold = float(condition[op])
+                return lambda ctx, compare=compare: _compare_number(ctx.number(field), threshold, compare)
+        raise ValueError(f"不正なカテゴリー条件です: {condition}")
+
+    def _equality_hits(self, ctx: _Context) -> Set[int]:
+        """要素の (フィールド, 値) に一致する完全一致条件のIDを返す（要素ごとに1回だけ計算）"""
+        hits = ctx._keywords.get("__equals__")
+        if hits is None:
+            hits = set()
+            for field in self._equals_fields:
+                hits |= self._equals_index.get((field, ctx.text(field).lower()), set())
+            ctx._keywords["__equals__"] = hits
+        return hits
+
+    def categorize(self, fields: Dict[str, Any]) -> str:
+        """
+        要素のカテゴリーを判定する
+
+        Args:
+            fields: tag, text, id, class などの辞書。location は辞書または辞書を返す関数
+
+        Returns:
+            str: カテゴリー
+        """
+        ctx = _Context(fields, self)
+        for category, predicate in self._rules:
+            if predicate(ctx):
+                return category
+        return self.default
+
+
+def _as_list(value: Any) -> List[Any]:
+    """単一の値をリストにそろえる"""
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _compare_number(value: Optional[float], threshold: float, compare: Callable[[float, float], bool]) -> bool:
+    """数値が取得できた場合のみ比較する"""
+    return value is not None and compare(value, threshold)
+
+
+def load_rule_sets(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    ルールファイルを読み込む
+
+    Args:
+        path: YAMLまたはJSONのルールファイル
+
+    Returns:
+        Dict[str, Dict[str, Any]]: ルールセット名ごとの {"default", "rules"}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if not YAML_AVAILABLE:
+                raise ImportError("YAMLのルールファイルを読み込むにはPyYAMLが必要です")
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+
+_matcher_cache: Dict[Tuple[str, str], Tuple[float, CategoryMatcher]] = {}
+_matcher_lock = threading.Lock()
+
+
+def get_category_matcher(rule_set: str, path: Optional[str] = None,
+                         logger: Optional[logging.Logger] = None) -> Optional[CategoryMatcher]:
+    """
+    コンパイル済みのルールセットを取得する（ファイルの更新日時が変わるまで再利用する）
+
+    Args:
+        rule_set: ルールセット名（例: "page_analyzer"）
+        path: ルールファイル（省略時は config/category_rules.yaml）
+        logger: ロガー
+
+    Returns:
+        CategoryMatcher or None: 読み込みに失敗した場合はNone
+    """
+    logger = logger or logging.getLogger(__name__)
+    path = path or DEFAULT_RULES_PATH
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), path)
+    try:
+        mtime = os.path.getmtime(path)
+        with _matcher_lock:
+            cached = _matcher_cache.get((path, rule_set))
+            if cached and cached[0] == mtime:
+                return cached[1]
+            definition = load_rule_sets(path)[rule_set]
+            matcher = CategoryMatcher(definition.get("rules") or [], definition.get("default", "その他"))
+            _matcher_cache[(path, rule_set)] = (mtime, matcher)
+            logger.debug(f"カテゴリー判定ルールを読み込みました: {rule_set} ({len(matcher._rules)}件)")
+            return matcher
+    except Exception as e:
+        logger.error(f"カテゴリー判定ルールの読み込みに失敗しました: {path} [{rule_set}] ({e})")
+        return None
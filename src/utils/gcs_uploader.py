@@ -0,0 +1,560 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+GCSへの並列・再開可能アップロード
+
+バックフィルなどで大量・大容量のレポートファイルをGCSにアップロードするためのモジュールです。
+
+- 再開可能アップロード（チャンクサイズは設定可能）で、失敗したチャンクはサーバー側の
+  受信済み位置から再送する
+- 複数ファイルをスレッドプールで同時にアップロード
+- 大きなファイルは分割して並列にアップロードし、compose で1つのオブジェクトに結合
+- CRC32C（またはMD5）で内容を検証
+- gzip圧縮モードでは一時ファイルを作らずに読み込みながら圧縮して送信し、
+  Content-Encoding: gzip を設定（BigQueryのロードジョブはそのまま読み込める）
+- ファイルごとに転送量・所要時間・スループット・リトライ回数・圧縮率を UploadReport として返却
+- BlobIndex を指定するとアップロード済みのオブジェクトを記録し、バックフィルの再実行時にスキップできる
+
+使用例:
+$ python -m src.utils.gcs_uploader data/downloads/*.csv --prefix backfill/
+$ python -m src.utils.gcs_uploader data/downloads/*.csv --prefix backfill/ --gzip
+$ python -m src.utils.gcs_uploader data/downloads/*.csv --prefix backfill/ --skip-existing --refresh-index
+"""
+
+import io
+import os
+import sys
+import math
+import time
+import zlib
+import base64
+import argparse
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+import google_crc32c
+from google import resumable_media
+from google.resumable_media import common
+from google.resumable_media.requests import ResumableUpload
+
+from src.utils.logging_config import get_logger
+from src.utils.environment import env
+from src.utils.bigquery import GoogleCloudAuth
+from src.utils.blob_index import BlobIndex
+
+logger = get_logger(__name__)
+
+# 再開可能アップロードの開始URL
+UPLOAD_URL_TEMPLATE = "https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o?uploadType=resumable"
+
+# チャンクサイズの単位（GCSの再開可能アップロードは256KiBの倍数が必要）
+CHUNK_ALIGNMENT = 256 * 1024
+
+# composeで結合できるオブジェクト数の上限
+MAX_COMPOSE_SOURCES = 32
+
+# 再送するHTTPステータス
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class UploadReport:
+    """ファイルごとのアップロード結果"""
+    source: str
+    blob_name: str
+    size: int = 0
+    seconds: float = 0.0
+    retries: int = 0
+    parts: int = 1
+    checksum: str = ""
+    compressed: bool = False
+    transferred: int = 0
+    skipped: bool = False
+    success: bool = False
+    error: str = ""
+
+    @property
+    def throughput_mb_s(self) -> float:
+        """元のファイルサイズで換算したスループット（MB/秒）"""
+        return self.size / 1024 / 1024 / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """圧縮率（元のサイズ / 転送したサイズ）"""
+        return self.size / self.transferred if self.transferred else 1.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """辞書形式で返す"""
+        return {
+            "source": self.source,
+            "blob_name": self.blob_name,
+            "size": self.size,
+            "seconds": round(self.seconds, 3),
+            "throughput_mb_s": round(self.throughput_mb_s, 2),
+            "retries": self.retries,
+            "parts": self.parts,
+            "checksum": self.checksum,
+            "compressed": self.compressed,
+            "transferred": self.transferred,
+            "compression_ratio": round(self.compression_ratio, 2),
+            "skipped": self.skipped,
+            "success": self.success,
+            "error": self.error,
+        }
+
+
+class _FileSlice(io.RawIOBase):
+    """ファイルの一部分を独立したストリームとして読み込むためのラッパー"""
+
+    def __init__(self, path: str, start: int, length: int):
+        super().__init__()
+        self._file = open(path, "rb")
+        self._start = start
+        self._length = length
+        self._file.seek(start)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._file.tell() - self._start
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence == io.SEEK_END:
+            offset += self._length
+        offset = max(0, min(offset, self._length))
+        self._file.seek(self._start + offset)
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._length - self.tell()
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        return self._file.read(size)
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class GzipReadStream(io.RawIOBase):
+    """
+    ファイルを読み込みながらgzip圧縮した内容を返すストリーム
+
+    圧縮済みのデータは送信が確定した位置（release()）まで保持するため、
+    メモリ使用量はチャンクサイズ程度に収まり、失敗したチャンクの再送にも対応できる。
+    """
+
+    def __init__(self, path: str, block_size: int = 1024 * 1024, level: int = 6):
+        super().__init__()
+        self._source = open(path, "rb")
+        self._block_size = block_size
+        # wbits=31 でgzip形式（ヘッダーとCRC32付き）の出力になる
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        self._buffer = bytearray()
+        self._buffer_start = 0
+        self._position = 0
+        self._eof = False
+        self.raw_bytes = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    @property
+    def compressed_bytes(self) -> int:
+        """これまでに生成した圧縮データのバイト数"""
+        return self._buffer_start + len(self._buffer)
+
+    def _fill(self, end: Optional[int]) -> None:
+        """指定した位置まで圧縮データを生成する（Noneの場合は最後まで）"""
+        while not self._eof and (end is None or self.compressed_bytes < end):
+            block = self._source.read(self._block_size)
+            if block:
+                self.raw_bytes += len(block)
+                self._buffer += self._compressor.compress(block)
+            else:
+                self._buffer += self._compressor.flush()
+                self._eof = True
+
+    def read(self, size: int = -1) -> bytes:
+        self._fill(None if size is None or size < 0 else self._position + size)
+        offset = self._position - self._buffer_start
+        end = len(self._buffer) if size is None or size < 0 else offset + size
+        data = bytes(self._buffer[offset:end])
+        self._position += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("末尾からのシークには対応していません")
+        if offset < self._buffer_start:
+            raise io.UnsupportedOperation(f"送信済みとして破棄した位置にはシークできません: {offset}")
+        self._fill(offset)
+        self._position = min(offset, self.compressed_bytes)
+        return self._position
+
+    def release(self, offset: int) -> None:
+        """送信が確定した位置までの圧縮データを破棄する"""
+        offset = min(offset, self._position)
+        if offset > self._buffer_start:
+            del self._buffer[:offset - self._buffer_start]
+            self._buffer_start = offset
+
+    def close(self) -> None:
+        self._source.close()
+        super().close()
+
+
+def file_crc32c(path: str, block_size: int = 8 * 1024 * 1024) -> str:
+    """ファイルのCRC32CをGCSと同じ形式（ビッグエンディアンのBase64）で返す"""
+    checksum = google_crc32c.Checksum()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            checksum.update(block)
+    return base64.b64encode(checksum.digest()).decode("ascii")
+
+
+def align_chunk_size(size_mb: float) -> int:
+    """チャンクサイズ（MB）を256KiBの倍数のバイト数に切り上げる"""
+    size = int(size_mb * 1024 * 1024)
+    return max(CHUNK_ALIGNMENT, math.ceil(size / CHUNK_ALIGNMENT) * CHUNK_ALIGNMENT)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """チャンクの送信エラーが再送可能かどうか"""
+    if isinstance(error, common.InvalidResponse):
+        return getattr(error.response, "status_code", None) in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class GCSUploader:
+    """
+    GCSへの並列・再開可能アップロードを行うクラス
+    """
+
+    def __init__(self, auth: Optional[GoogleCloudAuth] = None, chunk_size_mb: Optional[float] = None,
+                 max_workers: Optional[int] = None, max_retries: Optional[int] = None,
+                 composite_threshold_mb: Optional[float] = None, composite_parts: Optional[int] = None,
+                 checksum: Optional[str] = None, index: Optional[BlobIndex] = None):
+        """
+        初期化（省略した値は settings.ini の [GCS_UPLOAD] から取得）
+
+        Args:
+            auth: GoogleCloudAuth（省略時は GoogleCloudAuth.get_instance()）
+            chunk_size_mb: 再開可能アップロードのチャンクサイズ（MB）
+            max_workers: 同時にアップロードするファイル数（分割アップロードの同時実行数も兼ねる）
+            max_retries: ファイルごとのリトライ回数の上限
+            composite_threshold_mb: 分割アップロードを行うファイルサイズ（MB、0で無効）
+            composite_parts: 分割アップロードの分割数
+            checksum: 検証に使用するチェックサム（crc32c / md5）
+            index: アップロードしたオブジェクトを記録するインデックス
+        """
+        def setting(key, value, default):
+            return value if value is not None else env.get_config_value("GCS_UPLOAD", key, default)
+
+        self.auth = auth or GoogleCloudAuth.get_instance()
+        self.chunk_size = align_chunk_size(float(setting("chunk_size_mb", chunk_size_mb, 8)))
+        self.max_workers = max(1, int(setting("max_workers", max_workers, 8)))
+        self.max_retries = int(setting("max_retries", max_retries, 5))
+        self.composite_threshold = int(float(setting("composite_threshold_mb", composite_threshold_mb, 256)) * 1024 * 1024)
+        self.composite_parts = min(MAX_COMPOSE_SOURCES, max(2, int(setting("composite_parts", composite_parts, 8))))
+        self.checksum = setting("checksum", checksum, "crc32c") or None
+        self.compress = str(setting("compress", None, "false")).lower() in ("true", "1", "yes")
+        self.index = index
+
+    def upload_file(self, source_file: str, destination_blob_name: str,
+                    bucket_name: Optional[str] = None, content_type: Optional[str] = None,
+                    compress: Optional[bool] = None) -> UploadReport:
+        """
+        ファイルをアップロードする
+
+        Args:
+            source_file: アップロードするファイルのパス
+            destination_blob_name: 保存先のGCS上のパス
+            bucket_name: バケット名（省略時は環境変数 GCS_BUCKET_NAME）
+            content_type: Content-Type（省略時は拡張子から推定）
+            compress: gzip圧縮しながら送信するかどうか（省略時は設定ファイルの値）。
+                      圧縮する場合は分割アップロードを行わない
+
+        Returns:
+            UploadReport: アップロード結果（失敗した場合は success=False と error）
+        """
+        report = self._upload_one(source_file, destination_blob_name, bucket_name, content_type, compress)
+        if self.index is not None and report.success:
+            self.index.save()
+        return report
+
+    def _upload_one(self, source_file: str, destination_blob_name: str, bucket_name: Optional[str],
+                    content_type: Optional[str], compress: Optional[bool]) -> UploadReport:
+        """ファイルを1つアップロードし、インデックスに記録する（インデックスは保存しない）"""
+        bucket_name = bucket_name or self.auth.bucket_name
+        content_type = content_type or mimetypes.guess_type(source_file)[0] or "application/octet-stream"
+        report = UploadReport(source=source_file, blob_name=destination_blob_name)
+        start_time = time.time()
+        try:
+            report.size = os.path.getsize(source_file)
+            if self.compress if compress is None else compress:
+                report.compressed = True
+                report.retries += self._with_verification(destination_blob_name, lambda: self._upload_gzip(
+                    source_file, bucket_name, destination_blob_name, content_type, report
+                ))
+                report.checksum = self.checksum or ""
+            elif self.composite_threshold and report.size >= self.composite_threshold:
+                self._upload_composite(source_file, bucket_name, destination_blob_name, content_type, report)
+                report.transferred = report.size
+            else:
+                report.retries += self._upload_with_verification(
+                    source_file, bucket_name, destination_blob_name, content_type, 0, report.size
+                )
+                report.checksum = self.checksum or ""
+                report.transferred = report.size
+            report.success = True
+        except Exception as e:
+            report.error = str(e)
+            logger.error(f"ファイルアップロード中にエラーが発生しました: {source_file} ({e})")
+        report.seconds = time.time() - start_time
+
+        if report.success:
+            logger.info(
+                f"ファイル '{source_file}' を '{bucket_name}/{destination_blob_name}' にアップロードしました "
+                f"({report.size / 1024 / 1024:.1f}MB, {report.throughput_mb_s:.1f}MB/秒, "
+                f"分割数 {report.parts}, リトライ {report.retries}回"
+                + (f", 圧縮率 {report.compression_ratio:.1f}倍)" if report.compressed else ")")
+            )
+            if self.index is not None:
+                self.index.record(bucket_name, destination_blob_name, report.transferred)
+        return report
+
+    def upload_many(self, files: Sequence[Tuple[str, str]], bucket_name: Optional[str] = None,
+                    compress: Optional[bool] = None, skip_existing: bool = False) -> List[UploadReport]:
+        """
+        複数のファイルを同時にアップロードする
+
+        Args:
+            files: (アップロードするファイルのパス, 保存先のGCS上のパス) のリスト
+            bucket_name: バケット名
+            compress: gzip圧縮しながら送信するかどうか
+            skip_existing: インデックスにあるオブジェクトはアップロードしない（index の指定が必要）
+
+        Returns:
+            List[UploadReport]: ファイルごとのアップロード結果（files と同じ順序）
+        """
+        resolved_bucket = bucket_name or self.auth.bucket_name
+
+        def upload(item: Tuple[str, str]) -> UploadReport:
+            source_file, blob_name = item
+            if skip_existing and self.index is not None and self.index.exists(resolved_bucket, blob_name):
+                return UploadReport(source=source_file, blob_name=blob_name, skipped=True, success=True)
+            return self._upload_one(source_file, blob_name, resolved_bucket, None, compress)
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            reports = list(executor.map(upload, files))
+        if self.index is not None:
+            self.index.save()
+        elapsed = time.time() - start_time
+        total = sum(r.size for r in reports if r.success)
+        failed = sum(1 for r in reports if not r.success)
+        skipped = sum(1 for r in reports if r.skipped)
+        logger.info(
+            f"{len(reports)}件のファイルをアップロードしました "
+            f"(合計 {total / 1024 / 1024:.1f}MB, {total / 1024 / 1024 / elapsed if elapsed else 0:.1f}MB/秒, "
+            f"スキップ {skipped}件, 失敗 {failed}件)"
+        )
+        return reports
+
+    def _upload_with_verification(self, path: str, bucket_name: str, blob_name: str, content_type: str,
+                                  start: int, length: int) -> int:
+        """
+        ファイル（またはその一部）をアップロードし、チェックサムの検証に失敗した場合は最初からアップロードし直す
+
+        Returns:
+            int: リトライ回数
+        """
+        return self._with_verification(blob_name, lambda: self._upload_resumable(
+            path, bucket_name, blob_name, content_type, start, length
+        ))
+
+    def _with_verification(self, blob_name: str, upload: Callable[[], int]) -> int:
+        """
+        チェックサムの検証に失敗した場合は最初からアップロードし直す
+
+        Args:
+            blob_name: 保存先のGCS上のパス（ログ用）
+            upload: アップロードを行い、チャンクのリトライ回数を返す関数
+
+        Returns:
+            int: リトライ回数
+        """
+        retries = 0
+        while True:
+            try:
+                return retries + upload()
+            except resumable_media.DataCorruption:
+                retries += 1
+                logger.warning(f"チェックサムが一致しないため再アップロードします: {blob_name} ({retries}回目)")
+                if retries > self.max_retries:
+                    raise
+
+    def _upload_resumable(self, path: str, bucket_name: str, blob_name: str, content_type: str,
+                          start: int, length: int) -> int:
+        """
+        ファイル（またはその一部）を再開可能アップロードで送信する
+
+        Returns:
+            int: チャンクのリトライ回数
+        """
+        with _FileSlice(path, start, length) as stream:
+            return self._send_stream(stream, bucket_name, {"name": blob_name}, content_type, length)
+
+    def _upload_gzip(self, path: str, bucket_name: str, blob_name: str, content_type: str,
+                     report: UploadReport) -> int:
+        """
+        ファイルを読み込みながらgzip圧縮して送信する（一時ファイルは作成しない）
+
+        Returns:
+            int: チャンクのリトライ回数
+        """
+        metadata = {"name": blob_name, "contentType": content_type, "contentEncoding": "gzip"}
+        with GzipReadStream(path) as stream:
+            retries = self._send_stream(stream, bucket_name, metadata, content_type, None)
+            report.transferred = stream.compressed_bytes
+        return retries
+
+    def _send_stream(self, stream: io.RawIOBase, bucket_name: str, metadata: Dict[str, str],
+                     content_type: str, total_bytes: Optional[int]) -> int:
+        """
+        ストリームを再開可能アップロードで送信する
+
+        Args:
+            stream: 送信するストリーム
+            bucket_name: バケット名
+            metadata: オブジェクトのメタデータ（name など）
+            content_type: Content-Type
+            total_bytes: 送信するバイト数（不明な場合はNone）
+
+        Returns:
+            int: チャンクのリトライ回数
+        """
+        transport = self.auth.get_http_session()
+        if transport is None:
+            raise RuntimeError("GCSの認証に失敗しました")
+        upload = ResumableUpload(UPLOAD_URL_TEMPLATE.format(bucket=bucket_name), self.chunk_size,
+                                 checksum=self.checksum)
+        # 再送はこのクラスで行い、回数を集計する
+        upload._retry_strategy = resumable_media.RetryStrategy(max_retries=0)
+        upload.initiate(transport, stream, metadata, content_type, total_bytes=total_bytes)
+        return self._transmit(upload, transport, stream)
+
+    def _transmit(self, upload: Any, transport: Any, stream: Any = None) -> int:
+        """
+        チャンクを順に送信し、失敗したチャンクは受信済み位置を確認してから再送する
+
+        Args:
+            upload: ResumableUpload
+            transport: 認証済みのHTTPセッション
+            stream: 送信中のストリーム（release() があれば送信が確定した位置を通知する）
+
+        Returns:
+            int: リトライ回数
+        """
+        retries = 0
+        while not upload.finished:
+            try:
+                upload.transmit_next_chunk(transport)
+                if hasattr(stream, "release"):
+                    stream.release(upload.bytes_uploaded)
+            except resumable_media.DataCorruption:
+                raise
+            except Exception as e:
+                if not _is_retryable(e) or retries >= self.max_retries:
+                    raise
+                retries += 1
+                wait = min(2 ** retries, 30)
+                logger.warning(f"チャンクの送信に失敗しました。{wait}秒後に再送します ({retries}回目): {e}")
+                time.sleep(wait)
+                upload.recover(transport)
+        return retries
+
+    def _upload_composite(self, path: str, bucket_name: str, blob_name: str, content_type: str,
+                          report: UploadReport) -> None:
+        """ファイルを分割して並列にアップロードし、composeで結合する"""
+        part_size = math.ceil(report.size / self.composite_parts / CHUNK_ALIGNMENT) * CHUNK_ALIGNMENT
+        ranges = [(offset, min(part_size, report.size - offset)) for offset in range(0, report.size, part_size)]
+        part_names = [f"{blob_name}.part-{i:02d}" for i in range(len(ranges))]
+        report.parts = len(ranges)
+
+        bucket = self.auth.authenticate_gcs().bucket(bucket_name)
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(ranges))) as executor:
+                retries = executor.map(
+                    lambda args: self._upload_with_verification(path, bucket_name, args[0], content_type, *args[1]),
+                    zip(part_names, ranges),
+                )
+                report.retries += sum(retries)
+
+            blob = bucket.blob(blob_name)
+            blob.content_type = content_type
+            blob.compose([bucket.blob(name) for name in part_names])
+
+            # 結合後のオブジェクトにはMD5がないため、CRC32Cで全体を検証する
+            blob.reload()
+            expected = file_crc32c(path)
+            if blob.crc32c != expected:
+                raise resumable_media.DataCorruption(None, f"結合後のCRC32Cが一致しません: {blob.crc32c} != {expected}")
+            report.checksum = "crc32c"
+        finally:
+            for name in part_names:
+                try:
+                    bucket.blob(name).delete()
+                except Exception as e:
+                    logger.debug(f"分割アップロードの一時オブジェクトを削除できませんでした: {name} ({e})")
+
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="ファイルをGCSに並列アップロード")
+    parser.add_argument("files", nargs="+", help="アップロードするファイル")
+    parser.add_argument("--prefix", help="保存先のGCS上のプレフィックス", default="")
+    parser.add_argument("--bucket", help="バケット名", default=None)
+    parser.add_argument("--workers", help="同時にアップロードするファイル数", type=int, default=None)
+    parser.add_argument("--gzip", help="gzip圧縮しながら送信（保存先の名前に .gz を付ける）", action="store_true")
+    parser.add_argument("--skip-existing", help="ローカルインデックスにあるファイルはアップロードしない", action="store_true")
+    parser.add_argument("--refresh-index", help="アップロード前にGCSの一覧からローカルインデックスを更新", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    """メイン処理"""
+    args = parse_args()
+    index = BlobIndex() if args.skip_existing or args.refresh_index else None
+    uploader = GCSUploader(max_workers=args.workers, index=index)
+    if args.refresh_index:
+        index.refresh(uploader.auth, args.prefix, args.bucket)
+    suffix = ".gz" if args.gzip else ""
+    files = [(path, f"{args.prefix}{os.path.basename(path)}{suffix}") for path in args.files]
+    reports = uploader.upload_many(files, args.bucket, compress=args.gzip or None, skip_existing=args.skip_existing)
+    for report in reports:
+        print(report.as_dict())
+    return 0 if all(r.success for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+要素の重複排除インデックス
+
+ページ解析で収集した要素を、ハッシュ化した複合キーで線形時間に重複排除します。
+
+キーの種類:
+- id: DOMのid属性
+- xpath: 生成したXPath
+- composite: タグ + テキスト + 丸めたバウンディングボックス
+
+いずれかのキーが既出であれば重複とみなします。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class DedupStats:
+    """重複排除の統計情報"""
+    total: int = 0
+    unique: int = 0
+    duplicates: int = 0
+    matched_by: Dict[str, int] = field(default_factory=lambda: {"id": 0, "xpath": 0, "composite": 0})
+
+    def as_dict(self) -> Dict[str, Any]:
+        """辞書形式で返す"""
+        return {
+            "total": self.total,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "matched_by": dict(self.matched_by),
+        }
+
+
+class ElementDedupIndex:
+    """
+    複合キーによる重複排除インデックス
+
+    追加済みのキーを種類ごとのセットで保持するため、
+    要素1件あたりの判定は定数時間で行えます。
+    """
+
+    def __init__(self, bbox_precision: int = 5):
+        """
+        初期化
+
+        Args:
+            bbox_precision: バウンディングボックスを丸める単位（ピクセル）
+        """
+        self.bbox_precision = max(1, bbox_precision)
+        self._seen: Dict[str, set] = {"id": set(), "xpath": set(), "composite": set()}
+        self.stats = DedupStats()
+
+    def _round_bbox(self, location: Optional[Dict[str, Any]]) -> Optional[Tuple[int, int, int, int]]:
+        """座標とサイズを丸めたタプルを返す（座標がない場合はNone）"""
+        if not location:
+            return None
+        p = self.bbox_precision
+        try:
+            return tuple(
+                int(round(float(location.get(k, 0)) / p)) for k in ("x", "y", "width", "height")
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def make_keys(self, dom_id: Optional[str] = None, xpath: Optional[str] = None, tag: str = "",
+                  text: str = "", location: Optional[Dict[str, Any]] = None) -> List[Tuple[str, Hashable]]:
+        """
+        要素の重複判定キーを生成する
+
+        複合キーは座標がある場合、またはidとXPathのどちらもない場合にのみ使用する。
+
+        Args:
+            dom_id: DOMのid属性
+            xpath: XPath
+            tag: タグ名
+            text: テキスト
+            location: {"x", "y", "width", "height"} の辞書
+
+        Returns:
+            List[Tuple[str, Hashable]]: (キーの種類, キー) のリスト
+        """
+        keys = []
+        if dom_id:
+            keys.append(("id", dom_id))
+        if xpath:
+            keys.append(("xpath", xpath))
+        bbox = self._round_bbox(location)
+        if bbox is not None or not keys:
+            keys.append(("composite", (tag or "", (text or "").strip(), bbox)))
+        return keys
+
+    def add(self, dom_id: Optional[str] = None, xpath: Optional[str] = None, tag: str = "",
+            text: str = "", location: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        要素を登録する
+
+        Args:
+            dom_id: DOMのid属性
+            xpath: XPath
+            tag: タグ名
+            text: テキスト
+            location: {"x", "y", "width", "height"} の辞書
+
+        Returns:
+            bool: 新規の要素であればTrue、重複していればFalse
+        """
+        keys = self.make_keys(dom_id, xpath, tag, text, location)
+        self.stats.total += 1
+        for kind, key in keys:
+            if key in self._seen[kind]:
+                self.stats.duplicates += 1
+                self.stats.matched_by[kind] += 1
+                return False
+        for kind, key in keys:
+            self._seen[kind].add(key)
+        self.stats.unique += 1
+        return True
+
+
+def deduplicate_element_infos(elements: Iterable[Any], bbox_precision: int = 5) -> Tuple[List[Any], DedupStats]:
+    """
+    ElementInfo のリストを重複排除する
+
+    idキーにはDOMのid属性を使用する。WebDriverの要素ID（handle_id）は
+    ライブ要素ごとに必ず異なるため、重複判定には使用しない。
+
+    Args:
+        elements: ElementInfo（tag, text, attrs を持つオブジェクト）のリスト
+        bbox_precision: バウンディングボックスを丸める単位（ピクセル）
+
+    Returns:
+        Tuple[List[Any], DedupStats]: 重複排除後のリストと統計情報
+    """
+    index = ElementDedupIndex(bbox_precision)
+    unique = []
+    for element in elements:
+        attrs = element.attrs
+        if index.add(
+            dom_id=attrs.get("id"),
+            xpath=attrs.get("xpath"),
+            tag=element.tag,
+            text=element.text,
+            location=attrs.get("location"),
+        ):
+            unique.append(element)
+    return unique, index.stats
@@ -18,7 +18,9 @@ from typing import Dict, List, Optional, Any
 
 from src.modules.selenium.browser import Browser
 from src.modules.selenium.page_analyzer import PageAnalyzer
-from src.utils.environment import EnvironmentUtils
+from src.utils.html_selector_analyzer.element_dedup import ElementDedupIndex
+from src.utils.category_rules import DEFAULT_RULES_PATH, get_category_matcher
+from src.utils.environment import EnvironmentUtils, env
 
 # ロガー設定
 logger = logging.getLogger(__name__)
@@ -59,6 +61,9 @@ class HTMLSelectorAnalyzer:
         # 解析結果保存用
         self.selectors = []
         
+        # カテゴリー判定ルールのファイル
+        self.category_rules_path = env.get_config_value("TOOLS", "category_rules_path", DEFAULT_RULES_PATH)
+        
     def setup(self) -> bool:
         """
         ブラウザをセットアップする
@@ -167,6 +172,8 @@ class HTMLSelectorAnalyzer:
         """
         # セレクタのリストをクリア
         self.selectors = []
+        # 同一要素が複数のセレクタで収集されている場合に備えて重複排除する
+        dedup = ElementDedupIndex()
         
         # クリック可能な要素を処理
         for i, element in enumerate(elements.get('clickable', [])):
@@ -178,6 +185,12 @@ class HTMLSelectorAnalyzer:
                 
                 # 要素のID、クラス、属性を取得
                 element_id = element_obj.get_attribute('id') or ''
+                
+                # 完全なXPathの生成（重複判定にも使用）
+                full_xpath = self._generate_full_xpath(element_obj)
+                if not dedup.add(dom_id=element_id, xpath=full_xpath, tag=tag_name, text=text):
+                    continue
+                
                 element_class = element_obj.get_attribute('class') or ''
                 
                 # データ属性を取得
@@ -194,9 +207,6 @@ class HTMLSelectorAnalyzer:
                 # XPathの生成
                 xpath = self._generate_xpath(element_obj)
                 
-                # 完全なXPathの生成
-                full_xpath = self._generate_full_xpath(element_obj)
-                
                 # カテゴリを特定
                 category = self._determine_category(element_obj, tag_name, element_class)
                 
@@ -245,6 +255,12 @@ class HTMLSelectorAnalyzer:
                 
                 # 要素のID、クラス、属性を取得
                 element_id = element_obj.get_attribute('id') or ''
+                
+                # 完全なXPathの生成（重複判定にも使用）
+                full_xpath = self._generate_full_xpath(element_obj)
+                if not dedup.add(dom_id=element_id, xpath=full_xpath, tag=tag_name, text=text_value):
+                    continue
+                
                 element_class = element_obj.get_attribute('class') or ''
                 
                 # CSSセレクタの生成
@@ -253,9 +269,6 @@ class HTMLSelectorAnalyzer:
                 # XPathの生成
                 xpath = self._generate_xpath(element_obj)
                 
-                # 完全なXPathの生成
-                full_xpath = self._generate_full_xpath(element_obj)
-                
                 # セレクタ情報を作成
                 selector_info = {
                     "group": "detailed_analysis",
@@ -274,6 +287,12 @@ class HTMLSelectorAnalyzer:
                 
             except Exception as e:
                 self.logger.debug(f"セレクタ情報作成中にエラーが発生しました (input_{i+1}): {e}")
+        
+        if dedup.stats.duplicates:
+            self.logger.info(
+                f"重複要素を除外しました: {dedup.stats.duplicates}件 "
+                f"(入力 {dedup.stats.total}件 → {dedup.stats.unique}件, 内訳 {dedup.stats.matched_by})"
+            )
     
     def _generate_css_selector(self, element) -> str:
         """
@@ -434,35 +453,15 @@ class HTMLSelectorAnalyzer:
             str: カテゴリ名
         """
         try:
-            class_lower = element_class.lower()
-            
-            # カテゴリの判定ロジック
-            if 'navbar' in class_lower or 'nav-' in class_lower or tag_name == 'nav':
-                return 'ナビゲーションバー'
-            elif 'sidebar' in class_lower or 'side-' in class_lower:
-                return 'サイドバー'
-            elif 'btn' in class_lower or tag_name == 'button':
-                return 'ボタン'
-            elif tag_name == 'a':
-                return 'リンク'
-            elif 'tab' in class_lower:
-                return 'タブ'
-            elif 'menu' in class_lower:
-                return 'メニュー'
-            elif 'header' in class_lower:
-                return 'ヘッダー'
-            elif 'footer' in class_lower:
-                return 'フッター'
-            
-            # 位置情報からカテゴリを推定
-            location = element.location
-            if location['y'] < 100:
-                return 'トップバー'
-            elif location['x'] < 200:
-                return 'サイドバー'
-                
-            # デフォルトカテゴリ
-            return 'その他'
+            matcher = get_category_matcher("selector_analyzer", self.category_rules_path, self.logger)
+            if matcher is None:
+                return 'その他'
+            # 位置情報はクラス名などで判定できなかった場合にのみ取得する
+            return matcher.categorize({
+                "tag": tag_name,
+                "class": element_class,
+                "location": lambda: element.location,
+            })
             
         except Exception as e:
             self.logger.debug(f"カテゴリ特定中にエラーが発生しました: {e}")
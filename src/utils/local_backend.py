@@ -0,0 +1,765 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+BigQuery/GCSのローカル実装（オフラインのテスト・ベンチマーク用）
+
+GoogleCloudAuth の backend を local にすると、BigQueryとGCSのクライアントの代わりに
+このモジュールのクライアントを返します。認証情報やネットワークなしで
+ダウンロード → 加工 → ロードの処理全体を実行・計測できます。
+
+- GCSのオブジェクトはディレクトリ（<root>/gcs/<バケット>/<オブジェクト名>）に保存
+- BigQueryのテーブルはSQLite（<root>/bigquery.sqlite）に保存し、テーブル名は "project.dataset.table"
+- ロードジョブ（CSV、gzip圧縮も可）の書き込みモード、パーティションデコレータ（table$YYYYMMDD）、
+  列の追加（ALLOW_FIELD_ADDITION）をエミュレート
+- query() は build_merge_sql() が作成する形式のMERGE文と、バッククォートの識別子を使う
+  SELECTなどの文に対応
+
+対応しているのはこのリポジトリが使用するクライアントのメソッドだけです。
+
+使用例（ベンチマーク）:
+$ python -m src.utils.local_backend --rows 200000
+"""
+
+import io
+import os
+import re
+import csv
+import sys
+import gzip
+import json
+import time
+import base64
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import google_crc32c
+from google.api_core.exceptions import BadRequest, Conflict
+from google.cloud import bigquery
+from google.cloud.bigquery.table import Row
+from google.cloud.exceptions import NotFound
+
+from src.utils.logging_config import get_logger
+from src.utils.bigquery_schema import normalize_type, sanitize_column_name
+
+logger = get_logger(__name__)
+
+# BigQueryの型とSQLiteの列の型の対応（ほかの型はTEXT）
+SQLITE_TYPES = {
+    "INTEGER": "INTEGER",
+    "BOOLEAN": "INTEGER",
+    "FLOAT": "REAL",
+    "NUMERIC": "REAL",
+    "BIGNUMERIC": "REAL",
+}
+
+# build_merge_sql() が作成するMERGE文の各部分
+MERGE_PATTERNS = {
+    "target": re.compile(r"^MERGE `([^`]+)` T", re.MULTILINE),
+    "staging": re.compile(r"SELECT \* FROM `([^`]+)`"),
+    "keys": re.compile(r"PARTITION BY (.+)\) = 1"),
+    "update": re.compile(r"UPDATE SET (.+)$", re.MULTILINE),
+    "insert": re.compile(r"INSERT \((.+)\)"),
+}
+
+
+def _identifiers(text: str) -> List[str]:
+    """バッククォートで囲まれた識別子を取り出す"""
+    return re.findall(r"`([^`]+)`", text)
+
+
+def _quote(name: str) -> str:
+    """SQLiteの識別子として引用符で囲む"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _convert(value: str, field_type: str) -> Any:
+    """CSVの値をBigQueryの型に合わせて変換する（空文字はNULL）"""
+    if value == "":
+        return None
+    if field_type == "INTEGER":
+        return int(value)
+    if field_type in ("FLOAT", "NUMERIC", "BIGNUMERIC"):
+        return float(value)
+    if field_type == "BOOLEAN":
+        if value.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"BOOLEANとして読み込めません: {value}")
+        return 1 if value.lower() in ("true", "1") else 0
+    if field_type == "DATE":
+        return date.fromisoformat(value).isoformat()
+    return value
+
+
+# ---------------------------------------------------------------------------
+# GCS
+# ---------------------------------------------------------------------------
+
+class LocalBlob:
+    """ディレクトリに保存するGCSオブジェクト"""
+
+    def __init__(self, bucket: "LocalBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.content_type = None
+        self.content_encoding = None
+
+    @property
+    def path(self) -> str:
+        """保存先のファイルパス"""
+        return os.path.join(self.bucket.path, *self.name.split("/"))
+
+    @property
+    def size(self) -> Optional[int]:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else None
+
+    @property
+    def updated(self) -> Optional[datetime]:
+        if not os.path.exists(self.path):
+            return None
+        return datetime.fromtimestamp(os.path.getmtime(self.path), tz=timezone.utc)
+
+    @property
+    def crc32c(self) -> Optional[str]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            return base64.b64encode(google_crc32c.Checksum(f.read()).digest()).decode("ascii")
+
+    def exists(self, client: Any = None) -> bool:
+        return os.path.isfile(self.path)
+
+    def reload(self, client: Any = None) -> None:
+        if not self.exists():
+            raise NotFound(f"オブジェクトが見つかりません: {self.bucket.name}/{self.name}")
+
+    def upload_from_file(self, file_obj: Any, **kwargs: Any) -> None:
+        self._write(file_obj.read())
+
+    def upload_from_filename(self, filename: str, **kwargs: Any) -> None:
+        with open(filename, "rb") as f:
+            self._write(f.read())
+
+    def upload_from_string(self, data: Any, **kwargs: Any) -> None:
+        self._write(data.encode("utf-8") if isinstance(data, str) else data)
+
+    def download_as_bytes(self, **kwargs: Any) -> bytes:
+        self.reload()
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def download_to_filename(self, filename: str, **kwargs: Any) -> None:
+        self.reload()
+        shutil.copyfile(self.path, filename)
+
+    def delete(self, **kwargs: Any) -> None:
+        self.reload()
+        os.remove(self.path)
+
+    def _write(self, data: bytes) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # 書き込み途中のオブジェクトが読まれないように置き換える
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".upload_")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+
+
+class LocalBucket:
+    """ディレクトリをバケットとして扱う"""
+
+    def __init__(self, client: "LocalStorageClient", name: str):
+        self.client = client
+        self.name = name
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.client.root, self.name)
+
+    def blob(self, name: str) -> LocalBlob:
+        return LocalBlob(self, name)
+
+    def exists(self, client: Any = None) -> bool:
+        return os.path.isdir(self.path)
+
+    def list_blobs(self, **kwargs: Any) -> "LocalBlobIterator":
+        return self.client.list_blobs(self, **kwargs)
+
+
+class LocalBlobIterator:
+    """list_blobs() の戻り値（ページ単位の取得と prefixes に対応）"""
+
+    def __init__(self, blobs: List[LocalBlob], prefixes: Sequence[str], page_size: int):
+        self._blobs = blobs
+        self._page_size = max(1, page_size)
+        self._all_prefixes = set(prefixes)
+        self.prefixes = set()
+
+    @property
+    def pages(self) -> Iterator[List[LocalBlob]]:
+        self.prefixes = set(self._all_prefixes)
+        for start in range(0, max(len(self._blobs), 1), self._page_size):
+            yield self._blobs[start:start + self._page_size]
+
+    def __iter__(self) -> Iterator[LocalBlob]:
+        for page in self.pages:
+            yield from page
+
+
+class LocalStorageClient:
+    """storage.Client の代わりに使用するGCSのローカル実装"""
+
+    def __init__(self, root: str, project: Optional[str] = None):
+        self.root = root
+        self.project = project
+        os.makedirs(root, exist_ok=True)
+
+    def bucket(self, bucket_name: str) -> LocalBucket:
+        return LocalBucket(self, bucket_name)
+
+    def get_bucket(self, bucket_name: str) -> LocalBucket:
+        bucket = self.bucket(bucket_name)
+        if not bucket.exists():
+            raise NotFound(f"バケットが見つかりません: {bucket_name}")
+        return bucket
+
+    def create_bucket(self, bucket_name: str, exists_ok: bool = True) -> LocalBucket:
+        bucket = self.bucket(bucket_name)
+        if bucket.exists() and not exists_ok:
+            raise Conflict(f"バケットは既に存在します: {bucket_name}")
+        os.makedirs(bucket.path, exist_ok=True)
+        return bucket
+
+    def list_blobs(self, bucket_or_name: Any, prefix: Optional[str] = None, delimiter: Optional[str] = None,
+                   max_results: Optional[int] = None, page_size: Optional[int] = None,
+                   **kwargs: Any) -> LocalBlobIterator:
+        """オブジェクト名の順にオブジェクトを返す（fields などほかの引数は無視する）"""
+        bucket = bucket_or_name if isinstance(bucket_or_name, LocalBucket) else self.bucket(bucket_or_name)
+        prefix = prefix or ""
+        names = []
+        for directory, _, files in os.walk(bucket.path):
+            relative = os.path.relpath(directory, bucket.path)
+            for filename in files:
+                if filename.startswith(".upload_"):
+                    continue
+                name = filename if relative == "." else f"{relative.replace(os.sep, '/')}/{filename}"
+                if name.startswith(prefix):
+                    names.append(name)
+
+        blobs, prefixes = [], set()
+        for name in sorted(names):
+            rest = name[len(prefix):]
+            if delimiter and delimiter in rest:
+                prefixes.add(prefix + rest.split(delimiter)[0] + delimiter)
+            else:
+                blobs.append(bucket.blob(name))
+        if max_results is not None:
+            blobs = blobs[:max_results]
+        return LocalBlobIterator(blobs, prefixes, page_size or 1000)
+
+
+# ---------------------------------------------------------------------------
+# BigQuery
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LocalDmlStats:
+    """DMLの処理件数（QueryJob.dml_stats と同じ属性）"""
+    inserted_row_count: int = 0
+    updated_row_count: int = 0
+    deleted_row_count: int = 0
+
+
+class LocalJob:
+    """ロードジョブ・クエリジョブの結果（同期的に実行済み）"""
+
+    _counter = 0
+    _counter_lock = threading.Lock()
+
+    def __init__(self, kind: str):
+        with LocalJob._counter_lock:
+            LocalJob._counter += 1
+            self.job_id = f"local_{kind}_{LocalJob._counter}"
+        self.state = "RUNNING"
+        self.errors = None
+        self.error_result = None
+        self.output_rows = 0
+        self.output_bytes = 0
+        self.input_file_bytes = 0
+        self.total_bytes_processed = 0
+        self.slot_millis = 0
+        self.dml_stats = None
+        self.rows: List[Row] = []
+        self.started = datetime.now(timezone.utc)
+        self.ended = None
+
+    def finish(self, error: Optional[Exception] = None) -> "LocalJob":
+        """ジョブを完了状態にする"""
+        if error is not None:
+            self.error_result = {"reason": "invalid", "message": str(error)}
+            self.errors = [self.error_result]
+        self.state = "DONE"
+        self.ended = datetime.now(timezone.utc)
+        self.slot_millis = int((self.ended - self.started).total_seconds() * 1000)
+        return self
+
+    def result(self, timeout: Optional[float] = None) -> List[Row]:
+        if self.error_result:
+            raise BadRequest(self.error_result["message"], errors=self.errors)
+        return self.rows
+
+    def done(self) -> bool:
+        return self.state == "DONE"
+
+
+class LocalBigQueryClient:
+    """bigquery.Client の代わりに使用するBigQueryのローカル実装（SQLite）"""
+
+    def __init__(self, database: str, storage: LocalStorageClient, project: str):
+        """
+        Args:
+            database: SQLiteのデータベースファイル（":memory:" も可）
+            storage: gs:// のURIを解決するGCSのローカル実装
+            project: プロジェクトID
+        """
+        self.project = project
+        self.storage = storage
+        if database != ":memory:":
+            os.makedirs(os.path.dirname(database) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._conn.execute("CREATE TABLE IF NOT EXISTS __datasets (dataset_id TEXT PRIMARY KEY)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS __tables ("
+            "table_id TEXT PRIMARY KEY, schema TEXT, partition_field TEXT, clustering TEXT)"
+        )
+
+    # --- 参照の解決 ---
+
+    def _table_ref(self, table: Any) -> Tuple[str, Optional[str]]:
+        """テーブルの参照を ("project.dataset.table", パーティションデコレータ) に変換する"""
+        if not isinstance(table, str):
+            table = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        table, _, decorator = table.partition("$")
+        parts = table.replace(":", ".").split(".")
+        if len(parts) == 2:
+            parts.insert(0, self.project)
+        return ".".join(parts), decorator or None
+
+    def _dataset_ref(self, dataset: Any) -> str:
+        if not isinstance(dataset, str):
+            dataset = f"{dataset.project}.{dataset.dataset_id}"
+        return dataset if "." in dataset else f"{self.project}.{dataset}"
+
+    # --- データセット ---
+
+    def get_dataset(self, dataset_ref: Any) -> bigquery.Dataset:
+        ref = self._dataset_ref(dataset_ref)
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM __datasets WHERE dataset_id = ?", (ref,)).fetchone()
+        if row is None:
+            raise NotFound(f"データセットが見つかりません: {ref}")
+        return bigquery.Dataset(ref)
+
+    def create_dataset(self, dataset: Any, exists_ok: bool = False, **kwargs: Any) -> bigquery.Dataset:
+        ref = self._dataset_ref(dataset)
+        with self._lock:
+            try:
+                self._conn.execute("INSERT INTO __datasets VALUES (?)", (ref,))
+            except sqlite3.IntegrityError:
+                if not exists_ok:
+                    raise Conflict(f"データセットは既に存在します: {ref}")
+        return bigquery.Dataset(ref)
+
+    # --- テーブル ---
+
+    def _table_meta(self, ref: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT schema, partition_field, clustering FROM __tables WHERE table_id = ?", (ref,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "schema": [bigquery.SchemaField.from_api_repr(f) for f in json.loads(row[0])],
+            "partition_field": row[1],
+            "clustering": json.loads(row[2]) if row[2] else None,
+        }
+
+    def get_table(self, table: Any) -> bigquery.Table:
+        ref, _ = self._table_ref(table)
+        with self._lock:
+            meta = self._table_meta(ref)
+            if meta is None:
+                raise NotFound(f"テーブルが見つかりません: {ref}")
+            num_rows = self._conn.execute(f"SELECT COUNT(*) FROM {_quote(ref)}").fetchone()[0]
+        result = bigquery.Table(ref, schema=meta["schema"])
+        if meta["partition_field"]:
+            result.time_partitioning = bigquery.TimePartitioning(field=meta["partition_field"])
+        if meta["clustering"]:
+            result.clustering_fields = meta["clustering"]
+        result._properties["numRows"] = str(num_rows)
+        return result
+
+    def create_table(self, table: Any, exists_ok: bool = False) -> bigquery.Table:
+        ref, _ = self._table_ref(table)
+        with self._lock:
+            if self._table_meta(ref) is not None:
+                if not exists_ok:
+                    raise Conflict(f"テーブルは既に存在します: {ref}")
+                return self.get_table(ref)
+            partitioning = getattr(table, "time_partitioning", None)
+            self._create_table(ref, list(getattr(table, "schema", None) or []),
+                               partitioning.field if partitioning else None,
+                               getattr(table, "clustering_fields", None))
+        return self.get_table(ref)
+
+    def update_table(self, table: bigquery.Table, fields: Sequence[str]) -> bigquery.Table:
+        ref, _ = self._table_ref(table)
+        with self._lock:
+            meta = self._table_meta(ref)
+            if meta is None:
+                raise NotFound(f"テーブルが見つかりません: {ref}")
+            if "schema" in fields:
+                self._add_columns(ref, meta["schema"], list(table.schema))
+        return self.get_table(ref)
+
+    def delete_table(self, table: Any, not_found_ok: bool = False) -> None:
+        ref, _ = self._table_ref(table)
+        with self._lock:
+            if self._table_meta(ref) is None:
+                if not_found_ok:
+                    return
+                raise NotFound(f"テーブルが見つかりません: {ref}")
+            self._conn.execute(f"DROP TABLE {_quote(ref)}")
+            self._conn.execute("DELETE FROM __tables WHERE table_id = ?", (ref,))
+
+    def _create_table(self, ref: str, schema: List[bigquery.SchemaField], partition_field: Optional[str],
+                      clustering: Optional[List[str]]) -> None:
+        dataset = ref.rsplit(".", 1)[0]
+        if self._conn.execute("SELECT 1 FROM __datasets WHERE dataset_id = ?", (dataset,)).fetchone() is None:
+            raise NotFound(f"データセットが見つかりません: {dataset}")
+        columns = ", ".join(f"{_quote(f.name)} {SQLITE_TYPES.get(normalize_type(f.field_type), 'TEXT')}"
+                            for f in schema)
+        self._conn.execute(f"CREATE TABLE {_quote(ref)} ({columns})")
+        self._conn.execute(
+            "INSERT INTO __tables VALUES (?, ?, ?, ?)",
+            (ref, json.dumps([f.to_api_repr() for f in schema], ensure_ascii=False), partition_field,
+             json.dumps(clustering, ensure_ascii=False) if clustering else None),
+        )
+
+    def _add_columns(self, ref: str, current: List[bigquery.SchemaField],
+                     schema: List[bigquery.SchemaField]) -> List[bigquery.SchemaField]:
+        """テーブルにない列を追加し、更新後のスキーマを返す"""
+        names = {f.name.lower() for f in current}
+        added = [f for f in schema if f.name.lower() not in names]
+        for schema_field in added:
+            column_type = SQLITE_TYPES.get(normalize_type(schema_field.field_type), "TEXT")
+            self._conn.execute(f"ALTER TABLE {_quote(ref)} ADD COLUMN {_quote(schema_field.name)} {column_type}")
+        if added:
+            current = current + added
+            self._conn.execute("UPDATE __tables SET schema = ? WHERE table_id = ?",
+                               (json.dumps([f.to_api_repr() for f in current], ensure_ascii=False), ref))
+        return current
+
+    # --- ロードジョブ ---
+
+    def load_table_from_uri(self, source_uris: Any, destination: Any,
+                            job_config: Optional[bigquery.LoadJobConfig] = None, **kwargs: Any) -> LocalJob:
+        """GCSのローカル実装にあるCSVをテーブルにロードする（同期的に実行）"""
+        job = LocalJob("load")
+        job_config = job_config or bigquery.LoadJobConfig()
+        uris = [source_uris] if isinstance(source_uris, str) else list(source_uris)
+        try:
+            rows, schema = [], None
+            for uri in uris:
+                data = self._read_uri(uri)
+                job.input_file_bytes += len(data)
+                file_schema, file_rows = self._parse_csv(data, job_config)
+                schema = schema or file_schema
+                rows.extend(file_rows)
+            ref, decorator = self._table_ref(destination)
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._write_rows(ref, decorator, schema, rows, job_config)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            job.output_rows = len(rows)
+            job.output_bytes = job.input_file_bytes
+            return job.finish()
+        except Exception as e:
+            logger.debug(f"ローカルのロードジョブが失敗しました: {e}")
+            return job.finish(e)
+
+    def _read_uri(self, uri: str) -> bytes:
+        match = re.match(r"gs://([^/]+)/(.+)", uri)
+        if not match:
+            raise BadRequest(f"gs:// のURIではありません: {uri}")
+        data = self.storage.bucket(match.group(1)).blob(match.group(2)).download_as_bytes()
+        return gzip.decompress(data) if data[:2] == b"\x1f\x8b" else data
+
+    def _parse_csv(self, data: bytes, job_config: bigquery.LoadJobConfig
+                   ) -> Tuple[List[bigquery.SchemaField], List[Tuple[Any, ...]]]:
+        """CSVを読み込み、スキーマと型を変換した行を返す"""
+        if job_config.source_format not in (None, bigquery.SourceFormat.CSV):
+            raise BadRequest(f"ローカル実装はCSVのみ対応しています: {job_config.source_format}")
+        reader = csv.reader(io.StringIO(data.decode(job_config.encoding or "UTF-8")))
+        skip = job_config.skip_leading_rows or 0
+        header = []
+        for _ in range(skip):
+            header = next(reader, [])
+
+        schema = list(job_config.schema or [])
+        if not schema:
+            if not job_config.autodetect or not header:
+                raise BadRequest("スキーマが指定されていません")
+            schema = [bigquery.SchemaField(sanitize_column_name(name), "STRING") for name in header]
+        types = [normalize_type(f.field_type) for f in schema]
+
+        rows = []
+        for line_number, record in enumerate(reader, start=skip + 1):
+            if len(record) > len(schema) and not job_config.ignore_unknown_values:
+                raise BadRequest(f"{line_number}行目: 列が多すぎます ({len(record)} > {len(schema)})")
+            if len(record) < len(schema):
+                if not job_config.allow_jagged_rows:
+                    raise BadRequest(f"{line_number}行目: 列が不足しています ({len(record)} < {len(schema)})")
+                record = record + [""] * (len(schema) - len(record))
+            try:
+                rows.append(tuple(_convert(v, t) for v, t in zip(record, types)))
+            except ValueError as e:
+                raise BadRequest(f"{line_number}行目: {e}")
+        return schema, rows
+
+    def _write_rows(self, ref: str, decorator: Optional[str], schema: List[bigquery.SchemaField],
+                    rows: List[Tuple[Any, ...]], job_config: bigquery.LoadJobConfig) -> None:
+        """書き込みモードとパーティションデコレータに従って行を書き込む"""
+        disposition = job_config.write_disposition or bigquery.WriteDisposition.WRITE_APPEND
+        partitioning = job_config.time_partitioning
+        meta = self._table_meta(ref)
+
+        if meta is not None and disposition == bigquery.WriteDisposition.WRITE_TRUNCATE and not decorator:
+            # テーブル全体の置き換えはスキーマも置き換える
+            self._conn.execute(f"DROP TABLE {_quote(ref)}")
+            self._conn.execute("DELETE FROM __tables WHERE table_id = ?", (ref,))
+            meta = None
+        if meta is None:
+            self._create_table(ref, schema, partitioning.field if partitioning else None,
+                               job_config.clustering_fields)
+            meta = self._table_meta(ref)
+        else:
+            current = {f.name.lower() for f in meta["schema"]}
+            added = [f.name for f in schema if f.name.lower() not in current]
+            if added:
+                if bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION not in (job_config.schema_update_options or []):
+                    raise BadRequest(f"テーブルにない列があります: {added}")
+                meta["schema"] = self._add_columns(ref, meta["schema"], schema)
+
+        names = [f.name for f in schema]
+        if decorator:
+            partition_field = meta["partition_field"]
+            if not partition_field:
+                raise BadRequest(f"パーティション分割されていないテーブルです: {ref}")
+            partition = datetime.strptime(decorator, "%Y%m%d").date().isoformat()
+            index = [n.lower() for n in names].index(partition_field.lower())
+            outside = [row[index] for row in rows if str(row[index] or "")[:10] != partition]
+            if outside:
+                raise BadRequest(f"パーティション {decorator} 以外の日付の行があります: {outside[0]}")
+            where, params = f"WHERE substr({_quote(partition_field)}, 1, 10) = ?", (partition,)
+        else:
+            where, params = "", ()
+
+        if disposition == bigquery.WriteDisposition.WRITE_EMPTY:
+            if self._conn.execute(f"SELECT 1 FROM {_quote(ref)} {where} LIMIT 1", params).fetchone():
+                raise BadRequest(f"テーブルが空ではありません: {ref}")
+        elif disposition == bigquery.WriteDisposition.WRITE_TRUNCATE:
+            self._conn.execute(f"DELETE FROM {_quote(ref)} {where}", params)
+
+        placeholders = ", ".join("?" for _ in names)
+        self._conn.executemany(
+            f"INSERT INTO {_quote(ref)} ({', '.join(_quote(n) for n in names)}) VALUES ({placeholders})", rows
+        )
+
+    # --- クエリ ---
+
+    def query(self, query: str, job_config: Any = None, **kwargs: Any) -> LocalJob:
+        """MERGE文（build_merge_sql() の形式）またはSQLiteで実行できる文を実行する（同期的に実行）"""
+        job = LocalJob("query")
+        try:
+            with self._lock:
+                if query.lstrip().upper().startswith("MERGE"):
+                    job.dml_stats = self._merge(query)
+                else:
+                    cursor = self._conn.execute(re.sub(r"`([^`]+)`", lambda m: _quote(m.group(1)), query))
+                    if cursor.description:
+                        index = {column[0]: i for i, column in enumerate(cursor.description)}
+                        job.rows = [Row(values, index) for values in cursor.fetchall()]
+                    job.output_rows = len(job.rows)
+            return job.finish()
+        except Exception as e:
+            logger.debug(f"ローカルのクエリが失敗しました: {e}")
+            return job.finish(e)
+
+    def _merge(self, sql: str) -> LocalDmlStats:
+        """build_merge_sql() の形式のMERGE文を UPDATE と INSERT で実行する"""
+        parts = {}
+        for name, pattern in MERGE_PATTERNS.items():
+            match = pattern.search(sql)
+            parts[name] = match.group(1) if match else ""
+        if not (parts["target"] and parts["staging"] and parts["keys"] and parts["insert"]):
+            raise BadRequest("ローカル実装は build_merge_sql() の形式のMERGE文のみ対応しています")
+        target, _ = self._table_ref(parts["target"])
+        staging, _ = self._table_ref(parts["staging"])
+        keys = _identifiers(parts["keys"])
+        columns = _identifiers(parts["insert"])
+        updates = re.findall(r"`([^`]+)` = S\.", parts["update"])
+        for ref in (target, staging):
+            if self._table_meta(ref) is None:
+                raise NotFound(f"テーブルが見つかりません: {ref}")
+
+        match_keys = " AND ".join(f"T.{_quote(k)} IS S.{_quote(k)}" for k in keys)
+        key_list = ", ".join(_quote(k) for k in keys)
+        stats = LocalDmlStats()
+        self._conn.execute("BEGIN")
+        try:
+            # ステージング内で同じキーの行は最初の1行だけを使用する
+            self._conn.execute("DROP TABLE IF EXISTS temp.__merge_source")
+            self._conn.execute(
+                f"CREATE TEMP TABLE __merge_source AS SELECT * FROM {_quote(staging)} WHERE rowid IN "
+                f"(SELECT MIN(rowid) FROM {_quote(staging)} GROUP BY {key_list})"
+            )
+            # キーの索引がないと突き合わせが行数の2乗に比例するため作成する
+            self._conn.execute(f"CREATE INDEX temp.__merge_source_keys ON __merge_source ({key_list})")
+            index_name = "__merge_" + google_crc32c.Checksum(f"{target}:{key_list}".encode()).hexdigest().decode()
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(target)} ({key_list})")
+            if updates:
+                changed = " OR ".join(f"T.{_quote(c)} IS NOT S.{_quote(c)}" for c in updates)
+                assignments = ", ".join(f"{_quote(c)} = S.{_quote(c)}" for c in updates)
+                cursor = self._conn.execute(
+                    f"UPDATE {_quote(target)} AS T SET {assignments} FROM temp.__merge_source AS S "
+                    f"WHERE {match_keys} AND ({changed})"
+                )
+                stats.updated_row_count = cursor.rowcount
+            quoted = ", ".join(_quote(c) for c in columns)
+            cursor = self._conn.execute(
+                f"INSERT INTO {_quote(target)} ({quoted}) SELECT {quoted} FROM temp.__merge_source AS S "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {_quote(target)} AS T WHERE {match_keys})"
+            )
+            stats.inserted_row_count = cursor.rowcount
+            self._conn.execute("DROP TABLE temp.__merge_source")
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return stats
+
+    def close(self) -> None:
+        """データベースを閉じる"""
+        with self._lock:
+            self._conn.close()
+
+
+def create_local_clients(root: str, project: str) -> Tuple[LocalBigQueryClient, LocalStorageClient]:
+    """
+    ローカル実装のBigQueryとGCSのクライアントを作成する
+
+    Args:
+        root: データを保存するディレクトリ
+        project: プロジェクトID
+
+    Returns:
+        Tuple[LocalBigQueryClient, LocalStorageClient]: (BigQueryクライアント, GCSクライアント)
+    """
+    storage_client = LocalStorageClient(os.path.join(root, "gcs"), project)
+    bigquery_client = LocalBigQueryClient(os.path.join(root, "bigquery.sqlite"), storage_client, project)
+    logger.info(f"ローカルのBigQuery/GCSを使用します: {root}")
+    return bigquery_client, storage_client
+
+
+# ---------------------------------------------------------------------------
+# ベンチマーク
+# ---------------------------------------------------------------------------
+
+def _write_cv_attribute_csv(path: str, rows: int, day: date, revision: int) -> None:
+    """コンバージョン属性レポートと同じ形式のCSVを作成する"""
+    with open(path, "w", encoding="cp932", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["CV名", "CV時間", "ユーザーID", "売上金額", "日付"])
+        for i in range(rows):
+            writer.writerow([
+                "応募完了", f"{day:%Y-%m-%d} {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+                f"user{i:08d}", f"{(i * 37 + revision * (i % 10 == 0)) % 100000:,}", f"{day:%Y/%m/%d}",
+            ])
+
+
+def run_benchmark(rows: int, root: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ローカル実装でロードとMERGEの処理時間を計測する
+
+    Args:
+        rows: CSVの行数
+        root: データを保存するディレクトリ（省略時は一時ディレクトリ）
+
+    Returns:
+        Dict[str, Any]: 処理ごとの所要時間と件数
+    """
+    from src.utils.bigquery import GoogleCloudAuth
+    from src.utils.bigquery_loader import BigQueryLoader
+
+    workdir = root or tempfile.mkdtemp(prefix="local_cloud_")
+    auth = GoogleCloudAuth(backend="local")
+    auth.local_backend_dir = workdir
+    client = auth.authenticate_bigquery()
+    client.create_dataset(auth.dataset_id, exists_ok=True)
+    loader = BigQueryLoader(auth=auth)
+
+    schema = [
+        {"COLUMN_ORIGIN_NAME": "CV名", "DATA_TYPE": "STR"},
+        {"COLUMN_ORIGIN_NAME": "CV時間", "DATA_TYPE": "TIMESTAMP"},
+        {"COLUMN_ORIGIN_NAME": "ユーザーID", "DATA_TYPE": "STR"},
+        {"COLUMN_ORIGIN_NAME": "売上金額", "DATA_TYPE": "INT"},
+        {"COLUMN_ORIGIN_NAME": "日付", "DATA_TYPE": "DATE"},
+    ]
+    schema_path = os.path.join(workdir, "cv_attribute_schema.json")
+    with open(schema_path, "w", encoding="utf-8") as f:
+        json.dump({"schema": schema}, f, ensure_ascii=False)
+
+    day = date(2025, 4, 1)
+    results: Dict[str, Any] = {"rows": rows, "root": workdir}
+    for step, revision in (("daily_load", 0), ("daily_reload", 0), ("upsert", 1)):
+        csv_path = os.path.join(workdir, f"cv_attribute_{step}.csv")
+        _write_cv_attribute_csv(csv_path, rows, day, revision)
+        start_time = time.time()
+        if step == "upsert":
+            result = loader.upsert_file(csv_path, "cv_attribute", schema_path=schema_path, encoding="cp932")
+        else:
+            result = loader.load_daily_partition(csv_path, "cv_attribute", schema_path=schema_path,
+                                                 encoding="cp932")
+        results[step] = {"seconds": round(time.time() - start_time, 3), **(result.as_dict() if result else {})}
+    results["table_rows"] = client.get_table(loader.table_ref("cv_attribute")).num_rows
+    return results
+
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="ローカルのBigQuery/GCSでロードとMERGEを計測")
+    parser.add_argument("--rows", help="CSVの行数", type=int, default=100000)
+    parser.add_argument("--root", help="データを保存するディレクトリ（省略時は一時ディレクトリ）", default=None)
+    return parser.parse_args()
+
+
+def main():
+    """メイン処理"""
+    args = parse_args()
+    print(json.dumps(run_benchmark(args.rows, args.root), ensure_ascii=False, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+セレクタカタログの差分検出
+
+前回のセレクタカタログ（selectors_analysis.csv / .json）と新しい解析結果を
+要素の同一性で対応付け、追加・削除・変更されたセレクタを検出します。
+変更のない行は前回の内容と順序をそのまま残すため、
+カタログをバージョン管理した場合の差分が実際の変更だけになります。
+
+要素の同一性は次の順に判定します。
+1. グループ + 名前（clickable_1 のような自動採番の名前を除く）
+2. グループ + id属性（カタログ内で一意な場合のみ）
+3. グループ + 完全XPath
+4. グループ + 要素タイプ + テキスト
+"""
+
+import re
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 差分の表示順（ここにない列も比較し、列名順に続ける）
+COMPARED_FIELDS = ['name', 'text_value', 'id', 'class', 'css', 'xpath', 'full_xpath', 'element_type', 'category']
+
+# 比較しない列（同一性の判定に使うため対応付いた行同士では常に一致する）
+IGNORED_FIELDS = {'group'}
+
+# ページ解析ツールが自動採番する名前（解析ごとに変わるため同一性の判定に使わない）
+AUTO_NAME_PATTERN = re.compile(r'^(?:\w+_)?(?:clickable|input|element)_\d+$')
+
+
+@dataclass
+class SelectorChange:
+    """変更されたセレクタ"""
+    old: Dict[str, Any]
+    new: Dict[str, Any]
+    fields: List[str]
+
+
+@dataclass
+class CatalogueDiff:
+    """カタログの差分"""
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[SelectorChange] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        """差分があるかどうか"""
+        return bool(self.added or self.removed or self.changed)
+
+
+def _text(value: Any) -> str:
+    """比較用に値を文字列化する"""
+    return "" if value is None else str(value).strip()
+
+
+def _normalize(value: Any) -> str:
+    """比較用に値を正規化する（リストや辞書はキー順のJSON、空の値は空文字）"""
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, ensure_ascii=False, sort_keys=True) if value else ""
+    return _text(value)
+
+
+def _changed_fields(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """
+    対応付いた行同士で値が異なる列を返す
+
+    保存される全ての列を比較する。名前は新しい名前が自動採番の場合のみ
+    前回の名前を引き継ぐため比較せず、それ以外の名前の変更は差分とする。
+    """
+    keys = (set(old) | set(new)) - IGNORED_FIELDS
+    if AUTO_NAME_PATTERN.match(_text(new.get('name'))):
+        keys.discard('name')
+    ordered = [f for f in COMPARED_FIELDS if f in keys] + sorted(keys - set(COMPARED_FIELDS))
+    return [f for f in ordered if _normalize(old.get(f)) != _normalize(new.get(f))]
+
+
+def _identity_keys() -> List[Tuple[str, Callable[[Dict[str, Any]], Optional[tuple]], bool]]:
+    """同一性の判定に使うキー関数を優先順に返す（名前, キー関数, 一意なキーのみ使うか）"""
+    def by_name(s):
+        name = _text(s.get('name'))
+        return None if not name or AUTO_NAME_PATTERN.match(name) else (_text(s.get('group')), name)
+
+    def by_id(s):
+        element_id = _text(s.get('id'))
+        return (_text(s.get('group')), element_id) if element_id else None
+
+    def by_full_xpath(s):
+        full_xpath = _text(s.get('full_xpath'))
+        return (_text(s.get('group')), full_xpath) if full_xpath else None
+
+    def by_text(s):
+        text = _text(s.get('text_value'))
+        return (_text(s.get('group')), _text(s.get('element_type')), text) if text else None
+
+    # 親要素のidを記録したカタログもあるため、idは一意な場合のみ使用する
+    return [
+        ("name", by_name, False),
+        ("id", by_id, True),
+        ("full_xpath", by_full_xpath, False),
+        ("text", by_text, False),
+    ]
+
+
+def diff_catalogues(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> CatalogueDiff:
+    """
+    前回のカタログと新しい解析結果の差分を求める
+
+    Args:
+        old: 前回のセレクタ情報のリスト
+        new: 新しいセレクタ情報のリスト
+
+    Returns:
+        CatalogueDiff: 追加・削除・変更されたセレクタ
+    """
+    matches: Dict[int, int] = {}  # 新しい行の位置 -> 前回の行の位置
+    matched_old = set()
+
+    # キーの優先順に、まだ対応付いていない行同士を対応付ける
+    for _, key_func, unique_only in _identity_keys():
+        index: Dict[tuple, List[int]] = {}
+        for i, selector in enumerate(old):
+            if i in matched_old:
+                continue
+            key = key_func(selector)
+            if key is not None:
+                index.setdefault(key, []).append(i)
+        if unique_only:
+            new_counts: Dict[tuple, int] = {}
+            for selector in new:
+                key = key_func(selector)
+                if key is not None:
+                    new_counts[key] = new_counts.get(key, 0) + 1
+            index = {k: v for k, v in index.items() if len(v) == 1 and new_counts.get(k, 0) == 1}
+        for j, selector in enumerate(new):
+            if j in matches:
+                continue
+            key = key_func(selector)
+            candidates = index.get(key) if key is not None else None
+            if candidates:
+                i = candidates.pop(0)
+                matches[j] = i
+                matched_old.add(i)
+
+    diff = CatalogueDiff()
+    for j, selector in enumerate(new):
+        if j not in matches:
+            diff.added.append(selector)
+            continue
+        previous = old[matches[j]]
+        fields = _changed_fields(previous, selector)
+        if fields:
+            diff.changed.append(SelectorChange(previous, selector, fields))
+        else:
+            diff.unchanged += 1
+    diff.removed = [selector for i, selector in enumerate(old) if i not in matched_old]
+    return diff
+
+
+def apply_diff(old: List[Dict[str, Any]], diff: CatalogueDiff) -> List[Dict[str, Any]]:
+    """
+    前回のカタログに差分を適用する
+
+    変更のない行は前回の内容のまま、変更された行は同じ位置で新しい内容に置き換え、
+    削除された行を除いて、追加された行を末尾に加える。
+    自動採番の名前は前回の名前を引き継ぐため、行の名前が解析ごとに変わらない。
+
+    Args:
+        old: 前回のセレクタ情報のリスト
+        diff: diff_catalogues() の戻り値
+
+    Returns:
+        List[Dict[str, Any]]: 更新後のセレクタ情報のリスト
+    """
+    replaced = {}
+    for change in diff.changed:
+        updated = dict(change.new)
+        if AUTO_NAME_PATTERN.match(_text(change.new.get('name'))):
+            updated['name'] = change.old.get('name', updated.get('name'))
+        replaced[id(change.old)] = updated
+    removed = {id(selector) for selector in diff.removed}
+
+    merged = [replaced.get(id(selector), selector) for selector in old if id(selector) not in removed]
+
+    # 追加行の自動採番の名前が既存の名前と重複しないよう振り直す
+    used_names = {(_text(s.get('group')), _text(s.get('name'))) for s in merged}
+    for selector in diff.added:
+        selector = dict(selector)
+        name = _text(selector.get('name'))
+        group = _text(selector.get('group'))
+        if (group, name) in used_names and AUTO_NAME_PATTERN.match(name):
+            prefix = name.rsplit('_', 1)[0]
+            number = 1
+            while (group, f"{prefix}_{number}") in used_names:
+                number += 1
+            selector['name'] = f"{prefix}_{number}"
+        used_names.add((group, _text(selector.get('name'))))
+        merged.append(selector)
+    return merged
+
+
+def format_changelog(diff: CatalogueDiff, title: Optional[str] = None) -> str:
+    """
+    差分をMarkdown形式の簡潔な変更履歴にする
+
+    Args:
+        diff: diff_catalogues() の戻り値
+        title: 見出し（省略時は見出しなし）
+
+    Returns:
+        str: 変更履歴
+    """
+    lines = []
+    if title:
+        lines += [f"## {title}", ""]
+    lines.append(
+        f"追加 {len(diff.added)}件 / 削除 {len(diff.removed)}件 / "
+        f"変更 {len(diff.changed)}件 / 変更なし {diff.unchanged}件"
+    )
+    lines.append("")
+    for selector in diff.added:
+        lines.append(f"- 追加: {selector.get('group', '')}.{selector.get('name', '')} `{selector.get('css', '')}`")
+    for selector in diff.removed:
+        lines.append(f"- 削除: {selector.get('group', '')}.{selector.get('name', '')} `{selector.get('css', '')}`")
+    for change in diff.changed:
+        details = ", ".join(
+            f"{f}: `{_normalize(change.old.get(f))}` → `{_normalize(change.new.get(f))}`" for f in change.fields
+        )
+        lines.append(f"- 変更: {change.old.get('group', '')}.{change.old.get('name', '')} ({details})")
+    return "\n".join(lines).rstrip() + "\n"
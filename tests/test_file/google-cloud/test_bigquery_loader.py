@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+BigQueryLoaderのテスト
+
+フェイクのGoogleCloudAuthとBigQueryクライアントを使用し、
+CSVの変換・GCSへのステージング・ロードジョブの設定と結果の集計、
+ステージングテーブル経由のMERGEをテストします。
+認証情報やネットワークなしで実行できます。
+"""
+
+import sys
+import json
+import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from google.cloud import bigquery
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.utils.bigquery_loader import BigQueryLoader, build_merge_sql, prepare_csv
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+SCHEMA = [
+    {"COLUMN_ORIGIN_NAME": "日付", "DATA_TYPE": "DATE", "COLUMN_AFTER_NAME": "date"},
+    {"COLUMN_ORIGIN_NAME": "CV数", "DATA_TYPE": "INT", "COLUMN_AFTER_NAME": ""},
+    {"COLUMN_ORIGIN_NAME": "媒体", "DATA_TYPE": "STR", "COLUMN_AFTER_NAME": ""},
+]
+
+
+class FakeAuth:
+    """アップロードされたファイルの内容を記録するGoogleCloudAuth"""
+
+    project_id = "proj"
+    dataset_id = "ds"
+    bucket_name = "bucket"
+
+    def __init__(self, table_schema=None):
+        self.uploads = {}
+        self.deleted = []
+        self.table_schema = table_schema
+        self.invalidated = []
+
+    def get_table_schema(self, table_id, dataset_id=None):
+        return self.table_schema
+
+    def invalidate_table(self, table_id, dataset_id=None):
+        self.invalidated.append(table_id)
+
+    def upload_file(self, source_file, destination_blob_name, bucket_name=None):
+        with open(source_file, "r", encoding="utf-8") as f:
+            self.uploads[destination_blob_name] = f.read()
+        return SimpleNamespace(name=destination_blob_name,
+                               delete=lambda: self.deleted.append(destination_blob_name))
+
+
+class FakeJob:
+    """統計情報を持つロードジョブ"""
+
+    def __init__(self, errors=None):
+        self.job_id = "job_1"
+        self.state = "DONE"
+        self.errors = errors
+        self.error_result = errors[0] if errors else None
+        self.output_rows = 2
+        self.output_bytes = 128
+        self.input_file_bytes = 64
+        self.slot_millis = 250
+        self.started = datetime.datetime(2025, 4, 1, 0, 0, 0)
+        self.ended = datetime.datetime(2025, 4, 1, 0, 0, 3)
+
+    def result(self, timeout=None):
+        return self
+
+
+class FakeClient:
+    """ロードジョブの呼び出しを記録するBigQueryクライアント"""
+
+    def __init__(self, job=None):
+        self.job = job or FakeJob()
+        self.calls = []
+
+    def load_table_from_uri(self, source_uri, destination, job_config=None, location=None):
+        self.calls.append((source_uri, destination, job_config))
+        return self.job
+
+    def query(self, sql, location=None):
+        self.calls.append(("query", sql))
+        job = FakeJob()
+        job.dml_stats = SimpleNamespace(inserted_row_count=1, updated_row_count=0, deleted_row_count=0)
+        return job
+
+    def delete_table(self, table, not_found_ok=False):
+        self.calls.append(("delete_table", table))
+
+
+def _write_csv(path):
+    with open(path, "w", encoding="cp932", newline="") as f:
+        f.write("日付,CV数,媒体\n2025/4/1,\"1,234\",検索\n2025/04/02,5,ディスプレイ\n")
+
+
+def test_prepare_csv_normalizes_values(tmp_path):
+    """CSVをUTF-8に変換し、数値の桁区切りと日付の区切りを正規化すること"""
+    source = tmp_path / "report.csv"
+    output = tmp_path / "prepared.csv"
+    _write_csv(source)
+    assert prepare_csv(str(source), ["DATE", "INTEGER", "STRING"], "cp932", str(output)) == 2
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines == ["日付,CV数,媒体", "2025-04-01,1234,検索", "2025-04-02,5,ディスプレイ"]
+
+
+def test_load_file_stages_and_reports_statistics(tmp_path):
+    """ステージングしたURIからロードし、ジョブの統計情報を返すこと"""
+    source = tmp_path / "report.csv"
+    schema_path = tmp_path / "report_schema.json"
+    _write_csv(source)
+    schema_path.write_text(json.dumps({"schema": SCHEMA}, ensure_ascii=False), encoding="utf-8")
+
+    auth, client = FakeAuth(), FakeClient()
+    loader = BigQueryLoader(auth=auth, client=client)
+    result = loader.load_file(str(source), "ebis_report", schema_path=str(schema_path), encoding="cp932")
+
+    assert result.success
+    (blob_name, content), = auth.uploads.items()
+    assert blob_name.startswith("staging/ebis_report/") and blob_name.endswith("/report.csv")
+    assert "2025-04-01,1234,検索" in content
+
+    source_uri, destination, job_config = client.calls[0]
+    assert source_uri == f"gs://bucket/{blob_name}"
+    assert destination == "proj.ds.ebis_report"
+    assert [f.name for f in job_config.schema] == ["date", "CV数", "媒体"]
+    assert [f.field_type for f in job_config.schema] == ["DATE", "INTEGER", "STRING"]
+    assert job_config.skip_leading_rows == 1
+    assert result.as_dict()["output_rows"] == 2
+    assert result.slot_millis == 250
+    assert result.duration_seconds == 3.0
+    assert auth.invalidated == ["proj.ds.ebis_report"]
+    # ロードジョブの終了後にステージングファイルを削除する
+    assert auth.deleted == [blob_name]
+
+
+def test_staged_file_is_kept_when_configured_or_job_unfinished(tmp_path):
+    """keep_staged_files が有効な場合とジョブが終了していない場合はステージングファイルを残すこと"""
+    source = tmp_path / "report.csv"
+    _write_csv(source)
+    auth = FakeAuth()
+    loader = BigQueryLoader(auth=auth, client=FakeClient())
+    loader.keep_staged_files = True
+    assert loader.load_file(str(source), "ebis_report", encoding="cp932").success
+    assert auth.uploads and auth.deleted == []
+
+    running = FakeJob()
+    running.state = "RUNNING"
+    loader = BigQueryLoader(auth=auth, client=FakeClient(running))
+    loader.load_file(str(source), "ebis_report", encoding="cp932")
+    assert auth.deleted == []
+
+
+def test_failed_job_is_reported(tmp_path):
+    """ジョブのエラーを結果に含めること"""
+    source = tmp_path / "report.csv"
+    _write_csv(source)
+    client = FakeClient(FakeJob(errors=[{"message": "bad row"}]))
+    result = BigQueryLoader(auth=FakeAuth(), client=client).load_file(str(source), "ebis_report", encoding="cp932")
+    assert not result.success
+    assert result.errors == [{"message": "bad row"}]
+    assert client.calls[0][2].autodetect
+
+
+def test_breaking_drift_stops_before_upload(tmp_path):
+    """テーブルと互換性のないスキーマの場合はアップロードせずに中止すること"""
+    source = tmp_path / "report.csv"
+    schema_path = tmp_path / "report_schema.json"
+    _write_csv(source)
+    schema_path.write_text(json.dumps({"schema": SCHEMA}, ensure_ascii=False), encoding="utf-8")
+    table_schema = [
+        bigquery.SchemaField("date", "DATE"),
+        bigquery.SchemaField("CV数", "DATE"),
+        bigquery.SchemaField("媒体", "STRING"),
+    ]
+    auth, client = FakeAuth(table_schema), FakeClient()
+    loader = BigQueryLoader(auth=auth, client=client)
+    assert loader.load_file(str(source), "ebis_report", schema_path=str(schema_path), encoding="cp932") is None
+    assert auth.uploads == {}
+    assert client.calls == []
+
+
+def test_daily_partition_load_replaces_one_partition(tmp_path):
+    """日付列の日付でパーティションデコレータを指定し、WRITE_TRUNCATEでロードすること"""
+    source = tmp_path / "daily.csv"
+    schema_path = tmp_path / "daily_schema.json"
+    source.write_text("日付,CV数,媒体\n2025/04/01,1,検索\n2025-04-01,2,ディスプレイ\n", encoding="cp932")
+    schema_path.write_text(json.dumps({"schema": SCHEMA}, ensure_ascii=False), encoding="utf-8")
+
+    client = FakeClient()
+    loader = BigQueryLoader(auth=FakeAuth(), client=client)
+    loader.clustering_fields = ["媒体"]
+    result = loader.load_daily_partition(str(source), "ebis_report", schema_path=str(schema_path), encoding="cp932")
+
+    assert result.success
+    _, destination, job_config = client.calls[0]
+    assert destination == "proj.ds.ebis_report$20250401"
+    assert job_config.write_disposition == "WRITE_TRUNCATE"
+    assert job_config.time_partitioning.field == "date"
+    assert job_config.clustering_fields == ["媒体"]
+
+
+def test_daily_partition_rejects_multiple_dates(tmp_path):
+    """複数の日付を含むファイルはロードしないこと"""
+    source = tmp_path / "daily.csv"
+    source.write_text("日付,CV数\n2025-04-01,1\n2025-04-02,2\n", encoding="cp932")
+    client = FakeClient()
+    loader = BigQueryLoader(auth=FakeAuth(), client=client)
+    assert loader.load_daily_partition(str(source), "ebis_report", encoding="cp932") is None
+    assert client.calls == []
+
+
+def test_build_merge_sql():
+    """キーで突き合わせ、キー以外の列が異なる行だけを更新するMERGE文を作成すること"""
+    sql = build_merge_sql("p.d.cv", "p.d.cv_staging", ["CV名", "ユーザーID", "売上金額"], ["CV名", "ユーザーID"])
+    assert sql.startswith("MERGE `p.d.cv` T\nUSING (\n  SELECT * FROM `p.d.cv_staging`")
+    assert "QUALIFY ROW_NUMBER() OVER (PARTITION BY `CV名`, `ユーザーID`) = 1" in sql
+    assert "ON T.`CV名` IS NOT DISTINCT FROM S.`CV名` AND T.`ユーザーID` IS NOT DISTINCT FROM S.`ユーザーID`" in sql
+    assert "WHEN MATCHED AND (T.`売上金額` IS DISTINCT FROM S.`売上金額`) THEN\n  UPDATE SET `売上金額` = S.`売上金額`" in sql
+    assert sql.endswith("INSERT (`CV名`, `ユーザーID`, `売上金額`)\n  VALUES (S.`CV名`, S.`ユーザーID`, S.`売上金額`)")
+    assert "WHEN MATCHED" not in build_merge_sql("t", "s", ["id"], ["id"])
+
+
+def test_upsert_loads_staging_and_merges(tmp_path):
+    """ステージングテーブルにロードしてMERGEし、件数を集計してステージングテーブルを削除すること"""
+    source = tmp_path / "cv.csv"
+    schema_path = tmp_path / "cv_schema.json"
+    _write_csv(source)
+    schema_path.write_text(json.dumps({"schema": SCHEMA}, ensure_ascii=False), encoding="utf-8")
+    table_schema = [bigquery.SchemaField(name, field_type)
+                    for name, field_type in (("date", "DATE"), ("CV数", "INTEGER"), ("媒体", "STRING"))]
+
+    client = FakeClient()
+    loader = BigQueryLoader(auth=FakeAuth(table_schema), client=client)
+    result = loader.upsert_file(str(source), "cv_attribute", key_columns=["日付", "媒体"],
+                                schema_path=str(schema_path), encoding="cp932")
+
+    assert result.success
+    (_, staging, job_config), (_, sql), (_, deleted) = client.calls
+    assert staging.startswith("proj.ds.cv_attribute_staging_")
+    assert job_config.write_disposition == "WRITE_TRUNCATE"
+    assert "MERGE `proj.ds.cv_attribute` T" in sql and f"FROM `{staging}`" in sql
+    assert "PARTITION BY `date`, `媒体`" in sql
+    assert deleted == staging
+    assert (result.source_rows, result.inserted, result.updated, result.unchanged) == (2, 1, 0, 1)
+
+    assert loader.upsert_file(str(source), "cv_attribute", key_columns=["存在しない列"],
+                              schema_path=str(schema_path), encoding="cp932") is None
+
+
+def test_upsert_stages_with_target_types_for_coerced_columns(tmp_path):
+    """既存の型で読み込む列（INTEGER → STRING など）はターゲットの型でステージングテーブルを作成すること"""
+    source = tmp_path / "cv.csv"
+    schema_path = tmp_path / "cv_schema.json"
+    _write_csv(source)
+    schema_path.write_text(json.dumps({"schema": SCHEMA}, ensure_ascii=False), encoding="utf-8")
+    target_schema = [bigquery.SchemaField(name, field_type)
+                     for name, field_type in (("date", "TIMESTAMP"), ("CV数", "STRING"), ("媒体", "STRING"))]
+
+    class TargetOnlyAuth(FakeAuth):
+        """ターゲットテーブルだけが存在するGoogleCloudAuth"""
+
+        def get_table_schema(self, table_id, dataset_id=None):
+            return self.table_schema if table_id == "cv_attribute" else None
+
+    auth, client = TargetOnlyAuth(target_schema), FakeClient()
+    loader = BigQueryLoader(auth=auth, client=client)
+    result = loader.upsert_file(str(source), "cv_attribute", key_columns=["日付", "媒体"],
+                                schema_path=str(schema_path), encoding="cp932")
+
+    assert result.success
+    (_, staging, job_config), (_, sql), _ = client.calls
+    assert [(f.name, f.field_type) for f in job_config.schema] == [
+        ("date", "TIMESTAMP"), ("CV数", "STRING"), ("媒体", "STRING")
+    ]
+    assert not job_config.schema_update_options
+    # 桁区切りはターゲットの型（STRING）に合わせて除去しない
+    assert "2025-04-01,\"1,234\",検索" in next(iter(auth.uploads.values()))
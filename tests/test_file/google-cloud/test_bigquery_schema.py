@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+BigQueryスキーマ変換のテスト
+
+CSVProcessorのスキーマからSchemaFieldへの変換と、
+テーブルのスキーマとの差分の分類をテストします。認証情報やネットワークなしで実行できます。
+"""
+
+import sys
+from pathlib import Path
+from google.cloud import bigquery
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.bigquery_schema import diff_schema, sanitize_column_name, translate_schema
+
+
+def test_translate_schema_renames_columns():
+    """COLUMN_AFTER_NAMEを優先し、記号を含む列名と重複を変換すること"""
+    fields = translate_schema([
+        {"COLUMN_ORIGIN_NAME": "日付", "DATA_TYPE": "DATE", "COLUMN_AFTER_NAME": "date"},
+        {"COLUMN_ORIGIN_NAME": "CV数(合計)", "DATA_TYPE": "INT", "COLUMN_AFTER_NAME": ""},
+        {"COLUMN_ORIGIN_NAME": "CV数 合計", "DATA_TYPE": "FLOAT"},
+        {"COLUMN_ORIGIN_NAME": "1st", "DATA_TYPE": "UNKNOWN"},
+    ])
+    assert [(f.name, f.field_type) for f in fields] == [
+        ("date", "DATE"),
+        ("CV数_合計", "INTEGER"),
+        ("CV数_合計_2", "FLOAT"),
+        ("_1st", "STRING"),
+    ]
+    assert sanitize_column_name("（）") == "column"
+
+
+def test_compatible_drift():
+    """列の追加・読み込み可能な型・ファイルにないNULL許容列は互換として扱うこと"""
+    expected = [
+        bigquery.SchemaField("date", "DATE"),
+        bigquery.SchemaField("cv", "INTEGER"),
+        bigquery.SchemaField("new_col", "STRING"),
+    ]
+    actual = [
+        bigquery.SchemaField("Date", "DATE", mode="REQUIRED"),
+        bigquery.SchemaField("cv", "FLOAT64"),
+        bigquery.SchemaField("memo", "STRING"),
+    ]
+    drift = diff_schema(expected, actual)
+    assert not drift.breaking
+    assert drift.added == ["new_col"]
+    assert drift.coerced == [("cv", "INTEGER", "FLOAT")]
+    assert drift.filled == ["memo"]
+    assert drift.schema_update_options == [bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION]
+    assert drift.allow_jagged_rows
+    assert [(f.name, f.mode) for f in drift.resolved_fields] == [
+        ("Date", "REQUIRED"), ("cv", "NULLABLE"), ("new_col", "NULLABLE"), ("memo", "NULLABLE"),
+    ]
+
+
+def test_breaking_drift():
+    """読み込めない型への変更とファイルにないREQUIRED列は非互換とすること"""
+    expected = [bigquery.SchemaField("cv", "STRING")]
+    actual = [
+        bigquery.SchemaField("cv", "INTEGER"),
+        bigquery.SchemaField("id", "STRING", mode="REQUIRED"),
+    ]
+    drift = diff_schema(expected, actual)
+    assert drift.breaking
+    assert drift.type_changes == [("cv", "INTEGER", "STRING")]
+    assert drift.missing == ["id"]
+    assert not diff_schema(expected, None).has_drift
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+GCSの一覧取得とローカルインデックスのテスト
+
+GoogleCloudAuth.iter_blobs() がページ単位で遅延取得し、取得項目の指定と
+ディレクトリ一覧に対応すること、BlobIndex の保存・読み込み・スキップ判定をテストします。
+HTTPの応答をフェイクに置き換えるため、認証情報やネットワークなしで実行できます。
+"""
+
+import sys
+import json
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.bigquery import GoogleCloudAuth
+from src.utils.blob_index import BlobIndex
+from src.utils.gcs_uploader import GCSUploader
+
+
+class FakeSession:
+    """objects.list の応答をページごとに返すHTTPセッション"""
+
+    is_mtls = False
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    def request(self, method, url, data=None, headers=None, timeout=None, **kwargs):
+        self.requests.append((method, urlparse(url).path, parse_qs(urlparse(url).query)))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.pages.pop(0)).encode()
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    """フェイクのHTTPセッションを使うGCSクライアントを持つGoogleCloudAuth"""
+    monkeypatch.setenv("PROJECT_ID", "test-project")
+    monkeypatch.setenv("BIGQUERY_DATASET", "test_dataset")
+    monkeypatch.setenv("GCS_BUCKET_NAME", "test-bucket")
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", "config/dummy-key.json")
+    instance = GoogleCloudAuth()
+    instance.list_page_size = 2
+
+    def use_pages(pages):
+        session = FakeSession(pages)
+        instance.storage_client = storage.Client(
+            project="test-project", credentials=AnonymousCredentials(), _http=session
+        )
+        return session
+    instance.use_pages = use_pages
+    return instance
+
+
+def test_iter_blobs_fetches_pages_lazily(auth):
+    """ページ単位で取得し、取得項目を指定し、バケットのメタデータは取得しないこと"""
+    session = auth.use_pages([
+        {"items": [{"name": "daily/1.csv", "size": "10"}, {"name": "daily/2.csv", "size": "20"}],
+         "nextPageToken": "token"},
+        {"items": [{"name": "daily/3.csv", "size": "30"}]},
+    ])
+    blobs = auth.iter_blobs("daily/", fields="name,size")
+    assert next(blobs).name == "daily/1.csv"
+    assert len(session.requests) == 1
+
+    assert [b.size for b in blobs] == [20, 30]
+    assert [path for _, path, _ in session.requests] == ["/storage/v1/b/test-bucket/o"] * 2
+    _, _, query = session.requests[0]
+    assert query["maxResults"] == ["2"]
+    assert query["prefix"] == ["daily/"]
+    assert query["fields"] == ["items(name,size),prefixes,nextPageToken"]
+    assert session.requests[1][2]["pageToken"] == ["token"]
+
+
+def test_list_prefixes(auth):
+    """区切り文字で直下のディレクトリを取得すること"""
+    session = auth.use_pages([
+        {"prefixes": ["staging/b/"], "nextPageToken": "token"},
+        {"prefixes": ["staging/a/"]},
+    ])
+    assert auth.list_prefixes("staging/") == ["staging/a/", "staging/b/"]
+    assert session.requests[0][2]["delimiter"] == ["/"]
+
+
+def test_blob_index_refresh_save_and_skip(auth, tmp_path):
+    """GCSの一覧からインデックスを作成して保存し、アップロード済みのファイルをスキップすること"""
+    auth.use_pages([{"items": [{"name": "daily/20250401.csv", "size": "8", "crc32c": "AAAAAA=="}]}])
+    path = tmp_path / "index.json"
+    index = BlobIndex(str(path))
+    assert index.refresh(auth, "daily/") == 1
+    assert index.save()
+
+    index = BlobIndex(str(path))
+    assert index.exists("test-bucket", "daily/20250401.csv", size=8)
+    assert not index.exists("test-bucket", "daily/20250401.csv", size=9)
+    assert not index.exists("other-bucket", "daily/20250401.csv")
+
+    uploaded = []
+    uploader = GCSUploader(auth=auth, max_workers=2, index=index)
+    uploader._upload_resumable = lambda *args: uploaded.append(args[2]) or 0
+    files = []
+    for day in ("20250401", "20250402"):
+        source = tmp_path / f"{day}.csv"
+        source.write_text("a,b\n1,2\n")
+        files.append((str(source), f"daily/{day}.csv"))
+
+    reports = uploader.upload_many(files, skip_existing=True)
+    assert [r.skipped for r in reports] == [True, False]
+    assert uploaded == ["daily/20250402.csv"]
+    assert BlobIndex(str(path)).names("test-bucket", "daily/") == ["daily/20250401.csv", "daily/20250402.csv"]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+GCSUploaderのテスト
+
+チャンクの再送、ファイルの分割、分割アップロードの結合と検証、
+複数ファイルの同時アップロード、gzip圧縮しながらの送信をテストします。認証情報やネットワークなしで実行できます。
+"""
+
+import io
+import sys
+import gzip
+import base64
+import threading
+from pathlib import Path
+
+import pytest
+import requests
+import google_crc32c
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+import src.utils.gcs_uploader as gcs_uploader
+from src.utils.gcs_uploader import (
+    CHUNK_ALIGNMENT, GCSUploader, GzipReadStream, _FileSlice, align_chunk_size, file_crc32c,
+)
+
+
+class FakeUpload:
+    """指定した回数だけチャンクの送信に失敗するResumableUpload"""
+
+    def __init__(self, chunks, failures):
+        self.remaining = chunks
+        self.failures = list(failures)
+        self.recovered = 0
+
+    @property
+    def finished(self):
+        return self.remaining == 0
+
+    def transmit_next_chunk(self, transport, timeout=None):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.remaining -= 1
+
+    def recover(self, transport):
+        self.recovered += 1
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket, self.name = bucket, name
+        self.crc32c = None
+        self.content_type = None
+
+    def compose(self, sources):
+        self.bucket.composed = [s.name for s in sources]
+        self.bucket.objects[self.name] = b"".join(self.bucket.objects[s.name] for s in sources)
+
+    def reload(self):
+        self.crc32c = base64.b64encode(google_crc32c.Checksum(self.bucket.objects[self.name]).digest()).decode()
+
+    def delete(self):
+        self.bucket.objects.pop(self.name, None)
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+        self.composed = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+class FakeAuth:
+    bucket_name = "bucket"
+
+    def __init__(self):
+        self.bucket = FakeBucket()
+
+    def authenticate_gcs(self):
+        auth = self
+
+        class _Client:
+            def bucket(self, name):
+                return auth.bucket
+        return _Client()
+
+
+def _uploader(auth=None, **kwargs):
+    options = dict(chunk_size_mb=0.25, max_workers=4, max_retries=2, composite_threshold_mb=0,
+                   composite_parts=4, checksum="crc32c")
+    options.update(kwargs)
+    return GCSUploader(auth=auth or FakeAuth(), **options)
+
+
+def test_align_chunk_size_and_file_slice(tmp_path):
+    """チャンクサイズを256KiB単位に切り上げ、ファイルの一部分を読み込めること"""
+    assert align_chunk_size(0.1) == CHUNK_ALIGNMENT
+    assert align_chunk_size(1) == 4 * CHUNK_ALIGNMENT
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    with _FileSlice(str(path), 3, 4) as stream:
+        assert stream.read() == b"3456"
+        stream.seek(1)
+        assert stream.tell() == 1 and stream.read(10) == b"456"
+
+
+def test_transmit_retries_failed_chunks(monkeypatch):
+    """再送可能なエラーは受信済み位置を確認して再送し、回数を返すこと"""
+    monkeypatch.setattr(gcs_uploader.time, "sleep", lambda seconds: None)
+    upload = FakeUpload(3, [requests.exceptions.ConnectionError("reset")])
+    assert _uploader()._transmit(upload, transport=None) == 1
+    assert upload.finished and upload.recovered == 1
+
+    failing = FakeUpload(3, [requests.exceptions.Timeout("timeout")] * 3)
+    with pytest.raises(requests.exceptions.Timeout):
+        _uploader()._transmit(failing, transport=None)
+
+
+def test_composite_upload_verifies_and_cleans_up(tmp_path, monkeypatch):
+    """大きなファイルを分割してアップロードし、結合後に一時オブジェクトを削除すること"""
+    auth = FakeAuth()
+    uploader = _uploader(auth, composite_threshold_mb=0.5)
+    path = tmp_path / "large.csv"
+    path.write_bytes(bytes(range(256)) * 4096 * 3)  # 3MiB
+
+    def fake_upload(self, path, bucket_name, blob_name, content_type, start, length):
+        with open(path, "rb") as f:
+            f.seek(start)
+            auth.bucket.objects[blob_name] = f.read(length)
+        return 0
+
+    monkeypatch.setattr(GCSUploader, "_upload_resumable", fake_upload)
+    report = uploader.upload_file(str(path), "backfill/large.csv")
+
+    assert report.success, report.error
+    assert report.parts == 4
+    assert auth.bucket.composed == [f"backfill/large.csv.part-{i:02d}" for i in range(4)]
+    assert list(auth.bucket.objects) == ["backfill/large.csv"]
+    assert auth.bucket.objects["backfill/large.csv"] == path.read_bytes()
+    assert file_crc32c(str(path))
+
+
+def test_upload_many_runs_concurrently(tmp_path, monkeypatch):
+    """複数ファイルを同時にアップロードし、ファイルごとの結果を返すこと"""
+    active, peak, lock = [0], [0], threading.Lock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_upload(self, path, bucket_name, blob_name, content_type, start, length):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        barrier.wait()
+        with lock:
+            active[0] -= 1
+        return 1 if blob_name.endswith("1.csv") else 0
+
+    monkeypatch.setattr(GCSUploader, "_upload_resumable", fake_upload)
+    files = []
+    for i in range(3):
+        path = tmp_path / f"{i}.csv"
+        path.write_text("a,b\n1,2\n")
+        files.append((str(path), f"daily/{i}.csv"))
+
+    reports = _uploader().upload_many(files)
+    assert peak[0] == 3
+    assert [r.blob_name for r in reports] == ["daily/0.csv", "daily/1.csv", "daily/2.csv"]
+    assert [r.retries for r in reports] == [0, 1, 0]
+    assert all(r.success and r.size == 8 for r in reports)
+
+
+def test_gzip_stream_keeps_only_unsent_data(tmp_path):
+    """送信済みの圧縮データを破棄しながら、失敗したチャンクの位置には戻れること"""
+    path = tmp_path / "report.csv"
+    path.write_bytes(b"".join(f"2025-04-01,{i},検索\n".encode() for i in range(200000)))
+    sent = bytearray()
+    with GzipReadStream(str(path), block_size=64 * 1024) as stream:
+        while True:
+            start = stream.tell()
+            chunk = stream.read(CHUNK_ALIGNMENT)
+            stream.seek(start)  # 失敗したチャンクの再送
+            assert stream.read(CHUNK_ALIGNMENT) == chunk
+            sent += chunk
+            stream.release(stream.tell())
+            assert len(stream._buffer) < CHUNK_ALIGNMENT + 64 * 1024
+            if len(chunk) < CHUNK_ALIGNMENT:
+                break
+        with pytest.raises(io.UnsupportedOperation):
+            stream.seek(0)
+        assert stream.raw_bytes == path.stat().st_size
+        assert stream.compressed_bytes == len(sent)
+    assert gzip.decompress(bytes(sent)) == path.read_bytes()
+
+
+def test_upload_file_with_gzip(tmp_path, monkeypatch):
+    """圧縮モードではContent-Encodingを指定して送信し、圧縮率を返すこと"""
+    calls = []
+
+    def fake_send(self, stream, bucket_name, metadata, content_type, total_bytes):
+        calls.append((metadata, total_bytes, gzip.decompress(stream.read())))
+        return 0
+
+    monkeypatch.setattr(GCSUploader, "_send_stream", fake_send)
+    path = tmp_path / "report.csv"
+    path.write_text("日付,CV数\n" + "2025-04-01,1\n" * 10000, encoding="utf-8")
+    report = _uploader(composite_threshold_mb=0.01).upload_file(str(path), "daily/report.csv.gz", compress=True)
+
+    assert report.success, report.error
+    assert report.compressed and report.parts == 1
+    assert report.compression_ratio > 10
+    (metadata, total_bytes, content), = calls
+    assert metadata == {"name": "daily/report.csv.gz", "contentType": "text/csv", "contentEncoding": "gzip"}
+    assert total_bytes is None
+    assert content == path.read_bytes()
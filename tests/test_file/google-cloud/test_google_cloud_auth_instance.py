@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+GoogleCloudAuth共有インスタンスのテスト
+
+get_instance() がキーファイルとプロジェクトごとにインスタンスを共有し、
+複数スレッドから同時に呼び出しても1つだけ作成すること、メタデータのキャッシュをテストします。
+認証情報やネットワークなしで実行できます。
+"""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud.bigquery import SchemaField
+from google.cloud.exceptions import NotFound
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.bigquery import GoogleCloudAuth
+
+
+@pytest.fixture(autouse=True)
+def cloud_env(monkeypatch):
+    """テスト用の環境変数を設定し、共有インスタンスを初期化する"""
+    monkeypatch.setenv("PROJECT_ID", "test-project")
+    monkeypatch.setenv("BIGQUERY_DATASET", "test_dataset")
+    monkeypatch.setenv("GCS_BUCKET_NAME", "test-bucket")
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", "config/dummy-key.json")
+    GoogleCloudAuth.clear_instances()
+    yield
+    GoogleCloudAuth.clear_instances()
+
+
+def test_get_instance_is_shared_per_key_and_project():
+    """同じキーファイルとプロジェクトでは同じインスタンスを返すこと"""
+    first = GoogleCloudAuth.get_instance()
+    assert GoogleCloudAuth.get_instance() is first
+    assert GoogleCloudAuth.get_instance(project_id="other-project") is not first
+    assert GoogleCloudAuth.get_instance(key_path="config/other-key.json") is not first
+    assert first.key_path == str(PROJECT_ROOT / "config" / "dummy-key.json")
+
+
+def test_get_instance_is_thread_safe():
+    """複数スレッドから同時に呼び出してもインスタンスは1つだけ作成されること"""
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        results.append(GoogleCloudAuth.get_instance())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(instance) for instance in results}) == 1
+
+
+def test_clients_share_credentials_and_http_session():
+    """BigQueryとGCSのクライアントが認証情報とHTTPセッションを共有すること"""
+    auth = GoogleCloudAuth.get_instance()
+    auth.credentials = AnonymousCredentials()
+    bigquery_client = auth.authenticate_bigquery()
+    storage_client = auth.authenticate_gcs()
+    assert auth.authenticate_bigquery() is bigquery_client
+    assert bigquery_client._http is storage_client._http is auth.get_http_session()
+
+
+class CountingClient:
+    """get_table の呼び出し回数を数えるBigQueryクライアント"""
+
+    def __init__(self):
+        self.calls = 0
+        self.tables = {"test-project.test_dataset.report": [SchemaField("date", "DATE")]}
+
+    def get_table(self, table_ref):
+        self.calls += 1
+        if table_ref not in self.tables:
+            raise NotFound(table_ref)
+        return SimpleNamespace(schema=self.tables[table_ref])
+
+
+def test_metadata_cache_hits_negative_cache_and_invalidation():
+    """存在確認とスキーマをキャッシュし、存在しない結果も保持し、破棄後は再取得すること"""
+    auth = GoogleCloudAuth.get_instance()
+    client = CountingClient()
+    auth.bigquery_client = client
+
+    assert auth.table_exists("report")
+    assert [f.name for f in auth.get_table_schema("report")] == ["date"]
+    assert not auth.table_exists("missing")
+    assert auth.get_table_schema("missing") is None
+    assert client.calls == 2
+    assert auth.metadata_cache.stats() == {"hits": 2, "misses": 2, "size": 2}
+
+    client.tables["test-project.test_dataset.missing"] = []
+    auth.invalidate_table("test-project.test_dataset.missing$20250401")
+    assert auth.table_exists("missing")
+    assert client.calls == 3
+
+    auth.metadata_cache.negative_ttl = 0
+    auth.invalidate_dataset()
+    assert not auth.table_exists("other") and not auth.table_exists("other")
+    assert client.calls == 5
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+アクションシーケンスのテスト
+
+ページ内スクリプトでの一括実行が途中で中断された場合に、完了したステップを
+再実行せず失敗したステップから個別実行を再開すること、候補セレクタと
+学習キャッシュを使用することをテストします。
+ページ内スクリプトの戻り値はスタブのドライバーで再現するため、ブラウザを起動せずに実行できます。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from selenium.common.exceptions import WebDriverException
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.selenium import browser as browser_module
+from src.modules.selenium.browser import Browser
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+SELECTORS_CSV = (
+    "group,name,selector_type,selector_value,description,fallbacks\n"
+    "detailed_analysis,view_button,css,#view,ビュー,"
+    "\"[{\"\"type\"\": \"\"xpath\"\", \"\"value\"\": \"\"//button[text()='ビュー']\"\"}]\"\n"
+    "detailed_analysis,program_all_view,css,.all-view,全項目ビュー,\n"
+    "detailed_analysis,apply_button,css,.apply,適用,\n"
+)
+STEPS = [
+    ("detailed_analysis", "view_button", "click", "clickable"),
+    ("detailed_analysis", "program_all_view", "click", "visible"),
+    ("detailed_analysis", "apply_button", "click", "clickable"),
+]
+
+
+class _Timeouts:
+    script = 30
+
+
+class _StubDriver:
+    """一括実行スクリプトの結果（または例外）と sessionStorage の進捗を固定したドライバー"""
+
+    def __init__(self, clock, result=None, error=None, progress=None, elapsed=0.0):
+        self.clock = clock
+        self.result = result
+        self.error = error
+        self.progress = progress
+        self.elapsed = elapsed
+        self.timeouts = _Timeouts()
+        self.payload = None
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.script = seconds
+
+    def execute_async_script(self, script, payload, timeout_ms, progress_key):
+        self.payload = payload
+        self.clock[0] += self.elapsed
+        if self.error:
+            raise self.error
+        return self.result
+
+    def execute_script(self, script, progress_key):
+        return json.dumps(self.progress) if self.progress else None
+
+
+def _browser(tmp_path, monkeypatch, **driver_args):
+    """スタブのドライバーと個別実行の記録を持つBrowserを作成する"""
+    clock = [1000.0]
+    monkeypatch.setattr(browser_module.time, "time", lambda: clock[0])
+    csv_path = tmp_path / "selectors.csv"
+    csv_path.write_text(SELECTORS_CSV, encoding="utf-8")
+    browser = Browser(selectors_path=str(csv_path), headless=True, logger=logger)
+    browser.selector_cache_path = str(tmp_path / "selector_cache.json")
+    browser.selector_cache_enabled = True
+    browser.auto_screenshot = False
+    browser._load_selectors()
+    browser.driver = _StubDriver(clock, **driver_args)
+    browser.clicked = []
+
+    def click(group, name, use_js=False, timeout=None):
+        browser.clicked.append((name, timeout))
+        return True
+    browser.click_element_by_selector = click
+    return browser
+
+
+def test_resume_after_last_completed_step(tmp_path, monkeypatch):
+    """中断したステップから残りの待機時間で個別実行し、完了したステップは再実行しないこと"""
+    browser = _browser(tmp_path, monkeypatch, elapsed=9.0, result={
+        "last_completed": 0, "timings": [5.0], "winners": [1], "error": "timeout",
+    })
+    result = browser.run_action_sequence(STEPS, timeout=10)
+
+    assert result["success"] and result["completed"] == 3
+    assert browser.clicked == [("program_all_view", 1), ("apply_button", 10)]
+    # 候補セレクタ（CSV・fallbacks 列）で解決し、一致した候補を学習キャッシュに記録する
+    assert [c["type"] for c in browser.driver.payload[0]["candidates"]] == ["css", "xpath"]
+    cache = json.loads((tmp_path / "selector_cache.json").read_text(encoding="utf-8"))
+    assert cache["detailed_analysis.view_button"]["selector_type"] == "xpath"
+
+
+def test_resume_from_saved_progress(tmp_path, monkeypatch):
+    """スクリプトの結果を受け取れなくても、保存された進捗から再開すること"""
+    browser = _browser(tmp_path, monkeypatch, error=WebDriverException("document unloaded"), progress={
+        "last_completed": 1, "timings": [5.0, 7.0], "winners": [0, 0], "error": None,
+    })
+    result = browser.run_action_sequence(STEPS, timeout=10)
+
+    assert result["success"]
+    assert [name for name, _ in browser.clicked] == ["apply_button"]
+    assert len(result["timings"]) == 3
+
+
+def test_stop_when_progress_unknown(tmp_path, monkeypatch):
+    """進捗を確認できない場合は、実行済みかもしれないステップを再実行せずに中断すること"""
+    browser = _browser(tmp_path, monkeypatch, error=WebDriverException("no such window"))
+    result = browser.run_action_sequence(STEPS, timeout=10)
+
+    assert not result["success"]
+    assert result["failed_step"] == "detailed_analysis.view_button"
+    assert browser.clicked == []
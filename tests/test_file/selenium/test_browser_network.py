@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CDPによるリソースブロックとネットワークアイドル待機のテスト
+
+ブロック対象のリソースタイプが Network.setBlockedURLs のURLパターンに変換されること、
+パフォーマンスログのイベントから実行中のリクエストを追跡することをテストします。
+CDPコマンドとログはスタブのドライバーで再現するため、ブラウザを起動せずに実行できます。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.selenium.browser import Browser
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+class _StubDriver:
+    """CDPコマンドを記録し、パフォーマンスログを順に返すドライバー"""
+
+    def __init__(self, log_batches=None):
+        self.commands = []
+        self.log_batches = list(log_batches or [])
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+        return {}
+
+    def get_log(self, log_type):
+        return self.log_batches.pop(0) if self.log_batches else []
+
+
+def _event(method, request_id, url="https://example.com/api"):
+    """パフォーマンスログのエントリを作成する"""
+    params = {"requestId": request_id, "request": {"url": url}}
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def _browser(driver, resource_types=(), url_patterns=()):
+    """CDPモードを有効にしたBrowserを作成する"""
+    browser = Browser(headless=True, logger=logger)
+    browser.cdp_mode = True
+    browser.block_resource_types = list(resource_types)
+    browser.block_url_patterns = list(url_patterns)
+    browser.driver = driver
+    return browser
+
+
+def test_blocked_url_patterns_sent_to_cdp():
+    """リソースタイプが拡張子パターンに変換され、Network.setBlockedURLs に送られるかテスト"""
+    driver = _StubDriver()
+    browser = _browser(driver, resource_types=["font", "Stylesheet", "unknown"],
+                       url_patterns=["*googletagmanager.com*", "*.css"])
+    assert browser._setup_cdp()
+
+    assert driver.commands[0] == ("Network.enable", {})
+    command, params = driver.commands[1]
+    assert command == "Network.setBlockedURLs"
+    assert params["urls"] == [
+        "*googletagmanager.com*", "*.css",
+        "*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*",
+        "*.otf", "*.otf?*", "*.eot", "*.eot?*",
+        "*.css?*",
+    ]
+
+
+def test_no_blocking_without_patterns():
+    """ブロック対象がない場合は Network.setBlockedURLs を送らないかテスト"""
+    driver = _StubDriver()
+    assert _browser(driver)._setup_cdp()
+    assert [command for command, _ in driver.commands] == ["Network.enable"]
+
+
+def test_wait_for_network_idle_tracks_inflight_requests():
+    """実行中のリクエストが完了してからアイドルと判定されるかテスト"""
+    driver = _StubDriver([
+        [_event("Network.requestWillBeSent", "1"), _event("Network.requestWillBeSent", "2"),
+         _event("Network.requestWillBeSent", "3", url="data:image/png;base64,")],
+        [_event("Network.loadingFinished", "1")],
+        [_event("Network.loadingFailed", "2")],
+    ])
+    browser = _browser(driver)
+    assert browser.wait_for_network_idle(idle_ms=100, timeout=5)
+    # data: URL は追跡しないため、全てのログを読み終えた時点でアイドルになる
+    assert driver.log_batches == []
+    assert not _browser(_StubDriver([[_event("Network.requestWillBeSent", "1")]])).wait_for_network_idle(
+        idle_ms=100, timeout=0.3
+    )
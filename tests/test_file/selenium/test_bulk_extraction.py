@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+インタラクティブ要素の一括抽出のテスト
+
+BULK_EXTRACTION_JS が返すJSON配列から ElementInfo が生成され、表示・有効な要素だけが
+要素タイプ別・カテゴリー別に登録されること、スクリプトが失敗した場合に
+要素ごとの取得に切り替わることをテストします。
+スクリプトの戻り値はスタブのドライバーで再現するため、ブラウザを起動せずに実行できます。
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from selenium.webdriver.common.by import By
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.ebis.page_analyzer_tool import BULK_EXTRACTION_JS, PageAnalyzerTool
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+def _record(element_type, tag, text="", displayed=True, enabled=True, **attrs):
+    """BULK_EXTRACTION_JS が返す要素情報と同じ形式の辞書を作成する"""
+    record = {
+        "element_type": element_type, "tag": tag, "id": "", "name": "", "class": "", "type": "",
+        "role": "", "value": "", "placeholder": "", "text": text,
+        "is_displayed": displayed, "is_enabled": enabled,
+        "location": {"x": 10, "y": 20, "width": 80, "height": 24},
+        "xpath": f"//{tag}", "css_path": tag,
+    }
+    record.update(attrs)
+    return record
+
+
+class _StubDriver:
+    """execute_script の戻り値（または例外）を固定し、呼び出しを記録するドライバー"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.scripts = []
+        self.find_calls = 0
+        self.lookups = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if self.error:
+            raise self.error
+        return self.result
+
+    def find_elements(self, by, value):
+        self.find_calls += 1
+        return []
+
+    def find_element(self, by, value):
+        self.lookups.append((by, value))
+        return SimpleNamespace(id="handle-1", parent=self)
+
+
+def _tool(tmp_path, driver):
+    """スタブのドライバーを設定したPageAnalyzerToolを作成する"""
+    tool = PageAnalyzerTool(headless=True, output_dir=str(tmp_path))
+    tool.browser = SimpleNamespace(driver=driver)
+    return tool
+
+
+def test_bulk_records_are_parsed(tmp_path):
+    """一括抽出の結果から要素情報が生成され、1回のスクリプト実行で収集されるかテスト"""
+    records = [
+        _record("clickable", "button", "エクスポート", id="export", **{"class": "btn btn-primary"}),
+        _record("clickable", "a", "非表示", displayed=False),
+        _record("clickable", "button", "無効", enabled=False),
+        _record("input", "input", "", name="q", type="text", placeholder="検索"),
+        _record("input", "textarea", "", value="メモ"),
+    ]
+    driver = _StubDriver(json.dumps(records, ensure_ascii=False))
+    tool = _tool(tmp_path, driver)
+
+    collected = tool._collect_elements("all")
+    assert len(driver.scripts) == 1 and driver.find_calls == 0
+    script, (selectors_map,) = driver.scripts[0]
+    assert script == BULK_EXTRACTION_JS
+    assert set(selectors_map) == {"clickable", "input"}
+
+    assert [info.text for info in collected] == ["エクスポート", "検索", "メモ"]
+    export, search, memo = collected
+    assert export.attrs["id"] == "export"
+    assert export.attrs["full_xpath"] == "//button"
+    assert export.attrs["location"] == {"x": 10, "y": 20, "width": 80, "height": 24}
+    assert export.category == "ボタン"
+    assert search.attrs["type"] == "text" and search.attrs["placeholder"] == "検索"
+    assert memo.attrs["type"] == "textarea"
+    assert [info.text for info in tool.elements["clickable"]] == ["エクスポート"]
+    assert [info.text for info in tool.elements["input"]] == ["検索", "メモ"]
+    assert {info.category for info in tool.elements["input"]} == {"フォーム"}
+
+
+def test_falls_back_to_per_element_collection(tmp_path):
+    """スクリプトが失敗した場合は要素ごとの取得に切り替わるかテスト"""
+    driver = _StubDriver(error=RuntimeError("javascript error"))
+    tool = _tool(tmp_path, driver)
+    assert tool._collect_elements("clickable") == []
+    assert driver.find_calls > 0
+
+
+def test_bulk_element_is_resolved_by_xpath(tmp_path):
+    """一括抽出で作成した要素情報が、必要になった時点でXPathから要素を再取得するかテスト"""
+    driver = _StubDriver(json.dumps([_record("clickable", "button", "適用", xpath="//*[@id=\"apply\"]")]))
+    tool = _tool(tmp_path, driver)
+    info, = tool._collect_elements("clickable")
+    assert driver.lookups == []
+    assert info.get_element(resolve=False) is None
+
+    element = info.element
+    assert element is not None and element.id == "handle-1"
+    assert driver.lookups == [(By.XPATH, "//*[@id=\"apply\"]")]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+カテゴリー判定ルールのテスト
+
+config/category_rules.yaml をコンパイルしたマッチャーが、
+従来のif/else判定と同じカテゴリーを返すことをテストします。ブラウザを起動せずに実行できます。
+"""
+
+import sys
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.utils.category_rules import CategoryMatcher, KeywordAutomaton, get_category_matcher
+from src.utils.environment import env
+from src.utils.html_selector_analyzer.selector_analyzer import HTMLSelectorAnalyzer
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+RULES_PATH = str(PROJECT_ROOT / "config" / "category_rules.yaml")
+
+
+def test_keyword_automaton_finds_overlapping_keywords():
+    """重なり合うキーワードも大文字小文字を区別せずに検出すること"""
+    automaton = KeywordAutomaton(["nav", "navbar", "bar", "side-"])
+    assert automaton.find("Top-NAVBAR side-menu") == {"nav", "navbar", "bar", "side-"}
+    assert automaton.find("content") == set()
+
+
+def test_page_analyzer_rules_match_previous_logic():
+    """page_analyzer のルールが従来の判定順序を再現していること"""
+    matcher = get_category_matcher("page_analyzer", RULES_PATH)
+    cases = [
+        ({"container_type": "side_bar", "class": "btn"}, "サイドバー"),
+        ({"class": "menu-item", "parent_class": "Dropdown-Menu"}, "サブメニュー"),
+        ({"id": "menu-item-3"}, "サイドバー"),
+        ({"class": "nav header"}, "トップバー"),
+        ({"id": "subnav"}, "サブメニュー"),
+        ({"class": "nav-list"}, "ナビゲーションバー"),
+        ({"tag": "td"}, "テーブル"),
+        ({"tag": "input", "class": "content"}, "フォーム"),
+        ({"tag": "span", "class": "btn-primary"}, "ボタン"),
+        ({"tag": "a", "parent_class": "header-links"}, "トップバー"),
+        ({"tag": "a"}, "リンク"),
+        ({"tag": "div", "id": "main"}, "コンテンツ本体"),
+        ({"tag": "div", "location": {"x": 500, "y": 50}}, "トップバー"),
+        ({"tag": "div", "location": {"x": 100, "y": 400}}, "サイドバー"),
+        ({"tag": "div", "location": {"x": 500, "y": 400}}, "その他"),
+        ({"tag": "div"}, "その他"),
+    ]
+    for fields, expected in cases:
+        assert matcher.categorize(fields) == expected, fields
+
+
+def test_location_is_resolved_only_when_needed():
+    """クラス名で判定できる場合は位置情報を取得しないこと"""
+    matcher = get_category_matcher("selector_analyzer", RULES_PATH)
+    calls = []
+
+    def location():
+        calls.append(1)
+        return {"x": 10, "y": 300}
+
+    assert matcher.categorize({"tag": "div", "class": "Sidebar", "location": location}) == "サイドバー"
+    assert calls == []
+    assert matcher.categorize({"tag": "div", "class": "", "location": location}) == "サイドバー"
+    assert calls == [1]
+
+
+def test_equals_and_regex_conditions():
+    """完全一致・正規表現・入れ子の条件を評価できること"""
+    matcher = CategoryMatcher([
+        {"category": "CSV", "when": {"all": [{"field": "tag", "equals": ["a", "button"]},
+                                             {"field": "text", "regex": r"^csv"}]}},
+        {"category": "ボタン", "when": {"field": "tag", "equals": "button"}},
+    ], default="その他")
+    assert matcher.categorize({"tag": "A", "text": "CSVダウンロード"}) == "CSV"
+    assert matcher.categorize({"tag": "button", "text": "送信"}) == "ボタン"
+    assert matcher.categorize({"tag": "buttons"}) == "その他"
+
+
+def test_selector_analyzer_uses_configured_rules_path(tmp_path, monkeypatch):
+    """HTMLSelectorAnalyzer が [TOOLS] category_rules_path のルールファイルを使用すること"""
+    rules_path = tmp_path / "rules.yaml"
+    rules_path.write_text(
+        "selector_analyzer:\n"
+        "  default: 未分類\n"
+        "  rules:\n"
+        "    - category: カスタム\n"
+        "      when: {field: class, contains: [custom]}\n",
+        encoding="utf-8",
+    )
+    original = env.get_config_value
+    monkeypatch.setattr(env, "get_config_value", lambda section, key, default=None: (
+        str(rules_path) if (section, key) == ("TOOLS", "category_rules_path") else original(section, key, default)
+    ))
+    analyzer = HTMLSelectorAnalyzer(output_dir=str(tmp_path), logger=logger)
+    assert analyzer.category_rules_path == str(rules_path)
+    assert analyzer._determine_category(None, "div", "custom-box") == "カスタム"
+    assert analyzer._determine_category(None, "button", "") == "未分類"
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DownloadDirectoryScannerのテスト
+
+ダウンロードディレクトリの差分走査（新規・更新ファイルのみの報告）と
+最新ファイルの判定をテストします。ブラウザを起動せずに実行できます。
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.selenium.download_scanner import DownloadDirectoryScanner
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+def _touch(path, content=b"data", mtime=None):
+    """テスト用ファイルを作成し、必要に応じて更新日時を設定する"""
+    path.write_bytes(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_reports_only_new_or_changed(tmp_path):
+    """2回目以降の走査で新規・更新ファイルのみが報告されるかテスト"""
+    now = time.time()
+    _touch(tmp_path / "a.csv", mtime=now - 100)
+    _touch(tmp_path / "b.csv", mtime=now - 50)
+    scanner = DownloadDirectoryScanner(str(tmp_path), logger=logger)
+
+    assert len(scanner.scan([".csv"])) == 2
+    assert scanner.scan([".csv"]) == []
+
+    _touch(tmp_path / "c.csv", mtime=now)
+    _touch(tmp_path / "a.csv", content=b"changed", mtime=now - 100)
+    changed = [Path(e.path).name for e in scanner.scan([".csv"])]
+    assert changed == ["c.csv", "a.csv"]
+
+
+def test_ignores_partial_and_other_types(tmp_path):
+    """ダウンロード中の一時ファイルと対象外の拡張子が無視されるかテスト"""
+    _touch(tmp_path / "report.csv.crdownload")
+    _touch(tmp_path / "image.png")
+    _touch(tmp_path / "report.CSV")
+    scanner = DownloadDirectoryScanner(str(tmp_path), logger=logger)
+    assert [Path(e.path).name for e in scanner.scan(["csv"])] == ["report.CSV"]
+
+
+def test_latest_skips_empty_files(tmp_path):
+    """最新ファイルの判定で空ファイルを除外できるかテスト"""
+    now = time.time()
+    _touch(tmp_path / "old.csv", mtime=now - 10)
+    _touch(tmp_path / "empty.csv", content=b"", mtime=now)
+    scanner = DownloadDirectoryScanner(str(tmp_path), logger=logger)
+    scanner.scan()
+    assert Path(scanner.latest(min_size=0).path).name == "empty.csv"
+    assert Path(scanner.latest().path).name == "old.csv"
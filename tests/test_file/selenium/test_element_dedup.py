@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ElementDedupIndexのテスト
+
+ID・XPath・タグ＋テキスト＋位置の複合キーによる重複排除と
+統計情報をテストします。ブラウザを起動せずに実行できます。
+"""
+
+import sys
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.utils.html_selector_analyzer.element_dedup import ElementDedupIndex, deduplicate_element_infos
+from src.modules.ebis.page_analyzer_tool import ElementInfo
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+def _info(tag, text, **attrs):
+    """WebElementを持たないElementInfoを作成する"""
+    return ElementInfo(element=None, tag=tag, text=text, attrs=attrs)
+
+
+def test_dedup_by_id_and_xpath():
+    """IDまたはXPathが一致する要素が重複として除外されるかテスト"""
+    elements = [
+        _info("a", "ログイン", id="login", xpath="/html/body/a[1]"),
+        _info("a", "ログイン", id="login", xpath="/html/body/div/a"),
+        _info("button", "送信", xpath="/html/body/button"),
+        _info("button", "送信", xpath="/html/body/button"),
+        _info("button", "送信", xpath="/html/body/form/button"),
+    ]
+    unique, stats = deduplicate_element_infos(elements)
+    assert [e.attrs["xpath"] for e in unique] == [
+        "/html/body/a[1]", "/html/body/button", "/html/body/form/button"
+    ]
+    assert stats.total == 5 and stats.unique == 3 and stats.duplicates == 2
+    assert stats.matched_by["id"] == 1 and stats.matched_by["xpath"] == 1
+
+
+def test_dedup_by_rounded_bbox():
+    """XPathが異なっても同じタグ・テキスト・ほぼ同じ位置の要素が重複となるかテスト"""
+    index = ElementDedupIndex(bbox_precision=5)
+    location = {"x": 100, "y": 200, "width": 80, "height": 20}
+    shifted = {"x": 101, "y": 201, "width": 80, "height": 20}
+    assert index.add(xpath="/html/body/a", tag="a", text="詳細", location=location)
+    assert not index.add(xpath="/html/body/span/a", tag="a", text="詳細", location=shifted)
+    # 位置が離れていれば別要素
+    assert index.add(xpath="/html/body/div/a", tag="a", text="詳細", location={"x": 100, "y": 400, "width": 80, "height": 20})
+    # 位置情報がない場合はXPathのみで判定する
+    assert index.add(xpath="/html/body/p/a", tag="a", text="詳細")
+    assert index.stats.as_dict() == {
+        "total": 4, "unique": 3, "duplicates": 1,
+        "matched_by": {"id": 0, "xpath": 0, "composite": 1},
+    }
+
+
+def test_dedup_ignores_webdriver_handle_id():
+    """WebDriverの要素IDが異なっても、DOMのid属性が一致すれば重複となるかテスト"""
+    first = _info("a", "ログイン", id="login", xpath="/html/body/a[1]")
+    second = _info("a", "ログイン", id="login", xpath="/html/body/div/a")
+    third = _info("a", "ヘルプ", xpath="/html/body/a[2]")
+    first.handle_id, second.handle_id, third.handle_id = "handle-1", "handle-2", "handle-1"
+    unique, stats = deduplicate_element_infos([first, second, third])
+    assert unique == [first, third]
+    assert stats.matched_by["id"] == 1
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ElementInfoのテスト
+
+型付きフィールドでの属性保持、WebElementの弱参照とXPathによる再取得、
+pickle、列形式への変換をテストします。ブラウザを起動せずに実行できます。
+"""
+
+import gc
+import pickle
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.ebis.page_analyzer_tool import ElementInfo, PageAnalyzerTool
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+class _StubDriver:
+    """find_element の呼び出しを記録するドライバー"""
+
+    def __init__(self):
+        self.lookups = []
+
+    def find_element(self, by, value):
+        self.lookups.append((by, value))
+        return _StubElement(self)
+
+
+class _StubElement:
+    """WebElement の代わりに使用する要素"""
+
+    def __init__(self, driver):
+        self.parent = driver
+        self.id = "handle-1"
+        self.tag_name = "button"
+        self.text = "適用"
+
+
+def _info(element=None):
+    return ElementInfo(
+        element=element,
+        tag="button",
+        text="適用",
+        attrs={"id": "apply", "class": "btn", "xpath": "//*[@id=\"apply\"]",
+               "location": {"x": 1, "y": 2, "width": 3, "height": 4}, "data-testid": "apply"},
+    )
+
+
+def test_attrs_round_trip():
+    """attrs の辞書が型付きフィールドと追加属性に振り分けられるかテスト"""
+    info = _info()
+    assert info.class_name == "btn"
+    assert info.extra == {"data-testid": "apply"}
+    assert info.attrs["class"] == "btn"
+    assert info.attrs["data-testid"] == "apply"
+    assert not hasattr(info, "__dict__")
+
+
+def test_element_is_weak_and_resolved_by_xpath():
+    """WebElementを保持せず、参照が切れた後はXPathで再取得されるかテスト"""
+    driver = _StubDriver()
+    info = _info(_StubElement(driver))
+    gc.collect()
+    assert info.handle_id == "handle-1"
+    assert info.get_element(resolve=False) is None
+    assert info.element is not None
+    assert driver.lookups == [("xpath", "//*[@id=\"apply\"]")]
+
+
+def test_pickle_and_columns(tmp_path):
+    """pickleでき、列形式に変換・出力できるかテスト"""
+    info = pickle.loads(pickle.dumps(_info(_StubElement(_StubDriver()))))
+    assert info.id == "apply" and info.get_element(resolve=False) is None
+
+    columns = ElementInfo.to_columns([info, _info()])
+    assert columns["class"] == ["btn", "btn"]
+    assert columns["tag"] == ["button", "button"]
+
+    tool = PageAnalyzerTool(headless=True, output_dir=str(tmp_path))
+    tool.elements["clickable"] = [info]
+    path = tool.export_elements_columnar("elements.pkl")
+    frame = pd.read_pickle(path)
+    assert list(frame["element_type"]) == ["clickable"]
+    assert list(frame["id"]) == ["apply"]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+オフラインセレクタ解析のテスト
+
+保存済みHTMLからのインタラクティブ要素の抽出、XPath・CSSパスの生成、
+all_selectors.csv / .json の出力をテストします。ブラウザを起動せずに実行できます。
+"""
+
+import sys
+import csv
+import json
+import pytest
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.ebis.offline_page_analyzer import (
+    LXML_AVAILABLE,
+    OfflinePageAnalyzer,
+    extract_element_records,
+)
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+pytestmark = pytest.mark.skipif(not LXML_AVAILABLE, reason="lxmlがインストールされていません")
+
+# テスト用のHTML
+SAMPLE_HTML = """
+<html><body>
+<header class="navbar"><a href="#" id="home">Home</a><a href="/x" class="nav-link">Reports</a></header>
+<div id="side"><ul class="menu-nav">
+  <li><a href="/a" data-rb-event-key="a"><span>Analysis</span></a></li>
+  <li><a href="/b" style="display: none">Hidden</a></li>
+</ul></div>
+<main>
+  <button class="btn btn-primary" onclick="run()">Export</button>
+  <input type="text" name="q" placeholder="search">
+  <input type="hidden" name="token" value="x">
+  <button disabled>Off</button>
+</main>
+</body></html>
+"""
+
+
+def test_extract_records():
+    """要素の抽出と表示状態・有効状態の推定をテスト"""
+    records = extract_element_records(SAMPLE_HTML)
+    clickable = [r for r in records if r["element_type"] == "clickable"]
+    inputs = [r for r in records if r["element_type"] == "input"]
+
+    # a要素4件 + button要素2件（.btn と [onclick] に一致しても1回のみ）
+    assert len(clickable) == 6
+    assert [r["name"] for r in inputs] == ["q"]
+
+    hidden_link = next(r for r in clickable if r["text"] == "" and r["tag"] == "a")
+    assert hidden_link["is_displayed"] is False
+    disabled = next(r for r in clickable if r["tag"] == "button" and not r["is_enabled"])
+    assert disabled is not None
+
+
+def test_xpath_and_css_path():
+    """getFullXPath / getCssPath と同じ規則でセレクタが生成されるかテスト"""
+    records = {r["text"]: r for r in extract_element_records(SAMPLE_HTML)}
+    assert records["Home"]["xpath"] == '//*[@id="home"]'
+    assert records["Home"]["css_path"] == "#home"
+    # 親要素のIDで探索を打ち切り、重要な子要素（span）を含める
+    assert records["Analysis"]["xpath"] == '//*[@id="side"]/ul/li[1]/a/span'
+    assert records["Analysis"]["css_path"] == (
+        "#side > ul.menu-nav > li:nth-child(1) > a[data-rb-event-key='a'] > span"
+    )
+
+
+def test_css_path_escapes_identifiers_and_attribute_values():
+    """id・クラス名・属性値の特殊文字がエスケープされ、有効なCSSセレクタになるかテスト"""
+    html = """
+    <html><body>
+    <a href="#" id="1st.item">Num</a>
+    <div class="w-1/2"><a href="#" role="it's \\ here">Quote</a></div>
+    </body></html>
+    """
+    records = {r["text"]: r for r in extract_element_records(html)}
+    assert records["Num"]["css_path"] == "#\\31 st\\.item"
+    assert records["Quote"]["css_path"].endswith(".w-1\\/2 > a[role='it\\'s \\\\ here']")
+
+
+def test_export_all_selectors(tmp_path):
+    """複数スナップショットの解析結果がCSV/JSONにまとめて出力されるかテスト"""
+    html_dir = tmp_path / "html"
+    html_dir.mkdir()
+    for name in ("page_a.html", "page_b.html"):
+        (html_dir / name).write_text(SAMPLE_HTML, encoding="utf-8")
+
+    analyzer = OfflinePageAnalyzer(output_dir=str(tmp_path), max_workers=2)
+    results = analyzer.analyze(analyzer.find_snapshots(str(html_dir)))
+    assert len(results) == 2
+    assert analyzer.export(results)
+
+    with open(tmp_path / "all_selectors.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert {row["source_file"] for row in rows} == {"page_a.html", "page_b.html"}
+    assert {"group", "name", "css", "xpath", "full_xpath", "category"} <= set(rows[0].keys())
+
+    with open(tmp_path / "all_selectors.json", encoding="utf-8") as f:
+        assert len(json.load(f)) == len(rows)
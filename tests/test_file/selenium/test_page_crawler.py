@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+PageCrawlerのテスト
+
+複数ページのセレクタ情報の統合（重複排除と出現ページの記録）をテストします。
+ブラウザを起動せずに実行できます。
+"""
+
+import sys
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.ebis.page_crawler import merge_page_selectors, page_slug
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+DASHBOARD = "https://bishamon.ebis.ne.jp/dashboard"
+ANALYSIS = "https://bishamon.ebis.ne.jp/details-analysis"
+
+
+def _selector(name, text, full_xpath, element_type="クリック可能"):
+    """テスト用のセレクタ情報を作成する"""
+    return {
+        "group": "detailed_analysis",
+        "name": name,
+        "text_value": text,
+        "css": "",
+        "xpath": full_xpath,
+        "full_xpath": full_xpath,
+        "element_type": element_type,
+        "category": "サイドバー",
+    }
+
+
+def test_page_slug():
+    """URLからページ名が生成されるかテスト"""
+    assert page_slug(ANALYSIS) == "details_analysis"
+    assert page_slug("https://bishamon.ebis.ne.jp/") == "top"
+
+
+def test_merge_records_provenance():
+    """共通要素が1件にまとめられ、出現ページが記録されるかテスト"""
+    results = {
+        DASHBOARD: [
+            _selector("clickable_1", "ダッシュボード", "//*[@id=\"nav-dashboard\"]"),
+            _selector("clickable_2", "期間", "/html/body/div[2]/button"),
+        ],
+        ANALYSIS: [
+            _selector("clickable_1", "ダッシュボード", "//*[@id=\"nav-dashboard\"]"),
+            _selector("clickable_2", "エクスポート", "/html/body/div[3]/button"),
+        ],
+    }
+    merged = merge_page_selectors(results)
+    assert [s["name"] for s in merged] == ["dashboard_clickable_1", "dashboard_clickable_2", "details_analysis_clickable_2"]
+    shared = merged[0]
+    assert shared["pages"] == f"{DASHBOARD}|{ANALYSIS}"
+    assert shared["page_count"] == 2
+    assert shared["source_url"] == DASHBOARD
+    assert merged[2]["pages"] == ANALYSIS
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ページソースの圧縮保存のテスト
+
+capture_page_source() で保存したページソースが元の内容に復元されること、
+ハッシュによる変更検出、未取得時のオンデマンド取得をテストします。
+ページソースはスタブのドライバーで再現するため、ブラウザを起動せずに実行できます。
+"""
+
+import sys
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.selenium.browser import Browser
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+PAGE_A = "<html><body>" + "<div class='row'>詳細分析</div>" * 200 + "</body></html>"
+PAGE_B = PAGE_A.replace("詳細分析", "CV属性", 1)
+
+
+class _StubDriver:
+    """page_source を差し替えられるドライバー"""
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+
+
+def _browser(page_source, page_source_hash=True):
+    """スタブのドライバーを設定したBrowserを作成する"""
+    browser = Browser(headless=True, logger=logger)
+    browser.page_source_hash = page_source_hash
+    browser.driver = _StubDriver(page_source)
+    return browser
+
+
+def test_capture_round_trip():
+    """圧縮して保存したページソースが元の内容に復元されるかテスト"""
+    browser = _browser(PAGE_A)
+    assert browser.capture_page_source()
+    assert browser.current_page_source == PAGE_A
+    assert len(browser._current_page_source_z) < len(PAGE_A.encode("utf-8"))
+    assert browser.last_page_source is None
+    assert browser.has_page_source_changed() is None
+
+    browser.driver.page_source = PAGE_B
+    assert browser.capture_page_source()
+    assert browser.current_page_source == PAGE_B
+    assert browser.last_page_source == PAGE_A
+    assert browser.has_page_source_changed() is True
+
+    assert browser.capture_page_source()
+    assert browser.has_page_source_changed() is False
+
+
+def test_change_detection_without_hash():
+    """ハッシュを無効にした場合も圧縮データの比較で変更を検出するかテスト"""
+    browser = _browser(PAGE_A, page_source_hash=False)
+    browser.capture_page_source()
+    browser.driver.page_source = PAGE_B
+    browser.capture_page_source()
+    assert browser.current_page_hash is None
+    assert browser.has_page_source_changed() is True
+
+
+def test_current_page_source_is_fetched_on_demand():
+    """未取得の場合は現在のページから取得し、保存はしないかテスト"""
+    browser = _browser(PAGE_A)
+    assert browser.current_page_source == PAGE_A
+    assert browser._current_page_source_z is None
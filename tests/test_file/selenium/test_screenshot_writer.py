@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ScreenshotWriterのテスト
+
+スクリーンショットの非同期書き込みと、
+ディレクトリごとの保持ポリシー（最大件数・合計サイズ）をテストします。
+ブラウザを起動せずに実行できます。
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.selenium.screenshot_writer import ScreenshotWriter
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+@pytest.fixture
+def writer():
+    """テスト用のScreenshotWriterを提供し、終了時に停止するフィクスチャ"""
+    w = ScreenshotWriter(logger=logger, max_queue_size=8, max_files=3, max_total_bytes=0)
+    yield w
+    w.close()
+
+
+def test_write_in_background(writer, tmp_path):
+    """キューに追加したバイト列がファイルに書き込まれるかテスト"""
+    filepath = tmp_path / "shot.jpg"
+    assert writer.enqueue(str(filepath), b"jpegdata")
+    assert writer.flush(timeout=5)
+    assert filepath.read_bytes() == b"jpegdata"
+    assert writer.written_count == 1
+
+
+def test_retention_by_count(writer, tmp_path):
+    """最大件数を超えた古いファイルが削除されるかテスト"""
+    for i in range(5):
+        writer.enqueue(str(tmp_path / f"shot_{i}.jpg"), b"x")
+        writer.flush(timeout=5)
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    assert remaining == ["shot_2.jpg", "shot_3.jpg", "shot_4.jpg"]
+
+
+def test_retention_by_total_size(tmp_path):
+    """合計サイズの上限を超えた古いファイルが削除されるかテスト"""
+    (tmp_path / "old.png").write_bytes(b"0" * 60)
+    w = ScreenshotWriter(logger=logger, max_files=0, max_total_bytes=100)
+    try:
+        w.enqueue(str(tmp_path / "new.jpg"), b"1" * 60)
+        w.flush(timeout=5)
+    finally:
+        w.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.jpg"]
+
+
+def test_drop_when_queue_full(tmp_path):
+    """キューが満杯の場合は待機せずに破棄するかテスト"""
+    w = ScreenshotWriter(logger=logger, max_queue_size=1)
+    # ワーカーを止めた状態でキューを埋める
+    w._queue.put(None)
+    w._thread.join(5)
+    assert w.enqueue(str(tmp_path / "a.jpg"), b"a")
+    assert not w.enqueue(str(tmp_path / "b.jpg"), b"b")
+    assert w.dropped_count == 1
+
+
+def test_wait_for_written_file(writer, tmp_path):
+    """書き込みが完了したファイルを待機するとTrueが返るかテスト"""
+    filepath = tmp_path / "shot.jpg"
+    writer.enqueue(str(filepath), b"jpegdata")
+    assert writer.wait_for(str(filepath), timeout=5)
+    assert filepath.read_bytes() == b"jpegdata"
+
+
+def test_wait_for_failed_or_unfinished_file(tmp_path):
+    """書き込みに失敗した・完了しないファイルを待機するとFalseが返るかテスト"""
+    (tmp_path / "not_a_dir").write_bytes(b"")
+    failed = tmp_path / "not_a_dir" / "shot.jpg"
+    w = ScreenshotWriter(logger=logger, max_queue_size=2)
+    try:
+        w.enqueue(str(failed), b"a")
+        assert not w.wait_for(str(failed), timeout=5)
+    finally:
+        w.close()
+
+    # ワーカーを止めた状態では書き込みが完了しない
+    w = ScreenshotWriter(logger=logger, max_queue_size=2)
+    w._queue.put(None)
+    w._thread.join(5)
+    pending = tmp_path / "pending.jpg"
+    assert w.enqueue(str(pending), b"b")
+    assert not w.wait_for(str(pending), timeout=0.1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+セレクタカタログの差分検出のテスト
+
+前回のカタログと新しい解析結果の対応付け（追加・削除・変更）と、
+差分の適用で変更のない行が維持されることをテストします。
+"""
+
+import sys
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.utils.selector_diff import diff_catalogues, apply_diff, format_changelog
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+def _selector(name, text, css, full_xpath, element_id="", group="detailed_analysis"):
+    """テスト用のセレクタ情報を作成する"""
+    return {
+        "group": group,
+        "name": name,
+        "text_value": text,
+        "id": element_id,
+        "class": "",
+        "css": css,
+        "xpath": full_xpath,
+        "full_xpath": full_xpath,
+        "element_type": "クリック可能",
+        "category": "ボタン",
+    }
+
+
+def test_diff_matches_by_identity():
+    """自動採番の名前が変わっても同じ要素として対応付けられるかテスト"""
+    old = [
+        _selector("apply_button", "適用", ".apply", "/html/body/div/button[1]"),
+        _selector("clickable_1", "エクスポート", "#export", "/html/body/div/button[2]", element_id="export"),
+        _selector("clickable_2", "ヘルプ", ".help", "/html/body/footer/a"),
+    ]
+    new = [
+        _selector("clickable_1", "CSV", ".csv", "/html/body/div/button[3]"),
+        _selector("clickable_2", "エクスポート", "#export", "/html/body/main/button[2]", element_id="export"),
+        _selector("apply_button", "適用", ".apply", "/html/body/div/button[1]"),
+    ]
+    diff = diff_catalogues(old, new)
+    assert diff.unchanged == 1
+    assert [s["text_value"] for s in diff.added] == ["CSV"]
+    assert [s["text_value"] for s in diff.removed] == ["ヘルプ"]
+    assert len(diff.changed) == 1
+    assert diff.changed[0].fields == ["xpath", "full_xpath"]
+
+    merged = apply_diff(old, diff)
+    # 変更のない行と変更された行は前回の位置と名前を保つ
+    assert merged[0] is old[0]
+    assert merged[1]["name"] == "clickable_1"
+    assert merged[1]["full_xpath"] == "/html/body/main/button[2]"
+    # 追加行の名前は既存の名前と重複しない
+    assert merged[2]["text_value"] == "CSV"
+    assert merged[2]["name"] == "clickable_2"
+
+    changelog = format_changelog(diff)
+    assert changelog.startswith("追加 1件 / 削除 1件 / 変更 1件 / 変更なし 1件")
+
+
+def test_no_changes():
+    """同じ内容の場合に差分がないと判定されるかテスト"""
+    old = [_selector("apply_button", "適用", ".apply", "/html/body/div/button[1]")]
+    diff = diff_catalogues(old, [dict(s) for s in old])
+    assert not diff.has_changes
+    assert diff.unchanged == 1
+
+
+def test_detects_changes_in_all_persisted_fields():
+    """比較対象の列以外（reliable_selectors など）の変更や名前の変更を検出するかテスト"""
+    old = [
+        dict(_selector("date_picker", "期間", ".picker", "/html/body/div/a"),
+             reliable_selectors=[{"type": "css", "value": ".picker"}]),
+        _selector("export_btn", "エクスポート", "#export", "/html/body/div/button", element_id="export"),
+    ]
+    new = [dict(s) for s in old]
+    new[0]["reliable_selectors"] = [{"type": "css", "value": "[data-rb-event-key='picker']"}]
+    diff = diff_catalogues(old, new)
+    assert diff.has_changes
+    assert [c.fields for c in diff.changed] == [["reliable_selectors"]]
+
+    new[1]["name"] = "export_button"
+    diff = diff_catalogues(old, new)
+    assert [c.fields for c in diff.changed] == [["reliable_selectors"], ["name"]]
+    merged = apply_diff(old, diff)
+    assert merged[0]["reliable_selectors"] == new[0]["reliable_selectors"]
+    assert merged[1]["name"] == "export_button"
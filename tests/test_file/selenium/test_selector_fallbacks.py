@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+代替セレクタと学習キャッシュのテスト
+
+selectors.csv の fallbacks 列の読み込み、候補の同時探索、
+一致した候補のキャッシュへの記録をテストします。
+ページ内スクリプトの戻り値はスタブのドライバーで再現するため、ブラウザを起動せずに実行できます。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.selenium.browser import Browser
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+SELECTORS_CSV = (
+    "group,name,selector_type,selector_value,description,fallbacks\n"
+    "common,export_button,css,#export,エクスポート,"
+    "\"[{\"\"type\"\": \"\"xpath\"\", \"\"value\"\": \"\"//button[text()='エクスポート']\"\"}]\"\n"
+    "common,apply_button,css,.apply,適用,\n"
+)
+
+
+class _Timeouts:
+    script = 30
+
+
+class _StubDriver:
+    """候補探索スクリプトの結果を固定したドライバー"""
+
+    def __init__(self, index):
+        self.index = index
+        self.timeouts = _Timeouts()
+        self.specs = None
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.script = seconds
+
+    def execute_async_script(self, script, specs, visible, timeout_ms):
+        self.specs = specs
+        return {"index": self.index, "element": "element", "elapsed_ms": 5.0}
+
+
+def _browser(tmp_path, index):
+    """セレクタCSVとキャッシュを一時ディレクトリに置いたBrowserを作成する"""
+    csv_path = tmp_path / "selectors.csv"
+    csv_path.write_text(SELECTORS_CSV, encoding="utf-8")
+    browser = Browser(selectors_path=str(csv_path), headless=True, logger=logger)
+    browser.selector_cache_path = str(tmp_path / "selector_cache.json")
+    browser.selector_cache_enabled = True
+    browser._load_selectors()
+    browser.driver = _StubDriver(index)
+    return browser
+
+
+def test_load_fallbacks(tmp_path):
+    """fallbacks 列が候補セレクタのリストとして読み込まれるかテスト"""
+    browser = _browser(tmp_path, 0)
+    assert browser.selectors["common"]["export_button"]["fallbacks"] == [
+        {"selector_type": "xpath", "selector_value": "//button[text()='エクスポート']"}
+    ]
+    assert browser.selectors["common"]["apply_button"]["fallbacks"] == []
+
+
+def test_fallback_winner_is_cached(tmp_path):
+    """代替セレクタで一致した場合にキャッシュに記録され、次回は先頭の候補になるかテスト"""
+    browser = _browser(tmp_path, 1)
+    assert browser.wait_for_element(("common", "export_button"), timeout=1) == "element"
+    assert [s["type"] for s in browser.driver.specs] == ["css", "xpath"]
+
+    cache = json.loads((tmp_path / "selector_cache.json").read_text(encoding="utf-8"))
+    assert cache["common.export_button"]["selector_type"] == "xpath"
+    assert cache["common.export_button"]["primary"] == "css=#export"
+
+    # 新しいインスタンスでもキャッシュの候補が最優先になる
+    browser = _browser(tmp_path, 0)
+    browser.wait_for_element(("common", "export_button"), timeout=1)
+    assert [s["type"] for s in browser.driver.specs] == ["xpath", "css"]
+
+    # CSVのセレクタ定義が変わった場合はキャッシュを使用しない
+    browser.selectors["common"]["export_button"]["selector_value"] = "#export-new"
+    assert browser._selector_candidates("common", "export_button")[0]["selector_value"] == "#export-new"
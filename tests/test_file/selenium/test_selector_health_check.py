@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+セレクタのヘルスチェックのテスト
+
+Browser.probe_selectors の状態判定と、セレクタのページ割り当てをテストします。
+ページ内スクリプトの戻り値はスタブのドライバーで再現するため、ブラウザを起動せずに実行できます。
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# プロジェクトルートを正しく設定
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+# テスト対象のモジュールをインポート
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.utils.logging_config import get_logger
+from src.modules.selenium.browser import Browser
+from src.modules.ebis import selector_health_check
+from src.modules.ebis.selector_health_check import plan_pages, SelectorHealthChecker
+
+# ロガーの設定
+logger = get_logger(__name__)
+
+
+class _Timeouts:
+    script = 30
+
+
+class _StubDriver:
+    """execute_async_script の戻り値を固定したドライバー"""
+
+    def __init__(self, probed):
+        self.probed = probed
+        self.timeouts = _Timeouts()
+        self.calls = 0
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.script = seconds
+
+    def execute_async_script(self, script, specs, timeout_ms):
+        self.calls += 1
+        return self.probed[:len(specs)]
+
+
+def _browser(probed):
+    """セレクタとスタブのドライバーを設定したBrowserを作成する"""
+    browser = Browser(headless=True, logger=logger)
+    browser.selectors = {
+        "common": {
+            "ok": {"selector_type": "css", "selector_value": "#ok"},
+            "gone": {"selector_type": "id", "selector_value": "gone"},
+            "many": {"selector_type": "css", "selector_value": ".row"},
+            "hidden": {"selector_type": "xpath", "selector_value": "//div[@id='hidden']"},
+            "bad": {"selector_type": "xpath", "selector_value": "//div["},
+        }
+    }
+    browser.driver = _StubDriver(probed)
+    return browser
+
+
+def test_probe_selectors_classifies_status():
+    """一致数と表示数から状態が判定され、1回のスクリプトで解決されるかテスト"""
+    browser = _browser([
+        {"count": 1, "visible": 1, "latency_ms": 12.5, "error": None},
+        {"count": 0, "visible": 0, "latency_ms": None, "error": None},
+        {"count": 3, "visible": 3, "latency_ms": 3.0, "error": None},
+        {"count": 1, "visible": 0, "latency_ms": 4.0, "error": None},
+        {"count": 0, "visible": 0, "latency_ms": None, "error": "SyntaxError"},
+    ])
+    keys = [("common", n) for n in ("ok", "gone", "many", "hidden", "bad")] + [("common", "undefined")]
+    results = browser.probe_selectors(keys, timeout=1)
+    assert [r["status"] for r in results.values()] == [
+        "found", "missing", "ambiguous", "invisible", "error", "error"
+    ]
+    assert browser.driver.calls == 1
+    # スクリプトのタイムアウトは元に戻る
+    assert browser.driver.timeouts.script == 30
+
+    checker = SelectorHealthChecker(browser, timeout=1)
+    rows = checker._rows("https://example.com", keys, results)
+    assert rows[0]["latency_ms"] == 12.5
+    assert SelectorHealthChecker.summarize(rows) == {
+        "found": 1, "missing": 1, "ambiguous": 1, "invisible": 1, "error": 2
+    }
+
+
+def test_plan_pages_puts_login_first():
+    """ログイン前に確認するグループが先頭のページに割り当てられるかテスト"""
+    keys = [("common", "export_button"), ("login", "username"), ("detailed_analysis", "apply_button")]
+    pages = plan_pages(keys)
+    assert pages[0][1] is True
+    assert pages[0][2] == [("login", "username")]
+    assert sorted(k for _, _, page_keys in pages[1:] for k in page_keys) == [
+        ("common", "export_button"), ("detailed_analysis", "apply_button")
+    ]
+
+
+def test_login_failure_is_not_retried(monkeypatch):
+    """ログインに失敗した場合、残りのログイン後のページでログインを再試行しないかテスト"""
+    attempts = []
+    monkeypatch.setattr(selector_health_check, "login", lambda browser: attempts.append(1) and False)
+    monkeypatch.setattr(selector_health_check, "plan_pages", lambda keys: [
+        ("https://example.com/a", False, [("common", "ok"), ("common", "gone")]),
+        ("https://example.com/b", False, [("common", "many")]),
+    ])
+    browser = _browser([])
+    browser.navigate_to = lambda url: pytest.fail("ログインに失敗した後にページへ移動しました")
+
+    report = SelectorHealthChecker(browser, timeout=1).run()
+    assert len(attempts) == 1
+    assert [row["name"] for row in report] == ["ok", "gone", "many"]
+    assert {row["error"] for row in report} == {"ログインに失敗しました"}